@@ -1,11 +1,14 @@
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from collections.abc import Mapping
 from itertools import groupby
-from typing import Union, Optional, Dict, Tuple
+from typing import Union, Optional, Dict
 import datetime
 
 import numpy
 import xarray
 from dask import array as da
+from dask.array.core import getter_inline
 
 from datacube.config import LocalConfig
 from datacube.storage import reproject_and_fuse, BandInfo
@@ -18,6 +21,9 @@ from .query import Query, query_group_by, query_geopolygon
 from ..index import index_connect
 from ..drivers import new_datasource
 
+#: Files read at the same time by non-lazy loads, see :meth:`Datacube.load_data`
+DEFAULT_MAX_IN_FLIGHT = 4
+
 
 class TerminateCurrentLoad(Exception):
     """ This exception is raised by user code from `progress_cbk`
@@ -137,6 +143,7 @@ class Datacube(object):
     def load(self, product=None, measurements=None, output_crs=None, resolution=None, resampling=None,
              skip_broken_datasets=False,
              dask_chunks=None, like=None, fuse_func=None, align=None, datasets=None, progress_cbk=None,
+             fused_bands=False, max_in_flight=DEFAULT_MAX_IN_FLIGHT,
              **query):
         """
         Load data as an ``xarray`` object.  Each measurement will be a data variable in the :class:`xarray.Dataset`.
@@ -279,9 +286,101 @@ class Datacube(object):
             if supplied will be called for every file read with `files_processed_so_far, total_files`. This is
             only applicable to non-lazy loads, ignored when using dask.
 
+        :param bool fused_bands:
+            When using dask, load all measurements of a chunk with a single task instead of one task per
+            measurement. See :meth:`load_data`.
+
+        :param int max_in_flight:
+            Number of files read at the same time when not using dask. See :meth:`load_data`.
+
         :return: Requested data in a :class:`xarray.Dataset`
         :rtype: :class:`xarray.Dataset`
         """
+        prepared = self._prepare_load(product, measurements, output_crs, resolution, align,
+                                      like, datasets, query)
+        if prepared is None:
+            return xarray.Dataset()
+        grouped, geobox, datacube_product, measurement_dicts, legacy_args = prepared
+
+        result = self.load_data(grouped, geobox,
+                                measurement_dicts,
+                                resampling=resampling,
+                                fuse_func=fuse_func,
+                                dask_chunks=dask_chunks,
+                                skip_broken_datasets=skip_broken_datasets,
+                                progress_cbk=progress_cbk,
+                                fused_bands=fused_bands,
+                                max_in_flight=max_in_flight,
+                                **legacy_args)
+
+        return apply_aliases(result, datacube_product, measurements)
+
+    def load_iter(self, product=None, measurements=None, output_crs=None, resolution=None, resampling=None,
+                  skip_broken_datasets=False,
+                  like=None, fuse_func=None, align=None, datasets=None,
+                  time_chunk=1, tile_shape=None, prefetch=True,
+                  max_in_flight=DEFAULT_MAX_IN_FLIGHT,
+                  **query):
+        """
+        Load data one block at a time, in constant memory.
+
+        Takes the same arguments as :meth:`load`, but instead of a single :class:`xarray.Dataset`
+        covering the whole query yields a sequence of smaller ones. Every block covers ``time_chunk``
+        time slices and, when ``tile_shape`` is given, one spatial tile of that many pixels. Blocks
+        are yielded in time order, tiles of the same time slices are yielded in row-major order.
+        All blocks are on the same output grid, so tiles fit together exactly.
+
+        The next block is loaded in a background thread while the caller is busy with the current one,
+        so two blocks are in memory at a time. The next load starts as the current block is handed
+        over, so for a moment a third block is loading while the caller still holds the previous one;
+        don't keep references to earlier blocks. Set ``prefetch=False`` to hold just one block.
+
+        E.g.::
+
+            for ds in dc.load_iter(product='ls8_nbar_albers', time=('2017', '2018'), time_chunk=4):
+                process(ds)
+
+        :param int time_chunk: Number of time slices per block
+        :param (int,int) tile_shape: Size of spatial blocks in pixels (Y, X), default is to load the whole area
+        :param bool prefetch: Load next block in the background, set to ``False`` to load in the calling thread
+        :return: Iterator over :class:`xarray.Dataset`
+
+        .. seealso:: :meth:`load`
+        """
+        if time_chunk < 1:
+            raise ValueError("time_chunk should be a positive integer")
+
+        prepared = self._prepare_load(product, measurements, output_crs, resolution, align,
+                                      like, datasets, query)
+        if prepared is None:
+            return
+        grouped, geobox, datacube_product, measurement_dicts, legacy_args = prepared
+
+        def load_block(sources, block_geobox):
+            result = self.load_data(sources, block_geobox,
+                                    measurement_dicts,
+                                    resampling=resampling,
+                                    fuse_func=fuse_func,
+                                    skip_broken_datasets=skip_broken_datasets,
+                                    max_in_flight=max_in_flight,
+                                    **legacy_args)
+            return apply_aliases(result, datacube_product, measurements)
+
+        blocks = _split_load(grouped, geobox, time_chunk, tile_shape)
+
+        if prefetch:
+            yield from _prefetch_map(load_block, blocks)
+        else:
+            for sources, block_geobox in blocks:
+                yield load_block(sources, block_geobox)
+
+    def _prepare_load(self, product, measurements, output_crs, resolution, align, like, datasets, query):
+        """
+        Find and group the datasets to load and work out the output grid, for :meth:`load` and :meth:`load_iter`.
+
+        :return: ``(grouped datasets, geobox, product, measurement dicts, extra legacy load_data arguments)``,
+                 or ``None`` if there is nothing to load
+        """
         if 'stack' in query:
             raise DeprecationWarning("the `stack` keyword argument is not supported anymore, "
                                      "please apply `xarray.Dataset.to_array()` to the result instead")
@@ -294,7 +393,7 @@ class Datacube(object):
 
         observations = datasets or self.find_datasets(product=product, like=like, ensure_location=True, **query)
         if not observations:
-            return xarray.Dataset()
+            return None
 
         geobox = output_geobox(like=like, output_crs=output_crs, resolution=resolution, align=align,
                                grid_spec=self.index.products.get_by_name(product).grid_spec,
@@ -306,16 +405,7 @@ class Datacube(object):
         datacube_product = self.index.products.get_by_name(product)
         measurement_dicts = datacube_product.lookup_measurements(measurements)
 
-        result = self.load_data(grouped, geobox,
-                                measurement_dicts,
-                                resampling=resampling,
-                                fuse_func=fuse_func,
-                                dask_chunks=dask_chunks,
-                                skip_broken_datasets=skip_broken_datasets,
-                                progress_cbk=progress_cbk,
-                                **legacy_args)
-
-        return apply_aliases(result, datacube_product, measurements)
+        return grouped, geobox, datacube_product, measurement_dicts, legacy_args
 
     def find_datasets(self, **search_terms):
         """
@@ -329,13 +419,17 @@ class Datacube(object):
         """
         return list(self.find_datasets_lazy(**search_terms))
 
-    def find_datasets_lazy(self, limit=None, ensure_location=False, **kwargs):
+    def find_datasets_lazy(self, limit=None, ensure_location=False, fetch_size=None, light=False, **kwargs):
         """
         Find datasets matching query.
 
         :param kwargs: see :class:`datacube.api.query.Query`
         :param ensure_location: only return datasets that have locations
         :param limit: if provided, limit the maximum number of datasets returned
+        :param fetch_size: if provided, stream datasets from the index this many at a time,
+                           keeping memory use bounded for very large searches
+        :param light: return compact :class:`datacube.index._datasets.DatasetRecord` objects, with only
+                      what is needed for loading, instead of full datasets
         :return: iterator of datasets
         :rtype: __generator[:class:`datacube.model.Dataset`]
 
@@ -345,8 +439,13 @@ class Datacube(object):
         if not query.product:
             raise ValueError("must specify a product")
 
-        datasets = self.index.datasets.search(limit=limit,
-                                              **query.search_terms)
+        if light:
+            datasets = self.index.datasets.search_for_load(limit=limit,
+                                                           **query.search_terms)
+        else:
+            datasets = self.index.datasets.search(limit=limit,
+                                                  fetch_size=fetch_size,
+                                                  **query.search_terms)
 
         if query.geopolygon is not None:
             datasets = select_datasets_inside_polygon(datasets, query.geopolygon)
@@ -460,22 +559,19 @@ class Datacube(object):
 
     @staticmethod
     def _dask_load(sources, geobox, measurements, dask_chunks,
-                   skip_broken_datasets=False):
+                   skip_broken_datasets=False,
+                   fused_bands=False):
         needed_irr_chunks, grid_chunks = _calculate_chunk_sizes(sources, geobox, dask_chunks)
         gbt = GeoboxTiles(geobox, grid_chunks)
-        dsk = {}
+        chunked_srcs, dsk = _chunk_datasets(sources, gbt)
 
-        def chunk_datasets(dss, gbt):
-            out = {}
-            for ds in dss:
-                dsk[_tokenize_dataset(ds)] = ds
-                for idx in gbt.tiles(ds.extent):
-                    out.setdefault(idx, []).append(ds)
-            return out
-
-        chunked_srcs = xr_apply(sources,
-                                lambda _, dss: chunk_datasets(dss, gbt),
-                                dtype=object)
+        if fused_bands:
+            arrays = _make_fused_dask_arrays(chunked_srcs, dsk, gbt,
+                                             measurements,
+                                             chunks=needed_irr_chunks+grid_chunks,
+                                             skip_broken_datasets=skip_broken_datasets)
+            return Datacube.create_storage(sources.coords, geobox, measurements,
+                                           lambda m: arrays[m.name])
 
         def data_func(measurement):
             return _make_dask_array(chunked_srcs, dsk, gbt,
@@ -488,7 +584,8 @@ class Datacube(object):
     @staticmethod
     def _xr_load(sources, geobox, measurements,
                  skip_broken_datasets=False,
-                 progress_cbk=None):
+                 progress_cbk=None,
+                 max_in_flight=DEFAULT_MAX_IN_FLIGHT):
 
         def mk_cbk(cbk):
             if cbk is None:
@@ -503,6 +600,25 @@ class Datacube(object):
             return _cbk
 
         data = Datacube.create_storage(sources.coords, geobox, measurements)
+
+        driver = None
+        if max_in_flight > 1:
+            driver = _single_pass_driver([ds for dss in sources.values.ravel() for ds in dss], measurements)
+
+        if driver is not None:
+            from datacube.storage._load import xr_load
+
+            try:
+                _, ctx = xr_load(sources, geobox, measurements, driver,
+                                 skip_broken_datasets=skip_broken_datasets,
+                                 max_in_flight=max_in_flight,
+                                 progress_cbk=progress_cbk,
+                                 dst=data)
+                ctx.close()
+            except (TerminateCurrentLoad, KeyboardInterrupt):
+                data.attrs['dc_partial_load'] = True
+            return data
+
         _cbk = mk_cbk(progress_cbk)
 
         for index, datasets in numpy.ndenumerate(sources.values):
@@ -523,6 +639,8 @@ class Datacube(object):
     def load_data(sources, geobox, measurements, resampling=None,
                   fuse_func=None, dask_chunks=None, skip_broken_datasets=False,
                   progress_cbk=None,
+                  fused_bands=False,
+                  max_in_flight=DEFAULT_MAX_IN_FLIGHT,
                   **extra):
         """
         Load data from :meth:`group_datasets` into an :class:`xarray.Dataset`.
@@ -563,6 +681,16 @@ class Datacube(object):
             if supplied will be called for every file read with `files_processed_so_far, total_files`. This is
             only applicable to non-lazy loads, ignored when using dask.
 
+        :param bool fused_bands:
+            Only applicable with ``dask_chunks``. Load all measurements of a chunk in one task that opens
+            every file once and reads bands stored in the same file together, per band arrays then pick
+            their band out of it without adding tasks. A band can not be computed without loading the rest.
+
+        :param int max_in_flight:
+            Only applicable to non-lazy loads. Maximum number of files opened and read at the same time, across
+            time slices and measurements. Data is still fused in ``sources`` order. ``1`` loads one file after
+            another in the calling thread. Datasets read by an IO driver plugin are always loaded one at a time.
+
         :rtype: xarray.Dataset
 
         .. seealso:: :meth:`find_datasets` :meth:`group_datasets`
@@ -603,11 +731,13 @@ class Datacube(object):
 
         if dask_chunks is not None:
             return Datacube._dask_load(sources, geobox, measurements, dask_chunks,
-                                       skip_broken_datasets=skip_broken_datasets)
+                                       skip_broken_datasets=skip_broken_datasets,
+                                       fused_bands=fused_bands)
         else:
             return Datacube._xr_load(sources, geobox, measurements,
                                      skip_broken_datasets=skip_broken_datasets,
-                                     progress_cbk=progress_cbk)
+                                     progress_cbk=progress_cbk,
+                                     max_in_flight=max_in_flight)
 
     @staticmethod
     def measurement_data(sources, geobox, measurement, fuse_func=None, dask_chunks=None):
@@ -720,6 +850,57 @@ def fuse_lazy(datasets, geobox, measurement, skip_broken_datasets=False, prepend
     return data.reshape(prepend_shape + geobox.shape)
 
 
+def fuse_lazy_many(datasets, geobox, measurements, skip_broken_datasets=False, prepend_dims=0):
+    """ Load several measurements of the same datasets in one pass, returns a tuple of arrays in ``measurements`` order.
+
+    Every file is opened once and bands stored in the same file are fetched
+    with one read, see :func:`datacube.storage._load.xr_load`. Datasets that
+    are handled by an IO driver plugin are loaded band by band.
+    """
+    from datacube.storage._load import xr_load
+
+    driver = _single_pass_driver(datasets, measurements)
+    if driver is None:
+        return tuple(fuse_lazy(datasets, geobox, m,
+                               skip_broken_datasets=skip_broken_datasets,
+                               prepend_dims=prepend_dims)
+                     for m in measurements)
+
+    srcs = numpy.empty((1,), dtype=object)
+    srcs[0] = tuple(datasets)
+    sources = xarray.DataArray(srcs, dims=('chunk',), coords={'chunk': [0]})
+
+    data, ctx = xr_load(sources, geobox, measurements, driver,
+                        skip_broken_datasets=skip_broken_datasets)
+    ctx.close()
+
+    prepend_shape = (1,) * prepend_dims
+    return tuple(data[m.name].values.reshape(prepend_shape + geobox.shape)
+                 for m in measurements)
+
+
+def _single_pass_driver(datasets, measurements):
+    """ Rasterio reader driver running in the calling thread, ``None`` if some band
+    of ``datasets`` is handled by an IO driver plugin.
+    """
+    from datacube.drivers.readers import choose_datasource
+    from datacube.drivers.rio._reader import RDEntry
+    from datacube.storage._load import InlineExecutor
+    from datacube.storage._rio import RasterDatasetDataSource
+
+    for ds in datasets:
+        for m in measurements:
+            try:
+                band = BandInfo(ds, m.name)
+            except ValueError:
+                return None
+
+            if choose_datasource(band) is not RasterDatasetDataSource:
+                return None
+
+    return RDEntry().new_instance({'pool': InlineExecutor(), 'allow_custom_pool': True})
+
+
 def _fuse_measurement(dest, datasets, geobox, measurement,
                       skip_broken_datasets=False,
                       progress_cbk=None):
@@ -791,56 +972,147 @@ def _tokenize_dataset(dataset):
     return 'dataset-{}'.format(dataset.id.hex)
 
 
-# pylint: disable=too-many-locals
-def _make_dask_array(chunked_srcs,
-                     dsk,
-                     gbt,
-                     measurement,
-                     chunks,
-                     skip_broken_datasets=False):
-    dsk = dsk.copy()  # this contains mapping from dataset id to dataset object
+def _chunk_datasets(sources, gbt):
+    """ Assign datasets to spatial chunks, once for all measurements.
 
-    token = uuid.uuid4().hex
-    dsk_name = 'dc_load_{name}-{token}'.format(name=measurement.name, token=token)
+    :returns: (``sources`` shaped array of ``{chunk index: [dataset]}`` dictionaries,
+               ``{dataset token: dataset}``)
+    """
+    dsk = {}
+    all_dss = [ds for dss in sources.values.ravel() for ds in dss]
+    all_tiles = iter(gbt.tiles_many(ds.extent for ds in all_dss))
+
+    def chunk_datasets(dss):
+        out = {}
+        for ds, tiles in zip(dss, all_tiles):
+            dsk[_tokenize_dataset(ds)] = ds
+            for idx in tiles:
+                out.setdefault(idx, []).append(ds)
+        return out
+
+    # xr_apply visits sources in the same order as .ravel()
+    chunked_srcs = xr_apply(sources,
+                            lambda _, dss: chunk_datasets(dss),
+                            dtype=object)
+    return chunked_srcs, dsk
+
+
+class _LazyLoadGraph(Mapping):
+    """ Dask graph of one measurement, load tasks are generated on access.
+
+    Keys are dataset tokens, mapping to datasets, and
+    ``(name, *irregular index, row, col)`` for every output chunk.
+    """
 
-    needed_irr_chunks, grid_chunks = chunks[:-2], chunks[-2:]
-    actual_irr_chunks = (1,) * len(needed_irr_chunks)
+    def __init__(self, name, chunked_srcs, dsk, gbt, measurement, skip_broken_datasets=False):
+        self._name = name
+        self._chunked_srcs = chunked_srcs.values
+        self._datasets = dsk
+        self._gbt = gbt
+        self._measurement = measurement
+        self._skip_broken_datasets = skip_broken_datasets
 
-    # we can have up to 4 empty chunk shapes: whole, right edge, bottom edge and
-    # bottom right corner
-    #  W R
-    #  B BR
-    empties = {}  # type Dict[Tuple[int,int], str]
+    def _chunk_keys(self):
+        for irr_index in numpy.ndindex(self._chunked_srcs.shape):
+            for idx in numpy.ndindex(self._gbt.shape):
+                yield (self._name, *irr_index, *idx)
 
-    def _mk_empty(shape: Tuple[int, int]) -> str:
-        name = empties.get(shape, None)
-        if name is not None:
-            return name
+    def _lookup(self, key, name):
+        """ Split chunk key into irregular and spatial index, and find datasets of that chunk.
 
-        name = 'empty_{}x{}-{token}'.format(*shape, token=token)
-        dsk[name] = (numpy.full, actual_irr_chunks + shape, measurement.nodata, measurement.dtype)
-        empties[shape] = name
+        :returns: ``(irr_index, idx, [dataset]|None)``
+        """
+        ndim = self._chunked_srcs.ndim
+        if len(key) != ndim + 3 or key[0] != name:
+            raise KeyError(key)
 
-        return name
+        irr_index, idx = tuple(key[1:ndim+1]), tuple(key[ndim+1:])
+        if not all(0 <= i < n for i, n in zip(irr_index + idx, self._chunked_srcs.shape + self._gbt.shape)):
+            raise KeyError(key)
 
-    for irr_index, tiled_dss in numpy.ndenumerate(chunked_srcs.values):
-        key_prefix = (dsk_name, *irr_index)
+        return irr_index, idx, self._chunked_srcs[irr_index].get(idx, None)
 
-        # all spatial chunks
-        for idx in numpy.ndindex(gbt.shape):
-            dss = tiled_dss.get(idx, None)
+    def _load_task(self, irr_index, idx, dss):
+        return (fuse_lazy,
+                [_tokenize_dataset(ds) for ds in dss],
+                self._gbt[idx],
+                self._measurement,
+                self._skip_broken_datasets,
+                self._chunked_srcs.ndim)
+
+    def __len__(self):
+        return len(self._datasets) + int(self._chunked_srcs.size*numpy.prod(self._gbt.shape))
+
+    def __iter__(self):
+        yield from self._datasets
+        yield from self._chunk_keys()
+
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            return self._datasets[key]
+
+        irr_index, idx, dss = self._lookup(key, self._name)
+
+        if dss is None:
+            m = self._measurement
+            return (numpy.full, (1,)*len(irr_index) + self._gbt.chunk_shape(idx), m.nodata, m.dtype)
+
+        return self._load_task(irr_index, idx, dss)
 
-            if dss is None:
-                val = _mk_empty(gbt.chunk_shape(idx))
-            else:
-                val = (fuse_lazy,
-                       [_tokenize_dataset(ds) for ds in dss],
-                       gbt[idx],
-                       measurement,
-                       skip_broken_datasets,
-                       chunked_srcs.ndim)
 
-            dsk[key_prefix + idx] = val
+class _LazyFusedBandGraph(_LazyLoadGraph):
+    """ Dask graph of one band, sourced from tasks that load all bands of a chunk.
+
+    On top of the keys of :class:`_LazyLoadGraph` there is a
+    ``(fused_name, *irregular index, row, col)`` key for every non-empty
+    chunk, these are identical across bands so dask only computes them once.
+    Band chunks pick their band out of the fused task output with
+    :func:`dask.array.core.getter_inline`, which dask's array optimisation
+    inlines into the tasks consuming the band, so it adds no tasks of its own.
+    """
+
+    def __init__(self, name, fused_name, band, chunked_srcs, dsk, gbt, measurements,
+                 skip_broken_datasets=False):
+        super().__init__(name, chunked_srcs, dsk, gbt, measurements[band],
+                         skip_broken_datasets=skip_broken_datasets)
+        self._fused_name = fused_name
+        self._band = band
+        self._measurements = measurements
+
+    def _fused_keys(self):
+        for irr_index, srcs in numpy.ndenumerate(self._chunked_srcs):
+            for idx in sorted(srcs):
+                yield (self._fused_name, *irr_index, *idx)
+
+    def _load_task(self, irr_index, idx, dss):
+        return (getter_inline, (self._fused_name, *irr_index, *idx), self._band)
+
+    def __len__(self):
+        return super().__len__() + sum(len(srcs) for srcs in self._chunked_srcs.ravel())
+
+    def __iter__(self):
+        yield from super().__iter__()
+        yield from self._fused_keys()
+
+    def __getitem__(self, key):
+        if not (isinstance(key, tuple) and key[:1] == (self._fused_name,)):
+            return super().__getitem__(key)
+
+        _, idx, dss = self._lookup(key, self._fused_name)
+        if dss is None:
+            raise KeyError(key)
+
+        return (fuse_lazy_many,
+                [_tokenize_dataset(ds) for ds in dss],
+                self._gbt[idx],
+                self._measurements,
+                self._skip_broken_datasets,
+                self._chunked_srcs.ndim)
+
+
+def _dask_array_from_graph(dsk, dsk_name, chunked_srcs, gbt, measurement, chunks):
+    needed_irr_chunks, grid_chunks = chunks[:-2], chunks[-2:]
+    actual_irr_chunks = (1,) * len(needed_irr_chunks)
 
     y_shapes = [grid_chunks[0]]*gbt.shape[0]
     x_shapes = [grid_chunks[1]]*gbt.shape[1]
@@ -857,10 +1129,93 @@ def _make_dask_array(chunked_srcs,
     return data
 
 
+def _make_dask_array(chunked_srcs,
+                     dsk,
+                     gbt,
+                     measurement,
+                     chunks,
+                     skip_broken_datasets=False):
+    token = uuid.uuid4().hex
+    dsk_name = 'dc_load_{name}-{token}'.format(name=measurement.name, token=token)
+
+    dsk = _LazyLoadGraph(dsk_name, chunked_srcs, dsk, gbt, measurement,
+                         skip_broken_datasets=skip_broken_datasets)
+
+    return _dask_array_from_graph(dsk, dsk_name, chunked_srcs, gbt, measurement, chunks)
+
+
+def _make_fused_dask_arrays(chunked_srcs,
+                            dsk,
+                            gbt,
+                            measurements,
+                            chunks,
+                            skip_broken_datasets=False):
+    """ Same as :func:`_make_dask_array` but for all ``measurements`` at once.
+
+    Every chunk is loaded by a single task shared by all the bands.
+
+    :returns: ``{measurement name: dask.array.Array}``
+    """
+    token = uuid.uuid4().hex
+    fused_name = 'dc_load-{token}'.format(token=token)
+    measurements = list(measurements)
+
+    out = {}
+    for band, m in enumerate(measurements):
+        dsk_name = 'dc_load_{name}-{token}'.format(name=m.name, token=token)
+        graph = _LazyFusedBandGraph(dsk_name, fused_name, band, chunked_srcs, dsk, gbt, measurements,
+                                    skip_broken_datasets=skip_broken_datasets)
+        out[m.name] = _dask_array_from_graph(graph, dsk_name, chunked_srcs, gbt, m, chunks)
+
+    return out
+
+
+def _split_load(sources, geobox, time_chunk, tile_shape=None):
+    """ Split load of ``sources`` into blocks of ``time_chunk`` time slices and optionally spatial tiles.
+
+    :returns: Iterator over ``(sources, geobox)`` of every block, for tiles ``sources`` only
+              includes datasets overlapping with the tile
+    """
+    def tile_sources(chunked_srcs, idx):
+        return xr_apply(chunked_srcs, lambda _, dss: tuple(dss.get(idx, ())), dtype=object)
+
+    for i in range(0, sources.shape[0], time_chunk):
+        block = sources[i:i+time_chunk]
+
+        if tile_shape is None:
+            yield block, geobox
+            continue
+
+        gbt = GeoboxTiles(geobox, tile_shape)
+        chunked_srcs, _ = _chunk_datasets(block, gbt)
+
+        for idx in numpy.ndindex(gbt.shape):
+            yield tile_sources(chunked_srcs, idx), gbt[idx]
+
+
+def _prefetch_map(func, args_iter):
+    """ Yield ``func(*args)`` for every element of ``args_iter``, computing next result in the background.
+
+    The next result is started just before the current one is handed over, while the caller may still
+    hold the previous one: up to three results are alive at that moment, two once the caller lets go
+    of the previous result.
+    """
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        pending = None
+        for args in args_iter:
+            future = pool.submit(func, *args)
+            if pending is not None:
+                yield pending.result()
+            pending = future
+
+        if pending is not None:
+            yield pending.result()
+
+
 def _needs_legacy_fallback(sources):
-    if sources.shape[0] == 0:
+    ds = next((dss[0] for dss in sources.values.ravel() if len(dss) > 0), None)
+    if ds is None:
         return False
 
-    ds = sources.values[0][0]
     is_s3aio_ds = ds.format == 'aio'
     return True if is_s3aio_ds else False
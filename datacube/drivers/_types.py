@@ -1,7 +1,7 @@
 """ Defines abstract types for IO drivers.
 """
 from typing import (
-    List, Tuple, Optional, Union, Any, Iterable,
+    List, Tuple, Optional, Union, Any, Iterable, Sequence,
     TYPE_CHECKING
 )
 
@@ -55,12 +55,32 @@ class GeoRasterReader(object, metaclass=ABCMeta):
     def nodata(self) -> Optional[Union[int, float]]:
         ...  # pragma: no cover
 
+    @property
+    def overviews(self) -> Tuple[int, ...]:
+        """ Decimation factors of available overviews, empty if there are none
+            or the reader doesn't know.
+        """
+        return ()
+
     @abstractmethod
     def read(self,
              window: Optional[RasterWindow] = None,
              out_shape: Optional[RasterShape] = None) -> FutureNdarray:
         ...  # pragma: no cover
 
+    def read_many(self,
+                  others: Sequence['GeoRasterReader'],
+                  window: Optional[RasterWindow] = None,
+                  out_shape: Optional[RasterShape] = None) -> List[FutureNdarray]:
+        """ Read same window from this reader and ``others``.
+
+            Readers that share underlying storage can override this to fetch
+            all bands with one request.
+
+            :returns: One future per reader, ``self`` first
+        """
+        return [rdr.read(window, out_shape) for rdr in (self, *others)]
+
 
 class ReaderDriver(object, metaclass=ABCMeta):
     """ Interface for Reader Driver
@@ -44,6 +44,13 @@ class GeoRasterReader(object, metaclass=ABCMeta):
     def nodata(self) -> Optional[Union[int, float]]:
         ...  # pragma: no cover
 
+    @property
+    def overviews(self) -> Tuple[int, ...]:
+        """ Decimation factors of available overviews, empty if there are none
+            or the reader doesn't know.
+        """
+        return ()
+
     @abstractmethod
     def read(self,
              window: Optional[RasterWindow] = None,
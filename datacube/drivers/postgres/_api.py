@@ -10,13 +10,19 @@
 Persistence API implementation for postgres.
 """
 
+import datetime
 import logging
+import re
 import uuid
+from itertools import groupby
 
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
 from sqlalchemy import cast
 from sqlalchemy import delete
-from sqlalchemy import select, text, bindparam, and_, or_, func, literal, distinct
-from sqlalchemy.dialects.postgresql import INTERVAL
+from sqlalchemy import exists
+from sqlalchemy import select, text, bindparam, and_, or_, func, literal, distinct, null, tuple_, union_all
+from sqlalchemy import literal_column
+from sqlalchemy.dialects.postgresql import INTERVAL, TIMESTAMP
 from sqlalchemy.dialects.postgresql import JSONB, insert
 from sqlalchemy.exc import IntegrityError
 
@@ -27,11 +33,13 @@ from . import _core
 from . import _dynamic as dynamic
 from ._fields import (
     parse_fields, Expression, PgField, PgExpression,
-    NativeField, DateDocField, SimpleDocField
+    NativeField, DateDocField, SimpleDocField, RangeDocField,
+    RangeBetweenExpression, BoxOverlapExpression, EqualsExpression
 )
 from .sql import escape_pg_identifier
 from ._schema import (
-    DATASET, DATASET_SOURCE, METADATA_TYPE, DATASET_LOCATION, DATASET_TYPE
+    DATASET, DATASET_SOURCE, METADATA_TYPE, DATASET_LOCATION, DATASET_TYPE,
+    DATASET_EXTENT, DATASET_SUMMARY, extent_box
 )
 
 from typing import Iterable, Tuple
@@ -62,6 +70,17 @@ _DATASET_SELECT_FIELDS = (
     ).label('uris')
 )
 
+# Searched in place of separate lat/lon ranges when the extent table is present.
+# (not a native field: not all datasets have an extent, and it shouldn't be listed as searchable)
+# Null for datasets without an extent, as the table is outer-joined.
+_EXTENT_FIELD = NativeField(
+    'extent',
+    'Dataset bounding box in EPSG:4326',
+    DATASET_EXTENT.c.dataset_ref,
+    alchemy_expression=extent_box(DATASET_EXTENT),
+    affects_row_selection=True
+)
+
 PGCODE_UNIQUE_CONSTRAINT = '23505'
 PGCODE_FOREIGN_KEY_VIOLATION = '23503'
 
@@ -184,9 +203,226 @@ def get_dataset_fields(metadata_type_definition):
     return fields
 
 
+def _use_extent_index(expressions):
+    """
+    Replace a pair of lat and lon range overlaps with a single overlap against the dataset extent box.
+
+    The extent table is outer-joined: datasets without an extent (such as those indexed by older versions)
+    are still matched by their lat and lon ranges.
+
+    :type expressions: tuple[PgExpression]
+    :rtype: tuple[PgExpression]
+    """
+    ranges = {expression.field.name: expression for expression in expressions
+              if isinstance(expression, RangeBetweenExpression)}
+    lat, lon = ranges.get('lat'), ranges.get('lon')
+    if lat is None or lon is None:
+        return expressions
+    # Open-ended ranges can't be expressed as a box
+    if None in (lat.low_value, lat.high_value, lon.low_value, lon.high_value):
+        return expressions
+
+    return tuple(expression for expression in expressions
+                 if expression is not lat and expression is not lon) + (
+        BoxOverlapExpression(_EXTENT_FIELD, lon.low_value, lat.low_value, lon.high_value, lat.high_value,
+                             fallback=(lat, lon)),
+    )
+
+
+def _dataset_summary_columns(dataset_fields):
+    """
+    What the dataset_summary table records of each dataset: the day of its start time, its start and end
+    time and its bounding box.
+
+    :return: Labelled expressions, or None if the metadata type has no time range
+    """
+    time = dataset_fields.get('time')
+    if not isinstance(time, RangeDocField):
+        return None
+
+    start = time.lower.alchemy_expression
+    lat, lon = dataset_fields.get('lat'), dataset_fields.get('lon')
+    if isinstance(lat, RangeDocField) and isinstance(lon, RangeDocField):
+        bounds = [lon.lower.alchemy_expression, lat.lower.alchemy_expression,
+                  lon.greater.alchemy_expression, lat.greater.alchemy_expression]
+    else:
+        bounds = [null()] * 4
+
+    return [
+        func.date(func.timezone('UTC', start)).label('day'),
+        start.label('time_min'),
+        time.greater.alchemy_expression.label('time_max'),
+    ] + [bound.label(name) for bound, name in zip(bounds, ('west', 'south', 'east', 'north'))]
+
+
+def _utc_day_start(day):
+    return func.timezone('UTC', cast(day, TIMESTAMP))
+
+
+def _day_runs(days):
+    """
+    Group ascending days into runs of consecutive days.
+
+    >>> _day_runs([datetime.date(2019, 1, 1), datetime.date(2019, 1, 2), datetime.date(2019, 1, 5)])
+    [(datetime.date(2019, 1, 1), datetime.date(2019, 1, 2)), (datetime.date(2019, 1, 5), datetime.date(2019, 1, 5))]
+    """
+    runs = []
+    for day in days:
+        if runs and day - runs[-1][1] == datetime.timedelta(days=1):
+            runs[-1] = (runs[-1][0], day)
+        else:
+            runs.append((day, day))
+    return runs
+
+
+def _summarised_product_ids(expressions):
+    """
+    The product ids, if the expressions do nothing but select products (so the summaries can answer the query)
+
+    :type expressions: tuple[PgExpression]
+    :rtype: list[int] or None
+    """
+    if len(expressions) != 1:
+        return None
+    expression = expressions[0]
+    exprs = expression.exprs if isinstance(expression, OrExpression) else (expression,)
+    if not all(isinstance(expr, EqualsExpression) and expr.field.name == 'dataset_type_id' for expr in exprs):
+        return None
+    return [expr.value for expr in exprs]
+
+
+_WHOLE_DAYS_PERIOD = re.compile(r'^\s*\d+\s*(days?|weeks?|mons?|months?|years?)\s*$', re.IGNORECASE)
+
+
+def _is_whole_days(start, end, period):
+    """
+    Do all time slices start and end on a UTC day boundary?
+    """
+    def is_utc_midnight(time):
+        return (isinstance(time, datetime.datetime) and time.tzinfo is not None
+                and time.astimezone(datetime.timezone.utc).time() == datetime.time())
+
+    return is_utc_midnight(start) and is_utc_midnight(end) and bool(_WHOLE_DAYS_PERIOD.match(period))
+
+
+#: Where datasets without a time sort in paged searches
+_NEGATIVE_INFINITY = literal_column("'-infinity'::timestamptz")
+
+
+def to_numbered_sql(query, dialect):
+    """
+    Compile a query to SQL with numbered parameters ($1, $2...), as used by PREPARE and by asyncpg.
+
+    :type query: sqlalchemy.sql.ClauseElement
+    :param dialect: A postgres dialect with the 'pyformat' parameter style (the default, psycopg2)
+    :return: The SQL, and the (name, type, value) of each parameter in number order
+    :rtype: (str, list[(str, sqlalchemy.types.TypeEngine, object)])
+    """
+    compiled = query.compile(dialect=dialect)
+    names = []
+
+    def number_param(match):
+        name = match.group(1)
+        if name not in names:
+            names.append(name)
+        return '${}'.format(names.index(name) + 1)
+
+    # (The statement will be sent without parameters, so nothing needs escaping)
+    sql = re.sub(r'%\((\w+)\)s', number_param, compiled.string).replace('%%', '%')
+    return sql, [(name, compiled.binds[name].type, compiled.params[name]) for name in names]
+
+
+#: Where each DBAPI connection records the statements it has prepared
+_PREPARED_KEY = 'agdc_prepared'
+
+
+class _PreparedQuery(object):
+    """
+    A query that is prepared on the server once per connection, so later runs skip parsing and planning.
+
+    For the small lookups that are run constantly (a dataset by id, etc.) planning is much of their cost.
+
+    Prepared statements last for the whole session: a rollback doesn't remove them, so a name is
+    recorded as soon as its PREPARE succeeds. (SQLAlchemy clears the record when a connection is replaced)
+    """
+
+    def __init__(self, name, query):
+        self.name = name
+        self._query = query
+        # Filled in on first use, as compiling needs the dialect.
+        self._sql = None
+        self._binds = None
+
+    def _compile(self, dialect):
+        self._sql, self._binds = to_numbered_sql(self._query, dialect)
+
+    def execute(self, connection, **values):
+        """
+        :type connection: sqlalchemy.engine.Connection
+        :param values: Values of the query's named bind parameters
+        """
+        if self._sql is None:
+            self._compile(connection.dialect)
+
+        prepared = connection.connection.info.setdefault(_PREPARED_KEY, set())
+        if self.name not in prepared:
+            connection.execution_options(no_parameters=True).execute(
+                'PREPARE {} AS {}'.format(self.name, self._sql)
+            )
+            prepared.add(self.name)
+
+        return connection.execute(
+            text('EXECUTE {}({})'.format(self.name, ', '.join(':' + name for name, _, _ in self._binds))).bindparams(
+                *(bindparam(name, values.get(name, default), type_=type_) for name, type_, default in self._binds)
+            )
+        )
+
+
+_CATALOGUE_VERSION = text("""
+select
+    (select count(*) from agdc.metadata_type),
+    (select max(xmin::text::bigint) from agdc.metadata_type),
+    (select count(*) from agdc.dataset_type),
+    (select max(xmin::text::bigint) from agdc.dataset_type)
+""")
+
+_GET_DATASET = _PreparedQuery(
+    'agdc_get_dataset',
+    select(_DATASET_SELECT_FIELDS).where(DATASET.c.id == bindparam('dataset_id'))
+)
+_CONTAINS_DATASET = _PreparedQuery(
+    'agdc_contains_dataset',
+    select([DATASET.c.id]).where(DATASET.c.id == bindparam('dataset_id'))
+)
+_GET_LOCATIONS = _PreparedQuery(
+    'agdc_get_locations',
+    select([
+        _dataset_uri_field(DATASET_LOCATION)
+    ]).where(
+        and_(DATASET_LOCATION.c.dataset_ref == bindparam('dataset_id'), DATASET_LOCATION.c.archived == None)
+    ).order_by(
+        DATASET_LOCATION.c.added.desc(),
+        DATASET_LOCATION.c.id.desc()
+    )
+)
+_GET_DATASET_TYPE = _PreparedQuery(
+    'agdc_get_dataset_type',
+    DATASET_TYPE.select().where(DATASET_TYPE.c.id == bindparam('dataset_type_id'))
+)
+
+
 class PostgresDbAPI(object):
-    def __init__(self, connection):
+    def __init__(self, connection, extent_index=False, dataset_summary=False, use_dataset_summary=False,
+                 prepared_statements=False):
         self._connection = connection
+        # Run the frequent point lookups as server-side prepared statements.
+        # (Only with a direct connection: poolers in transaction mode, such as pgbouncer, don't keep them)
+        self._prepared_statements = prepared_statements
+        # Keep the dataset_extent table up to date, and use it for spatial searches.
+        self._extent_index = extent_index
+        # Keep the dataset_summary table up to date, and (if also asked to) use it for counts through time.
+        self._dataset_summary = dataset_summary
+        self._use_dataset_summary = use_dataset_summary
 
     @property
     def in_transaction(self):
@@ -227,7 +463,51 @@ class PostgresDbAPI(object):
             dataset_type_ref=dataset_type_id,
             metadata=metadata_doc
         )
-        return ret.rowcount > 0
+        was_inserted = ret.rowcount > 0
+        if was_inserted and self._extent_index:
+            self.update_dataset_extents([dataset_id])
+        if was_inserted and self._dataset_summary:
+            self.add_to_dataset_summaries([dataset_id])
+        return was_inserted
+
+    def insert_datasets_bulk(self, rows):
+        """
+        Insert many datasets with a single statement, skipping those already indexed.
+
+        :param rows: Iterable of ``(metadata_doc, dataset_id, dataset_type_id)``
+        :return: ids of datasets that were inserted
+        :rtype: set[uuid.UUID]
+        """
+        rows = list(rows)
+        if not rows:
+            return set()
+
+        dataset_type_ids = {dataset_type_id for _, _, dataset_type_id in rows}
+        metadata_type_refs = dict(self._connection.execute(
+            select([
+                DATASET_TYPE.c.id, DATASET_TYPE.c.metadata_type_ref
+            ]).where(
+                DATASET_TYPE.c.id.in_(dataset_type_ids)
+            )
+        ).fetchall())
+
+        res = self._connection.execute(
+            insert(DATASET).values([
+                dict(id=dataset_id,
+                     dataset_type_ref=dataset_type_id,
+                     metadata_type_ref=metadata_type_refs.get(dataset_type_id),
+                     metadata=metadata_doc)
+                for metadata_doc, dataset_id, dataset_type_id in rows
+            ]).on_conflict_do_nothing(
+                index_elements=['id']
+            ).returning(DATASET.c.id)
+        )
+        inserted = {r[0] for r in res}
+        if inserted and self._extent_index:
+            self.update_dataset_extents(inserted)
+        if inserted and self._dataset_summary:
+            self.add_to_dataset_summaries(inserted)
+        return inserted
 
     def update_dataset(self, metadata_doc, dataset_id, dataset_type_id):
         """
@@ -236,6 +516,11 @@ class PostgresDbAPI(object):
         :type dataset_id: str or uuid.UUID
         :type dataset_type_id: int
         """
+        summary_keys = set()
+        if self._dataset_summary:
+            # The dataset may move to another day
+            summary_keys = self._dataset_summary_keys([dataset_id])
+
         res = self._connection.execute(
             DATASET.update().returning(DATASET.c.id).where(
                 and_(
@@ -246,7 +531,232 @@ class PostgresDbAPI(object):
                 metadata=metadata_doc
             )
         )
-        return res.rowcount > 0
+        was_updated = res.rowcount > 0
+        if was_updated and self._extent_index:
+            self.update_dataset_extents([dataset_id], replace=True)
+        if was_updated and self._dataset_summary:
+            self._refresh_dataset_summaries(summary_keys | self._dataset_summary_keys([dataset_id]))
+        return was_updated
+
+    def update_dataset_extents(self, dataset_ids=None, replace=False):
+        """
+        Compute dataset bounding boxes from the lat/lon search fields of their metadata type.
+
+        Datasets whose metadata type has no lat/lon range fields (or no values for them) are skipped.
+
+        :param dataset_ids: Only these datasets (default: all)
+        :param bool replace: Replace any existing extents of the datasets
+        """
+        metadata_types = select([METADATA_TYPE.c.id, METADATA_TYPE.c.definition])
+        if dataset_ids is not None:
+            dataset_ids = list(dataset_ids)
+            if not dataset_ids:
+                return
+            metadata_types = metadata_types.where(METADATA_TYPE.c.id.in_(
+                select([DATASET.c.metadata_type_ref]).where(DATASET.c.id.in_(dataset_ids))
+            ))
+            if replace:
+                self._connection.execute(
+                    delete(DATASET_EXTENT).where(DATASET_EXTENT.c.dataset_ref.in_(dataset_ids))
+                )
+
+        for metadata_type_id, definition in self._connection.execute(metadata_types).fetchall():
+            dataset_fields = get_dataset_fields(definition)
+            lat, lon = dataset_fields.get('lat'), dataset_fields.get('lon')
+            if not isinstance(lat, RangeDocField) or not isinstance(lon, RangeDocField):
+                continue
+
+            bounds = [lon.lower.alchemy_expression, lat.lower.alchemy_expression,
+                      lon.greater.alchemy_expression, lat.greater.alchemy_expression]
+            where_expr = and_(DATASET.c.metadata_type_ref == metadata_type_id,
+                              *(bound != None for bound in bounds))
+            if dataset_ids is not None:
+                where_expr = and_(where_expr, DATASET.c.id.in_(dataset_ids))
+
+            self._connection.execute(
+                insert(DATASET_EXTENT).from_select(
+                    ['dataset_ref', 'west', 'south', 'east', 'north'],
+                    select([DATASET.c.id] + bounds).where(where_expr)
+                ).on_conflict_do_nothing(
+                    index_elements=['dataset_ref']
+                )
+            )
+
+    def _dataset_summary_rows(self, where_expr=None, active_only=True, keys=None):
+        """
+        Select the summary columns (see :func:`_dataset_summary_columns`) of each dataset,
+        with its dataset_type_ref. Datasets whose metadata type has no time range are left out.
+
+        :param keys: Only datasets of these products overlapping these days
+        :type keys: list[(int, datetime.date)]
+        :rtype: sqlalchemy.sql.Alias or None
+        """
+        selects = []
+        metadata_types = select([METADATA_TYPE.c.id, METADATA_TYPE.c.definition])
+        for metadata_type_id, definition in self._connection.execute(metadata_types).fetchall():
+            dataset_fields = get_dataset_fields(definition)
+            columns = _dataset_summary_columns(dataset_fields)
+            if columns is None:
+                continue
+
+            conditions = [DATASET.c.metadata_type_ref == metadata_type_id,
+                          dataset_fields['time'].lower.alchemy_expression != None]
+            if active_only:
+                conditions.append(DATASET.c.archived == None)
+            if where_expr is not None:
+                conditions.append(where_expr)
+            if keys:
+                # Can use the time index of each product.
+                time = dataset_fields['time'].alchemy_expression
+                conditions.append(or_(*(
+                    and_(DATASET.c.dataset_type_ref == dataset_type_ref, or_(*(
+                        time.overlaps(func.tstzrange(_utc_day_start(first_day),
+                                                     _utc_day_start(last_day) + cast('1 day', INTERVAL)))
+                        for first_day, last_day in _day_runs(day for _, day in product_keys)
+                    )))
+                    for dataset_type_ref, product_keys in groupby(sorted(keys), key=lambda key: key[0])
+                )))
+            selects.append(select([DATASET.c.dataset_type_ref] + columns).where(and_(*conditions)))
+
+        if not selects:
+            return None
+        return union_all(*selects).alias('summarised_dataset')
+
+    @staticmethod
+    def _aggregate_dataset_summaries(rows):
+        return select([
+            rows.c.dataset_type_ref,
+            rows.c.day,
+            func.count().label('dataset_count'),
+            func.min(rows.c.time_min),
+            func.max(rows.c.time_max),
+            func.min(rows.c.west),
+            func.min(rows.c.south),
+            func.max(rows.c.east),
+            func.max(rows.c.north),
+        ]).group_by(
+            rows.c.dataset_type_ref,
+            rows.c.day
+        ).order_by(
+            # Write summaries in a consistent order, so concurrent writers can't deadlock
+            rows.c.dataset_type_ref,
+            rows.c.day
+        )
+
+    def _dataset_summary_keys(self, dataset_ids):
+        """
+        :return: The (dataset_type_ref, day) summaries the datasets belong to, archived or not
+        :rtype: set[(int, datetime.date)]
+        """
+        rows = self._dataset_summary_rows(DATASET.c.id.in_(list(dataset_ids)), active_only=False)
+        if rows is None:
+            return set()
+        return {tuple(row) for row in self._connection.execute(
+            select([rows.c.dataset_type_ref, rows.c.day]).distinct()
+        )}
+
+    def add_to_dataset_summaries(self, dataset_ids):
+        """
+        Add newly indexed (or restored) datasets to the summaries of their product.
+
+        The datasets must not already be counted.
+        """
+        rows = self._dataset_summary_rows(DATASET.c.id.in_(list(dataset_ids)))
+        if rows is None:
+            return
+
+        insert_summaries = insert(DATASET_SUMMARY).from_select(
+            [column.name for column in DATASET_SUMMARY.columns],
+            self._aggregate_dataset_summaries(rows)
+        )
+        existing, new = DATASET_SUMMARY.c, insert_summaries.excluded
+        # (least() and greatest() ignore nulls)
+        self._connection.execute(
+            insert_summaries.on_conflict_do_update(
+                index_elements=['dataset_type_ref', 'day'],
+                set_=dict(
+                    dataset_count=existing.dataset_count + new.dataset_count,
+                    time_min=func.least(existing.time_min, new.time_min),
+                    time_max=func.greatest(existing.time_max, new.time_max),
+                    west=func.least(existing.west, new.west),
+                    south=func.least(existing.south, new.south),
+                    east=func.greatest(existing.east, new.east),
+                    north=func.greatest(existing.north, new.north),
+                )
+            )
+        )
+
+    def update_dataset_summaries(self, dataset_ids=None):
+        """
+        Recompute the summaries that the given datasets belong to, or all summaries.
+
+        (Needed after datasets are archived, as their time and extent can't be subtracted)
+        """
+        if dataset_ids is None:
+            self._connection.execute(delete(DATASET_SUMMARY))
+            rows = self._dataset_summary_rows()
+            if rows is not None:
+                self._connection.execute(
+                    insert(DATASET_SUMMARY).from_select(
+                        [column.name for column in DATASET_SUMMARY.columns],
+                        self._aggregate_dataset_summaries(rows)
+                    )
+                )
+            return
+
+        self._refresh_dataset_summaries(self._dataset_summary_keys(dataset_ids))
+
+    def _refresh_dataset_summaries(self, keys):
+        """
+        :param set[(int, datetime.date)] keys: (dataset_type_ref, day) of the summaries to recompute
+        """
+        if not keys:
+            return
+        keys = sorted(keys)
+        summary_key = tuple_(DATASET_SUMMARY.c.dataset_type_ref, DATASET_SUMMARY.c.day)
+
+        # Lock the summaries in a consistent order, so concurrent refreshes can't deadlock
+        self._connection.execute(
+            select([DATASET_SUMMARY.c.dataset_type_ref]).where(
+                summary_key.in_(keys)
+            ).order_by(
+                DATASET_SUMMARY.c.dataset_type_ref, DATASET_SUMMARY.c.day
+            ).with_for_update()
+        )
+        self._connection.execute(
+            delete(DATASET_SUMMARY).where(summary_key.in_(keys))
+        )
+
+        # Only aggregate the datasets of the keys' days, not everything in between
+        rows = self._dataset_summary_rows(keys=keys)
+        self._connection.execute(
+            insert(DATASET_SUMMARY).from_select(
+                [column.name for column in DATASET_SUMMARY.columns],
+                self._aggregate_dataset_summaries(rows).where(
+                    tuple_(rows.c.dataset_type_ref, rows.c.day).in_(keys)
+                )
+            )
+        )
+
+    def get_product_summary(self, dataset_type_id):
+        """
+        Count, time bounds and bounding box of the active datasets of a product, from its summaries.
+
+        :rtype: (int, datetime.datetime, datetime.datetime, float, float, float, float)
+        """
+        return self._connection.execute(
+            select([
+                func.coalesce(func.sum(DATASET_SUMMARY.c.dataset_count), 0).label('dataset_count'),
+                func.min(DATASET_SUMMARY.c.time_min).label('time_min'),
+                func.max(DATASET_SUMMARY.c.time_max).label('time_max'),
+                func.min(DATASET_SUMMARY.c.west).label('west'),
+                func.min(DATASET_SUMMARY.c.south).label('south'),
+                func.max(DATASET_SUMMARY.c.east).label('east'),
+                func.max(DATASET_SUMMARY.c.north).label('north'),
+            ]).where(
+                DATASET_SUMMARY.c.dataset_type_ref == dataset_type_id
+            )
+        ).first()
 
     def insert_dataset_location(self, dataset_id, uri):
         """
@@ -272,7 +782,35 @@ class PostgresDbAPI(object):
 
         return r.rowcount > 0
 
+    def insert_dataset_locations_bulk(self, locations):
+        """
+        Add many locations with a single statement, skipping those already recorded.
+
+        Locations are added in the order given, so the last location of a
+        dataset becomes its newest one.
+
+        :param locations: Iterable of ``(dataset_id, uri)``
+        :return: number of locations added
+        :rtype: int
+        """
+        values = []
+        for dataset_id, uri in locations:
+            scheme, body = _split_uri(uri)
+            values.append(dict(dataset_ref=dataset_id, uri_scheme=scheme, uri_body=body))
+
+        if not values:
+            return 0
+
+        r = self._connection.execute(
+            insert(DATASET_LOCATION).values(values).on_conflict_do_nothing(
+                index_elements=['uri_scheme', 'uri_body', 'dataset_ref']
+            )
+        )
+        return r.rowcount
+
     def contains_dataset(self, dataset_id):
+        if self._prepared_statements:
+            return bool(_CONTAINS_DATASET.execute(self._connection, dataset_id=dataset_id).fetchone())
         return bool(
             self._connection.execute(
                 select(
@@ -332,27 +870,80 @@ class PostgresDbAPI(object):
                 raise MissingRecordError("Referenced source dataset doesn't exist")
             raise
 
+    def insert_dataset_sources_bulk(self, edges):
+        """
+        Add many lineage edges with a single statement, skipping those already recorded.
+
+        :param edges: Iterable of ``(classifier, dataset_id, source_dataset_id)``
+        :return: number of edges added
+        :rtype: int
+        """
+        values = [dict(classifier=classifier, dataset_ref=dataset_id, source_dataset_ref=source_dataset_id)
+                  for classifier, dataset_id, source_dataset_id in edges]
+        if not values:
+            return 0
+
+        try:
+            r = self._connection.execute(
+                insert(DATASET_SOURCE).values(values).on_conflict_do_nothing(
+                    index_elements=['classifier', 'dataset_ref']
+                )
+            )
+            return r.rowcount
+        except IntegrityError as e:
+            if e.orig.pgcode == PGCODE_FOREIGN_KEY_VIOLATION:
+                raise MissingRecordError("Referenced source dataset doesn't exist")
+            raise
+
     def archive_dataset(self, dataset_id):
-        self._connection.execute(
+        return self.archive_datasets([dataset_id]) > 0
+
+    def archive_datasets(self, dataset_ids):
+        """
+        Archive many datasets with a single statement, skipping those already archived.
+
+        :return: number of datasets archived
+        :rtype: int
+        """
+        archived = [row[0] for row in self._connection.execute(
             DATASET.update().where(
-                DATASET.c.id == dataset_id
+                DATASET.c.id.in_(dataset_ids)
             ).where(
                 DATASET.c.archived == None
             ).values(
                 archived=func.now()
-            )
-        )
+            ).returning(DATASET.c.id)
+        )]
+        if archived and self._dataset_summary:
+            self.update_dataset_summaries(archived)
+        return len(archived)
 
     def restore_dataset(self, dataset_id):
-        self._connection.execute(
+        return self.restore_datasets([dataset_id]) > 0
+
+    def restore_datasets(self, dataset_ids):
+        """
+        Restore many archived datasets with a single statement, skipping those not archived.
+
+        :return: number of datasets restored
+        :rtype: int
+        """
+        restored = [row[0] for row in self._connection.execute(
             DATASET.update().where(
-                DATASET.c.id == dataset_id
+                DATASET.c.id.in_(dataset_ids)
+            ).where(
+                DATASET.c.archived != None
             ).values(
                 archived=None
-            )
-        )
+            ).returning(DATASET.c.id)
+        )]
+        if restored and self._dataset_summary:
+            self.add_to_dataset_summaries(restored)
+        return len(restored)
 
     def get_dataset(self, dataset_id):
+        if self._prepared_statements:
+            return _GET_DATASET.execute(self._connection, dataset_id=dataset_id).first()
         return self._connection.execute(
             select(_DATASET_SELECT_FIELDS).where(DATASET.c.id == dataset_id)
         ).first()
@@ -373,8 +964,44 @@ class PostgresDbAPI(object):
             )
         ).fetchall()
 
+    def get_all_derived_datasets(self, dataset_ids):
+        """
+        All datasets derived from the given ones, directly or indirectly, each once.
+
+        The whole tree of descendants is found with one recursive query.
+        """
+        # (union rather than union all: datasets reachable by several paths are only visited once)
+        derived = select(
+            [DATASET_SOURCE.c.dataset_ref]
+        ).where(
+            DATASET_SOURCE.c.source_dataset_ref.in_(dataset_ids)
+        ).cte(name='derived', recursive=True)
+        derived = derived.union(
+            select(
+                [DATASET_SOURCE.c.dataset_ref]
+            ).select_from(
+                derived.join(DATASET_SOURCE, DATASET_SOURCE.c.source_dataset_ref == derived.c.dataset_ref)
+            )
+        )
+
+        return self._connection.execute(
+            select(
+                _DATASET_SELECT_FIELDS
+            ).select_from(
+                DATASET.join(derived, DATASET.c.id == derived.c.dataset_ref)
+            )
+        ).fetchall()
+
     def get_dataset_sources(self, dataset_id):
-        # recursively build the list of (dataset_ref, source_dataset_ref) pairs starting from dataset_id
+        return self.get_datasets_sources([dataset_id])
+
+    def get_datasets_sources(self, dataset_ids):
+        """
+        The given datasets and all their ancestors, each once, with their direct sources.
+
+        The lineage graphs of all the datasets are fetched together in one recursive query.
+        """
+        # recursively build the list of (dataset_ref, source_dataset_ref) pairs starting from dataset_ids
         # include (dataset_ref, NULL) [hence the left join]
         sources = select(
             [DATASET.c.id.label('dataset_ref'),
@@ -385,10 +1012,11 @@ class PostgresDbAPI(object):
                          DATASET.c.id == DATASET_SOURCE.c.dataset_ref,
                          isouter=True)
         ).where(
-            DATASET.c.id == dataset_id
+            DATASET.c.id.in_(dataset_ids)
         ).cte(name="sources", recursive=True)
 
-        sources = sources.union_all(
+        # (union rather than union all: ancestors shared by several datasets are only visited once)
+        sources = sources.union(
             select(
                 [sources.c.source_dataset_ref.label('dataset_ref'),
                  DATASET_SOURCE.c.source_dataset_ref,
@@ -430,20 +1058,26 @@ class PostgresDbAPI(object):
     def _alchemify_expressions(expressions):
         def raw_expr(expression):
             if isinstance(expression, OrExpression):
-                return or_(raw_expr(expr) for expr in expression.exprs)
+                exprs = expression.exprs
+                # A list of values for one field: "field IN (...)" can use a single index scan.
+                if exprs and all(isinstance(expr, EqualsExpression) and expr.field is exprs[0].field
+                                 for expr in exprs):
+                    return exprs[0].field.alchemy_expression.in_([expr.value for expr in exprs])
+                return or_(raw_expr(expr) for expr in exprs)
             return expression.alchemy_expression
 
         return [raw_expr(expression) for expression in expressions]
 
     @staticmethod
     def search_datasets_query(expressions, source_exprs=None,
-                              select_fields=None, with_source_ids=False, limit=None):
+                              select_fields=None, with_source_ids=False, limit=None, order_by=None):
         """
         :type expressions: Tuple[Expression]
         :type source_exprs: Tuple[Expression]
         :type select_fields: Iterable[PgField]
         :type with_source_ids: bool
         :type limit: int
+        :param Iterable[PgField] order_by: Fields to sort the datasets by (not supported with source_exprs)
         :rtype: sqlalchemy.Expression
         """
 
@@ -481,10 +1115,13 @@ class PostgresDbAPI(object):
                     from_expression
                 ).where(
                     where_expr
+                ).order_by(
+                    *(field.alchemy_expression for field in order_by or ())
                 ).limit(
                     limit
                 )
             )
+        assert not order_by, 'Ordering is not supported for source searches'
         base_query = (
             select(
                 select_columns + (DATASET_SOURCE.c.source_dataset_ref,
@@ -526,16 +1163,92 @@ class PostgresDbAPI(object):
 
     def search_datasets(self, expressions,
                         source_exprs=None, select_fields=None,
-                        with_source_ids=False, limit=None):
+                        with_source_ids=False, limit=None, fetch_size=None, order_by=None):
         """
         :type with_source_ids: bool
         :type select_fields: tuple[datacube.drivers.postgres._fields.PgField]
         :type expressions: tuple[datacube.drivers.postgres._fields.PgExpression]
+        :param int fetch_size: If set, stream results through a server-side cursor,
+                               holding at most this many rows in memory at a time
+        :type order_by: tuple[datacube.drivers.postgres._fields.PgField]
         """
+        if self._extent_index:
+            expressions = _use_extent_index(expressions)
         select_query = self.search_datasets_query(expressions, source_exprs,
-                                                  select_fields, with_source_ids, limit)
+                                                  select_fields, with_source_ids, limit, order_by)
+        if fetch_size:
+            return self._stream_results(select_query, fetch_size)
         return self._connection.execute(select_query)
 
+    def search_datasets_page(self, expressions, time_field=None, after=None, limit=None):
+        """
+        Matching datasets in (start time, id) order, from after a given dataset: keyset pagination.
+
+        Unlike an offset, a deep page costs no more to fetch than the first.
+
+        :type expressions: tuple[datacube.drivers.postgres._fields.PgExpression]
+        :param RangeDocField time_field: The time field of the datasets' metadata type (None if it has none).
+                                         Datasets without a time sort first.
+        :param (datetime.datetime, uuid.UUID) after: Start time and id of the last dataset of the previous page
+        :return: Rows of the dataset table, with the start time of each as ``page_time``
+        """
+        if self._extent_index:
+            expressions = _use_extent_index(expressions)
+
+        page_time = time_field.lower.alchemy_expression if time_field is not None else null()
+        sort_key = (func.coalesce(page_time, _NEGATIVE_INFINITY), DATASET.c.id)
+
+        select_query = self.search_datasets_query(expressions).column(page_time.label('page_time'))
+        if after is not None:
+            after_time, after_id = after
+            select_query = select_query.where(
+                tuple_(*sort_key) > tuple_(
+                    _NEGATIVE_INFINITY if after_time is None else literal(after_time, TIMESTAMP(timezone=True)),
+                    literal(after_id, DATASET.c.id.type)
+                )
+            )
+        return self._connection.execute(
+            select_query.order_by(*sort_key).limit(limit)
+        )
+
+    def _stream_results(self, query, fetch_size):
+        """
+        Run query with a named (server-side) cursor and yield rows, fetching `fetch_size` at a time.
+
+        Named cursors only live inside a transaction, so the (normally autocommit) connection is switched
+        to READ COMMITTED for the duration of the checkout, the pool resets it on return.
+
+        A connection already in an explicit transaction (ie. from `db.begin()`) can't be switched without
+        changing that transaction, so the rows are then streamed on a connection of their own. (They won't
+        include the transaction's uncommitted changes)
+        """
+        if not self._in_explicit_transaction():
+            yield from self._stream_on(self._connection, query, fetch_size)
+            return
+        with self._connection.engine.connect() as connection:
+            yield from self._stream_on(connection, query, fetch_size)
+
+    def _in_explicit_transaction(self):
+        if self._connection.in_transaction():
+            return True
+        # db.begin() starts transactions with a plain BEGIN, which SQLAlchemy doesn't know about.
+        return self._connection.connection.get_transaction_status() != TRANSACTION_STATUS_IDLE
+
+    @staticmethod
+    def _stream_on(connection, query, fetch_size):
+        connection = connection.execution_options(isolation_level='READ COMMITTED',
+                                                  stream_results=True,
+                                                  max_row_buffer=fetch_size)
+        result = connection.execute(query)
+        try:
+            while True:
+                rows = result.fetchmany(fetch_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            result.close()
+
     @staticmethod
     def search_unique_datasets_query(expressions, select_fields, limit):
         """
@@ -610,6 +1323,8 @@ class PostgresDbAPI(object):
         records per dataset due to the direction of cardinality.
         """
 
+        if self._extent_index:
+            expressions = _use_extent_index(expressions)
         select_query = self.search_unique_datasets_query(expressions, select_fields, limit)
 
         return self._connection.execute(select_query)
@@ -636,6 +1351,8 @@ class PostgresDbAPI(object):
         :type expressions: tuple[datacube.drivers.postgres._fields.PgExpression]
         :rtype: int
         """
+        if self._extent_index:
+            expressions = _use_extent_index(expressions)
 
         raw_expressions = self._alchemify_expressions(expressions)
 
@@ -651,6 +1368,38 @@ class PostgresDbAPI(object):
 
         return self._connection.scalar(select_query)
 
+    def count_datasets_by_product(self, expressions):
+        """
+        Count the matching datasets of each product, in one query.
+
+        :type expressions: tuple[datacube.drivers.postgres._fields.PgExpression]
+        :return: dataset count by product id (products without matches are left out)
+        :rtype: dict[int, int]
+        """
+        if self._extent_index:
+            expressions = _use_extent_index(expressions)
+
+        return dict(self._connection.execute(self.count_datasets_by_product_query(expressions)).fetchall())
+
+    @staticmethod
+    def count_datasets_by_product_query(expressions):
+        """
+        :type expressions: tuple[datacube.drivers.postgres._fields.PgExpression]
+        :rtype: sqlalchemy.Expression
+        """
+        raw_expressions = PostgresDbAPI._alchemify_expressions(expressions)
+        return (
+            select(
+                [DATASET.c.dataset_type_ref, func.count()]
+            ).select_from(
+                PostgresDbAPI._from_expression(DATASET, expressions)
+            ).where(
+                and_(DATASET.c.archived == None, *raw_expressions)
+            ).group_by(
+                DATASET.c.dataset_type_ref
+            )
+        )
+
     def count_datasets_through_time(self, start, end, period, time_field, expressions):
         """
         :type period: str
@@ -668,9 +1417,122 @@ class PostgresDbAPI(object):
             # if not time_period.upper_inf:
             yield Range(time_period.lower, time_period.upper), dataset_count
 
+    def count_datasets_through_time_by_product(self, start, end, period, time_field, expressions):
+        """
+        Count the matching datasets of each product in time slices, in one query.
+
+        :type period: str
+        :type start: datetime.datetime
+        :type end: datetime.datetime
+        :type expressions: tuple[datacube.drivers.postgres._fields.PgExpression]
+        :return: each time range, with its dataset count by product id (products without matches are left out)
+        :rtype: list[(Range, dict[int, int])]
+        """
+        product_ids = _summarised_product_ids(expressions) if self._use_dataset_summary else None
+        if (product_ids is not None and _is_whole_days(start, end, period)
+                and self._summaries_within_days(product_ids, start)):
+            # Each dataset lies within its start day, so it's in the one time slice holding that day.
+            query = self.count_summaries_through_time_by_product_query(start, end, period, product_ids)
+        else:
+            query = self.count_datasets_through_time_by_product_query(start, end, period, time_field, expressions)
+        results = self._connection.execute(query)
+
+        periods = []
+        for time_period, dataset_type_ref, dataset_count in results:
+            if not periods or periods[-1][0] != time_period:
+                periods.append((time_period, {}))
+            if dataset_type_ref is not None:
+                periods[-1][1][dataset_type_ref] = dataset_count
+
+        return [(Range(time_period.lower, time_period.upper), counts) for time_period, counts in periods]
+
+    def count_datasets_through_time_by_product_query(self, start, end, period, time_field, expressions):
+        raw_expressions = self._alchemify_expressions(expressions)
+        time_ranges = self._time_ranges_query(start, end, period)
+
+        return (
+            select((
+                time_ranges.c.time_period,
+                DATASET.c.dataset_type_ref,
+                func.count(DATASET.c.id),
+            )).select_from(
+                # Periods without datasets get a single row with a null product.
+                time_ranges.outerjoin(
+                    self._from_expression(DATASET, expressions),
+                    and_(
+                        time_field.alchemy_expression.overlaps(time_ranges.c.time_period),
+                        DATASET.c.archived == None,
+                        *raw_expressions
+                    )
+                )
+            ).group_by(
+                time_ranges.c.time_period,
+                DATASET.c.dataset_type_ref
+            ).order_by(
+                time_ranges.c.time_period
+            )
+        )
+
+    def _summaries_within_days(self, dataset_type_ids, start):
+        """
+        Do the products' datasets (from the start time on) each end within the day they start?
+
+        Only then are the summaries counted the same way as the datasets: by the time slices they overlap.
+        """
+        return not self._connection.execute(
+            select([exists().where(and_(
+                DATASET_SUMMARY.c.dataset_type_ref.in_(dataset_type_ids),
+                DATASET_SUMMARY.c.time_max >= start,
+                DATASET_SUMMARY.c.time_max >= _utc_day_start(DATASET_SUMMARY.c.day) + cast('1 day', INTERVAL),
+            ))])
+        ).scalar()
+
+    def count_summaries_through_time_by_product_query(self, start, end, period, dataset_type_ids):
+        time_ranges = self._time_ranges_query(start, end, period)
+
+        return (
+            select((
+                time_ranges.c.time_period,
+                DATASET_SUMMARY.c.dataset_type_ref,
+                func.sum(DATASET_SUMMARY.c.dataset_count),
+            )).select_from(
+                time_ranges.outerjoin(
+                    DATASET_SUMMARY,
+                    and_(
+                        time_ranges.c.time_period.op('@>')(_utc_day_start(DATASET_SUMMARY.c.day)),
+                        DATASET_SUMMARY.c.dataset_type_ref.in_(dataset_type_ids)
+                    )
+                )
+            ).group_by(
+                time_ranges.c.time_period,
+                DATASET_SUMMARY.c.dataset_type_ref
+            ).order_by(
+                time_ranges.c.time_period
+            )
+        )
+
     def count_datasets_through_time_query(self, start, end, period, time_field, expressions):
         raw_expressions = self._alchemify_expressions(expressions)
+        time_ranges = self._time_ranges_query(start, end, period)
 
+        count_query = (
+            select(
+                (func.count('*'),)
+            ).select_from(
+                self._from_expression(DATASET, expressions)
+            ).where(
+                and_(
+                    time_field.alchemy_expression.overlaps(time_ranges.c.time_period),
+                    DATASET.c.archived == None,
+                    *raw_expressions
+                )
+            )
+        )
+
+        return select((time_ranges.c.time_period, count_query.label('dataset_count')))
+
+    @staticmethod
+    def _time_ranges_query(start, end, period):
         start_times = select((
             func.generate_series(start, end, cast(period, INTERVAL)).label('start_time'),
         )).alias('start_times')
@@ -685,7 +1547,7 @@ class PostgresDbAPI(object):
         ).alias('all_time_ranges')
 
         # Exclude the trailing (end time to infinite) row. Is there a simpler way?
-        time_ranges = (
+        return (
             select((
                 time_range_select,
             )).where(
@@ -693,40 +1555,34 @@ class PostgresDbAPI(object):
             )
         ).alias('time_ranges')
 
-        count_query = (
-            select(
-                (func.count('*'),)
-            ).select_from(
-                self._from_expression(DATASET, expressions)
-            ).where(
-                and_(
-                    time_field.alchemy_expression.overlaps(time_ranges.c.time_period),
-                    DATASET.c.archived == None,
-                    *raw_expressions
-                )
-            )
-        )
-
-        return select((time_ranges.c.time_period, count_query.label('dataset_count')))
-
     @staticmethod
     def _from_expression(source_table, expressions=None, fields=None):
+        def expression_tables(expression):
+            if isinstance(expression, OrExpression):
+                return {table for expr in expression.exprs for table in expression_tables(expr)}
+            return {expression.field.required_alchemy_table}
+
         join_tables = set()
         if expressions:
-            join_tables.update(expression.field.required_alchemy_table for expression in expressions)
+            for expression in expressions:
+                join_tables.update(expression_tables(expression))
         if fields:
             join_tables.update(field.required_alchemy_table for field in fields)
         join_tables.discard(source_table)
 
-        table_order_hack = [DATASET_SOURCE, DATASET_LOCATION, DATASET, DATASET_TYPE, METADATA_TYPE]
+        table_order_hack = [DATASET_SOURCE, DATASET_LOCATION, DATASET, DATASET_EXTENT, DATASET_TYPE, METADATA_TYPE]
 
         from_expression = source_table
         for table in table_order_hack:
             if table in join_tables:
-                from_expression = from_expression.join(table)
+                # Not every dataset has an extent
+                isouter = table is DATASET_EXTENT
+                from_expression = from_expression.join(table, isouter=isouter)
         return from_expression
 
     def get_dataset_type(self, id_):
+        if self._prepared_statements:
+            return _GET_DATASET_TYPE.execute(self._connection, dataset_type_id=id_).first()
         return self._connection.execute(
             DATASET_TYPE.select().where(DATASET_TYPE.c.id == id_)
         ).first()
@@ -913,7 +1769,17 @@ class PostgresDbAPI(object):
     def get_all_metadata_types(self):
         return self._connection.execute(METADATA_TYPE.select().order_by(METADATA_TYPE.c.name.asc())).fetchall()
 
+    def get_catalogue_version(self):
+        """
+        A cheap value that changes whenever a product or metadata type is added, updated or removed.
+
+        (The row count and newest row version of both tables)
+        """
+        return tuple(self._connection.execute(_CATALOGUE_VERSION).fetchone())
+
     def get_locations(self, dataset_id):
+        if self._prepared_statements:
+            return [record[0] for record in _GET_LOCATIONS.execute(self._connection, dataset_id=dataset_id)]
         return [
             record[0]
             for record in self._connection.execute(
@@ -928,6 +1794,32 @@ class PostgresDbAPI(object):
             ).fetchall()
         ]
 
+    def get_locations_many(self, dataset_ids):
+        """
+        Active locations of many datasets, in one query.
+
+        :return: the uris of each dataset, newest first (datasets without locations are left out)
+        :rtype: dict[uuid.UUID, list[str]]
+        """
+        locations = {}
+        dataset_ids = list(dataset_ids)
+        if not dataset_ids:
+            return locations
+
+        for dataset_ref, uri in self._connection.execute(
+                select([
+                    DATASET_LOCATION.c.dataset_ref,
+                    _dataset_uri_field(DATASET_LOCATION)
+                ]).where(
+                    and_(DATASET_LOCATION.c.dataset_ref.in_(dataset_ids), DATASET_LOCATION.c.archived == None)
+                ).order_by(
+                    DATASET_LOCATION.c.added.desc(),
+                    DATASET_LOCATION.c.id.desc()
+                )
+        ):
+            locations.setdefault(dataset_ref, []).append(uri)
+        return locations
+
     def get_archived_locations(self, dataset_id):
         """
         Return a list of uris and archived_times for a dataset
@@ -963,6 +1855,29 @@ class PostgresDbAPI(object):
         )
         return res.rowcount > 0
 
+    def remove_locations_bulk(self, locations):
+        """
+        Remove many locations with a single statement.
+
+        :param locations: Iterable of ``(dataset_id, uri)``
+        :return: number of locations removed
+        :rtype: int
+        """
+        keys = [(dataset_id,) + _split_uri(uri) for dataset_id, uri in locations]
+        if not keys:
+            return 0
+
+        res = self._connection.execute(
+            delete(DATASET_LOCATION).where(
+                tuple_(
+                    DATASET_LOCATION.c.dataset_ref,
+                    DATASET_LOCATION.c.uri_scheme,
+                    DATASET_LOCATION.c.uri_body,
+                ).in_(keys)
+            )
+        )
+        return res.rowcount
+
     def archive_location(self, dataset_id, uri):
         scheme, body = _split_uri(uri)
         res = self._connection.execute(
@@ -0,0 +1,232 @@
+# coding=utf-8
+"""
+Asyncio access to the index database, through asyncpg.
+
+Queries are built with the same SQLAlchemy expressions as :mod:`._api`, and compiled to SQL for asyncpg
+(which prepares and caches each distinct statement on its connections).
+"""
+import asyncio
+import logging
+from decimal import Decimal
+
+import asyncpg
+from psycopg2.extras import Range as PgRange, NumericRange
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.engine.url import URL as EngineUrl
+
+from datacube.index.exceptions import IndexSetupError
+from datacube.utils.documents import parse_json
+from . import _api
+from ._api import PostgresDbAPI, _DATASET_SELECT_FIELDS, _CATALOGUE_VERSION, _use_extent_index
+from ._connections import (PostgresDb, DEFAULT_DB_USER, DEFAULT_DB_PORT, DEFAULT_POOL_SIZE, DEFAULT_MAX_OVERFLOW,
+                           _to_json)
+from ._core import schema_qualified
+from ._schema import DATASET, DATASET_TYPE, METADATA_TYPE
+
+_LOG = logging.getLogger(__name__)
+
+# We only compile queries: the psycopg2 dialect is never used to connect.
+_DIALECT = postgresql.dialect()
+
+
+class _Row(dict):
+    """
+    A result row, with columns available as keys or attributes (like a SQLAlchemy row).
+    """
+    __slots__ = ()
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+
+class AsyncPostgresDb(object):
+    """
+    An asyncio version of :class:`PostgresDb`, for services handling many concurrent requests.
+
+    The connection pool is created on first use, in the running event loop. Use one instance per event loop.
+    """
+
+    def __init__(self, url, application_name=None, validate=True,
+                 pool_size=DEFAULT_POOL_SIZE, max_overflow=DEFAULT_MAX_OVERFLOW):
+        self._url = url
+        self._application_name = application_name
+        self._validate = validate
+        self._pool_size = pool_size
+        self._max_size = pool_size + max_overflow
+        self._pool = None  # type: asyncpg.pool.Pool
+        self._pool_lock = None  # type: asyncio.Lock
+        self._extent_index = None
+
+    @classmethod
+    def from_config(cls, config, application_name=None, validate_connection=True):
+        return AsyncPostgresDb(
+            EngineUrl(
+                'postgresql',
+                host=config['db_hostname'] or None,
+                database=config['db_database'],
+                port=config.get('db_port', DEFAULT_DB_PORT),
+                username=config.get('db_username', DEFAULT_DB_USER),
+                password=config.get('db_password', None),
+            ),
+            # pylint: disable=protected-access
+            application_name=PostgresDb._expand_app_name(application_name),
+            validate=validate_connection,
+            pool_size=int(config.get('db_pool_size', DEFAULT_POOL_SIZE)),
+            max_overflow=int(config.get('db_max_overflow', DEFAULT_MAX_OVERFLOW)),
+        )
+
+    @property
+    def url(self):
+        return self._url
+
+    @classmethod
+    def get_dataset_fields(cls, metadata_type_definition):
+        return _api.get_dataset_fields(metadata_type_definition)
+
+    async def _get_pool(self):
+        if self._pool is None:
+            if self._pool_lock is None:
+                self._pool_lock = asyncio.Lock()
+            async with self._pool_lock:
+                if self._pool is None:
+                    self._pool = await self._create_pool()
+        return self._pool
+
+    async def _create_pool(self):
+        url = self._url
+        pool = await asyncpg.create_pool(
+            host=url.host, port=url.port, database=url.database,
+            user=url.username, password=url.password,
+            min_size=self._pool_size,
+            max_size=self._max_size,
+            server_settings={'application_name': self._application_name},
+            init=_init_connection,
+        )
+        async with pool.acquire() as connection:
+            if self._validate and not await connection.fetchval('select to_regclass($1) is not null',
+                                                                schema_qualified('dataset')):
+                await pool.close()
+                raise IndexSetupError('\n\nNo DB schema exists. Have you run init?\n\t{init_command}'.format(
+                    init_command='datacube system init'
+                ))
+            self._extent_index = await connection.fetchval('select to_regclass($1) is not null',
+                                                           schema_qualified('dataset_extent'))
+        return pool
+
+    def connect(self):
+        """
+        Borrow a connection from the pool::
+
+            async with db.connect() as connection:
+                dataset = await connection.get_dataset(id_)
+
+        :rtype: _Connection
+        """
+        return _Connection(self)
+
+    async def close(self):
+        """
+        Close all connections of the pool.
+        """
+        if self._pool is not None:
+            pool, self._pool = self._pool, None
+            await pool.close()
+
+    def __repr__(self):
+        return "AsyncPostgresDb<url={!r}>".format(self._url)
+
+
+class _Connection(object):
+    def __init__(self, db):
+        self._db = db
+        self._pool = None
+        self._connection = None
+
+    async def __aenter__(self):
+        # pylint: disable=protected-access
+        self._pool = await self._db._get_pool()
+        self._connection = await self._pool.acquire()
+        return AsyncPostgresDbAPI(self._connection, extent_index=self._db._extent_index)
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        connection, self._connection = self._connection, None
+        await self._pool.release(connection)
+
+
+def _as_param(value):
+    """
+    Convert a query parameter from the form psycopg2 takes to the form asyncpg takes.
+    """
+    if isinstance(value, PgRange):
+        lower, upper = value.lower, value.upper
+        if isinstance(value, NumericRange):
+            # (asyncpg only encodes numerics from Decimals)
+            lower, upper = (Decimal(repr(bound)) if isinstance(bound, float) else bound for bound in (lower, upper))
+        return asyncpg.Range(lower, upper, lower_inc=value.lower_inc, upper_inc=value.upper_inc, empty=value.isempty)
+    return value
+
+
+async def _init_connection(connection):
+    for type_name in ('json', 'jsonb'):
+        await connection.set_type_codec(type_name, encoder=_to_json, decoder=parse_json, schema='pg_catalog')
+
+
+class AsyncPostgresDbAPI(object):
+    """
+    The queries of :class:`PostgresDbAPI` needed by the asyncio index, on one asyncpg connection.
+    """
+
+    def __init__(self, connection, extent_index=False):
+        """
+        :type connection: asyncpg.Connection
+        """
+        self._connection = connection
+        self._extent_index = extent_index
+
+    async def _fetch_records(self, query):
+        sql, binds = _api.to_numbered_sql(query, _DIALECT)
+        return await self._connection.fetch(sql, *(_as_param(value) for _, _, value in binds))
+
+    async def _fetch(self, query):
+        return [_Row(record.items()) for record in await self._fetch_records(query)]
+
+    async def get_dataset(self, dataset_id):
+        rows = await self._fetch(select(_DATASET_SELECT_FIELDS).where(DATASET.c.id == dataset_id))
+        return rows[0] if rows else None
+
+    async def get_datasets(self, dataset_ids):
+        return await self._fetch(select(_DATASET_SELECT_FIELDS).where(DATASET.c.id.in_(dataset_ids)))
+
+    async def search_datasets(self, expressions, limit=None):
+        """
+        :type expressions: tuple[datacube.drivers.postgres._fields.PgExpression]
+        :rtype: list[_Row]
+        """
+        if self._extent_index:
+            expressions = _use_extent_index(expressions)
+        return await self._fetch(PostgresDbAPI.search_datasets_query(expressions, limit=limit))
+
+    async def count_datasets_by_product(self, expressions):
+        """
+        :type expressions: tuple[datacube.drivers.postgres._fields.PgExpression]
+        :return: dataset count by product id (products without matches are left out)
+        :rtype: dict[int, int]
+        """
+        if self._extent_index:
+            expressions = _use_extent_index(expressions)
+        return dict(tuple(record)
+                    for record in await self._fetch_records(PostgresDbAPI.count_datasets_by_product_query(expressions)))
+
+    async def get_catalogue_version(self):
+        record, = await self._fetch_records(_CATALOGUE_VERSION)
+        return tuple(record)
+
+    async def get_all_metadata_types(self):
+        return await self._fetch(METADATA_TYPE.select().order_by(METADATA_TYPE.c.name.asc()))
+
+    async def get_all_dataset_types(self):
+        return await self._fetch(DATASET_TYPE.select().order_by(DATASET_TYPE.c.name.asc()))
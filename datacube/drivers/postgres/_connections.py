@@ -13,6 +13,9 @@ import json
 import logging
 import os
 import re
+import threading
+import time
+from collections import namedtuple
 from contextlib import contextmanager
 from typing import Optional
 
@@ -22,8 +25,10 @@ from sqlalchemy.engine.url import URL as EngineUrl
 import datacube
 from datacube.index.exceptions import IndexSetupError
 from datacube.utils import jsonify_document
+from datacube.utils.documents import orjson, parse_json
 from . import _api
 from . import _core
+from .sql import pg_exists
 
 _LIB_ID = 'agdc-' + str(datacube.__version__)
 
@@ -37,6 +42,12 @@ except (ImportError, KeyError):
     # No default on Windows and some other systems
     DEFAULT_DB_USER = None
 DEFAULT_DB_PORT = 5432
+DEFAULT_POOL_SIZE = 5
+DEFAULT_MAX_OVERFLOW = 10
+
+#: A snapshot of connection pool usage (see :meth:`PostgresDb.pool_metrics`)
+PoolMetrics = namedtuple('PoolMetrics', ['size', 'checked_out', 'checked_in', 'overflow',
+                                         'checkouts', 'wait_seconds', 'max_wait_seconds'])
 
 
 class PostgresDb(object):
@@ -54,10 +65,20 @@ class PostgresDb(object):
     or else use a separate instance of this class in each process.
     """
 
-    def __init__(self, engine):
+    def __init__(self, engine, prepared_statements=False, dataset_summaries=False):
         # We don't recommend using this constructor directly as it may change.
         # Use static methods PostgresDb.create() or PostgresDb.from_config()
         self._engine = engine
+        self._prepared_statements = prepared_statements
+        # Answer time bounds and counts from the dataset_summary table. Only safe when every client
+        # writing to the database keeps it up to date, so it's off unless asked for.
+        self._use_dataset_summaries = dataset_summaries
+        # Connection checkouts: (count, total seconds waited, longest wait)
+        self._checkouts = (0, 0.0, 0.0)
+        self._checkouts_lock = threading.Lock()
+        # Whether the database has the dataset_extent and dataset_summary tables. Checked on first use.
+        self._extent_index = None  # type: Optional[bool]
+        self._dataset_summary = None  # type: Optional[bool]
 
     @classmethod
     def from_config(cls, config, application_name=None, validate_connection=True):
@@ -71,12 +92,18 @@ class PostgresDb(object):
             config.get('db_port', DEFAULT_DB_PORT),
             application_name=app_name,
             validate=validate_connection,
-            pool_timeout=int(config.get('db_connection_timeout', 60))
+            pool_timeout=int(config.get('db_connection_timeout', 60)),
+            pool_size=int(config.get('db_pool_size', DEFAULT_POOL_SIZE)),
+            max_overflow=int(config.get('db_max_overflow', DEFAULT_MAX_OVERFLOW)),
+            prepared_statements=_as_bool(config.get('db_prepared_statements', False)),
+            dataset_summaries=_as_bool(config.get('db_dataset_summaries', False)),
         )
 
     @classmethod
     def create(cls, hostname, database, username=None, password=None, port=None,
-               application_name=None, validate=True, pool_timeout=60):
+               application_name=None, validate=True, pool_timeout=60,
+               pool_size=DEFAULT_POOL_SIZE, max_overflow=DEFAULT_MAX_OVERFLOW,
+               prepared_statements=False, dataset_summaries=False):
         engine = cls._create_engine(
             EngineUrl(
                 'postgresql',
@@ -84,7 +111,9 @@ class PostgresDb(object):
                 username=username, password=password,
             ),
             application_name=application_name,
-            pool_timeout=pool_timeout)
+            pool_timeout=pool_timeout,
+            pool_size=pool_size,
+            max_overflow=max_overflow)
         if validate:
             if not _core.database_exists(engine):
                 raise IndexSetupError('\n\nNo DB schema exists. Have you run init?\n\t{init_command}'.format(
@@ -97,10 +126,11 @@ class PostgresDb(object):
                     'An administrator must run init:\n\t{init_command}'.format(
                         init_command='datacube -v system init'
                     ))
-        return PostgresDb(engine)
+        return PostgresDb(engine, prepared_statements=prepared_statements, dataset_summaries=dataset_summaries)
 
     @staticmethod
-    def _create_engine(url, application_name=None, pool_timeout=60):
+    def _create_engine(url, application_name=None, pool_timeout=60,
+                       pool_size=DEFAULT_POOL_SIZE, max_overflow=DEFAULT_MAX_OVERFLOW):
         return create_engine(
             url,
             echo=False,
@@ -111,10 +141,14 @@ class PostgresDb(object):
             isolation_level='AUTOCOMMIT',
 
             json_serializer=_to_json,
+            json_deserializer=parse_json,
             # If a connection is idle for this many seconds, SQLAlchemy will renew it rather
             # than assuming it's still open. Allows servers to close idle connections without clients
             # getting errors.
             pool_recycle=pool_timeout,
+            # Connections kept open in the pool, and how many more may be opened when they're all in use.
+            pool_size=pool_size,
+            max_overflow=max_overflow,
             connect_args={'application_name': application_name}
         )
 
@@ -180,9 +214,83 @@ class PostgresDb(object):
         is_new = _core.ensure_db(self._engine, with_permissions=with_permissions)
         if not is_new:
             _core.update_schema(self._engine)
+        self._extent_index = None
+        self._dataset_summary = None
 
         return is_new
 
+    @property
+    def has_extent_index(self):
+        """
+        Does the database maintain dataset bounding boxes for spatial searches?
+
+        (Databases created by older versions don't, until updated with `datacube system init`)
+        """
+        if self._extent_index is None:
+            self._extent_index = pg_exists(self._engine, _core.schema_qualified('dataset_extent'))
+        return self._extent_index
+
+    @property
+    def has_dataset_summary(self):
+        """
+        Does the database maintain per-product dataset summaries for time bounds and counts?
+
+        (Databases created by older versions don't, until updated with `datacube system init`)
+        """
+        if self._dataset_summary is None:
+            self._dataset_summary = pg_exists(self._engine, _core.schema_qualified('dataset_summary'))
+        return self._dataset_summary
+
+    @property
+    def uses_dataset_summary(self):
+        """
+        Are time bounds and counts answered from the dataset summaries?
+
+        (Only when turned on with `db_dataset_summaries`: the summaries are kept up to date by this
+        library, so writes by older versions leave them stale until the next `datacube system init`)
+        """
+        return self._use_dataset_summaries and self.has_dataset_summary
+
+    def pool_metrics(self):
+        """
+        Current usage of the connection pool, and totals of connection checkouts so far.
+
+        Useful for monitoring long-running servers: a growing wait time means the pool
+        is too small for the number of concurrent requests.
+
+        :rtype: PoolMetrics
+        """
+        pool = self._engine.pool
+        checkouts, wait_seconds, max_wait_seconds = self._checkouts
+        return PoolMetrics(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=pool.overflow(),
+            checkouts=checkouts,
+            wait_seconds=wait_seconds,
+            max_wait_seconds=max_wait_seconds,
+        )
+
+    def _checkout(self):
+        """
+        Borrow a raw connection from the pool, recording how long we waited for it.
+        """
+        started = time.monotonic()
+        connection = self._engine.connect()
+        waited = time.monotonic() - started
+        with self._checkouts_lock:
+            checkouts, wait_seconds, max_wait_seconds = self._checkouts
+            self._checkouts = (checkouts + 1, wait_seconds + waited, max(max_wait_seconds, waited))
+        return connection
+
+    def _api_options(self):
+        # (Checked before borrowing the connection, as the checks may need a connection of their own)
+        return dict(extent_index=self.has_extent_index,
+                    dataset_summary=self.has_dataset_summary,
+                    use_dataset_summary=self.uses_dataset_summary,
+                    prepared_statements=self._prepared_statements)
+
     @contextmanager
     def connect(self):
         """
@@ -198,8 +306,9 @@ class PostgresDb(object):
         as some servers will aggressively close idle connections (eg. DEA's NCI servers). It also prevents the
         connection from being reused while borrowed.
         """
-        with self._engine.connect() as connection:
-            yield _api.PostgresDbAPI(connection)
+        options = self._api_options()
+        with self._checkout() as connection:
+            yield _api.PostgresDbAPI(connection, **options)
             connection.close()
 
     @contextmanager
@@ -218,10 +327,11 @@ class PostgresDb(object):
 
         :rtype: PostgresDBAPI
         """
-        with self._engine.connect() as connection:
+        options = self._api_options()
+        with self._checkout() as connection:
             connection.execute(text('BEGIN'))
             try:
-                yield _api.PostgresDbAPI(connection)
+                yield _api.PostgresDbAPI(connection, **options)
                 connection.execute(text('COMMIT'))
             except Exception:  # pylint: disable=broad-except
                 connection.execute(text('ROLLBACK'))
@@ -240,9 +350,25 @@ class PostgresDb(object):
         return "PostgresDb<engine={!r}>".format(self._engine)
 
 
+def _as_bool(value):
+    """
+    >>> _as_bool('no'), _as_bool('True'), _as_bool(False)
+    (False, True, False)
+    """
+    if isinstance(value, str):
+        return value.strip().lower() not in ('0', 'false', 'no', 'off', '')
+    return bool(value)
+
+
 def _to_json(o):
     # Postgres <=9.5 doesn't support NaN and Infinity
     fixedup = jsonify_document(o)
+    if orjson is not None:
+        try:
+            return orjson.dumps(fixedup).decode('utf-8')
+        except TypeError:
+            # Values it doesn't handle (such as integers over 64 bits) may still be fine for json.
+            pass
     return json.dumps(fixedup, default=_json_fallback)
 
 
@@ -104,6 +104,10 @@ def ensure_db(engine, with_permissions=True):
         -- Allow creation of indexes, views
         grant create on schema {schema} to agdc_manage;
         """.format(schema=SCHEMA_NAME))
+        if pg_exists(c, schema_qualified('dataset_extent')):
+            _grant_dataset_extent(c)
+        if pg_exists(c, schema_qualified('dataset_summary')):
+            _grant_dataset_summary(c)
 
     c.close()
 
@@ -133,6 +137,8 @@ def schema_is_latest(engine):
     has_dataset_source_update = not pg_exists(engine, schema_qualified('uq_dataset_source_dataset_ref'))
     has_uri_searches = pg_exists(engine, schema_qualified(location_first_index))
     has_dataset_location = pg_column_exists(engine, schema_qualified('dataset_location'), 'archived')
+    # The dataset_extent and dataset_summary tables are optional: they are used when present
+    # (see PostgresDb.has_extent_index) and created by update_schema.
     return has_dataset_source_update and has_uri_searches and has_dataset_location
 
 
@@ -184,6 +190,65 @@ def update_schema(engine):
         """.format(schema=SCHEMA_NAME))
         _LOG.info('Completed uri-search update')
 
+    # Bounding-box table for indexed spatial searches.
+    if not pg_exists(engine, schema_qualified('dataset_extent')):
+        # Imported here: the table definitions depend on this module.
+        # pylint: disable=cyclic-import
+        from ._schema import DATASET_EXTENT
+        from ._api import PostgresDbAPI
+
+        _LOG.info('Applying dataset extent update')
+        with engine.connect() as c:
+            c.execute('begin')
+            try:
+                DATASET_EXTENT.create(c)
+                PostgresDbAPI(c).update_dataset_extents()
+                if has_role(c, 'agdc_user'):
+                    _grant_dataset_extent(c)
+                c.execute('commit')
+            except:
+                c.execute('rollback')
+                raise
+        _LOG.info('Completed dataset extent update')
+    elif has_role(engine, 'agdc_user'):
+        # Earlier versions didn't let agdc_ingest replace extents of updated datasets.
+        _grant_dataset_extent(engine)
+
+    # Per-product summaries for time bounds and counts through time. Rebuilt if they already exist,
+    # as writes by older versions don't keep them up to date.
+    # pylint: disable=cyclic-import
+    from ._schema import DATASET_SUMMARY
+    from . import _api
+
+    _LOG.info('Applying dataset summary update')
+    with engine.connect() as c:
+        c.execute('begin')
+        try:
+            if not pg_exists(c, schema_qualified('dataset_summary')):
+                DATASET_SUMMARY.create(c)
+                if has_role(c, 'agdc_user'):
+                    _grant_dataset_summary(c)
+            _api.PostgresDbAPI(c).update_dataset_summaries()
+            c.execute('commit')
+        except:
+            c.execute('rollback')
+            raise
+    _LOG.info('Completed dataset summary update')
+
+
+def _grant_dataset_extent(conn):
+    conn.execute("""
+    grant select on {schema}.dataset_extent to agdc_user;
+    grant insert, delete on {schema}.dataset_extent to agdc_ingest;
+    """.format(schema=SCHEMA_NAME))
+
+
+def _grant_dataset_summary(conn):
+    conn.execute("""
+    grant select on {schema}.dataset_summary to agdc_user;
+    grant insert, update, delete on {schema}.dataset_summary to agdc_ingest;
+    """.format(schema=SCHEMA_NAME))
+
 
 def _ensure_role(engine, name, inherits_from=None, add_user=False, create_db=False):
     if has_role(engine, name):
@@ -9,7 +9,7 @@ from decimal import Decimal
 
 from dateutil import tz
 from psycopg2.extras import NumericRange, DateTimeTZRange
-from sqlalchemy import cast, func, and_
+from sqlalchemy import cast, func, and_, or_
 from sqlalchemy.dialects import postgresql as postgres
 from sqlalchemy.dialects.postgresql import INT4RANGE
 from sqlalchemy.dialects.postgresql import NUMRANGE, TSTZRANGE
@@ -493,6 +493,31 @@ class RangeBetweenExpression(PgExpression):
         )
 
 
+class BoxOverlapExpression(PgExpression):
+    """
+    Overlap of a (postgres geometric) box field with a (west, south, east, north) bounding box.
+
+    Rows without a box are matched by the ``fallback`` expressions instead, if any are given.
+    """
+
+    def __init__(self, field, west, south, east, north, fallback=None):
+        super(BoxOverlapExpression, self).__init__(field)
+        self.bounds = (west, south, east, north)
+        self.fallback = fallback
+
+    @property
+    def alchemy_expression(self):
+        west, south, east, north = self.bounds
+        overlaps = self.field.alchemy_expression.op('&&')(
+            func.box(func.point(west, south), func.point(east, north))
+        )
+        if self.fallback is None:
+            return overlaps
+        return or_(overlaps,
+                   and_(self.field.alchemy_expression == None,
+                        *(expression.alchemy_expression for expression in self.fallback)))
+
+
 class RangeContainsExpression(PgExpression):
     def __init__(self, field, value):
         super(RangeContainsExpression, self).__init__(field)
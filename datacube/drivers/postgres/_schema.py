@@ -6,7 +6,7 @@ Tables for indexing the datasets which were ingested into the AGDC.
 import logging
 
 from sqlalchemy import ForeignKey, UniqueConstraint, PrimaryKeyConstraint, CheckConstraint, SmallInteger
-from sqlalchemy import Table, Column, Integer, String, DateTime
+from sqlalchemy import Table, Column, Integer, String, DateTime, Date, Index
 from sqlalchemy.dialects import postgresql as postgres
 from sqlalchemy.sql import func
 
@@ -111,3 +111,49 @@ DATASET_SOURCE = Table(
     PrimaryKeyConstraint('dataset_ref', 'classifier'),
     UniqueConstraint('source_dataset_ref', 'dataset_ref'),
 )
+
+# Bounding box of each dataset in EPSG:4326, derived from the metadata type's lat/lon search fields.
+#
+# Spatial searches can use a single GiST index on the box rather than intersecting two separate
+# lat and lon range indexes. Only datasets that have both lat and lon fields are present.
+DATASET_EXTENT = Table(
+    'dataset_extent', _core.METADATA,
+    Column('dataset_ref', None, ForeignKey(DATASET.c.id), primary_key=True),
+
+    Column('west', postgres.DOUBLE_PRECISION, nullable=False),
+    Column('south', postgres.DOUBLE_PRECISION, nullable=False),
+    Column('east', postgres.DOUBLE_PRECISION, nullable=False),
+    Column('north', postgres.DOUBLE_PRECISION, nullable=False),
+)
+
+
+def extent_box(table=DATASET_EXTENT):
+    """
+    Postgres (non-PostGIS) box built from the extent columns, this is what the index is on.
+    """
+    return func.box(func.point(table.c.west, table.c.south),
+                    func.point(table.c.east, table.c.north))
+
+
+Index('ix_{}_dataset_extent_bbox'.format(_core.SCHEMA_NAME), extent_box(), postgresql_using='gist')
+
+
+# Active datasets of each product summarised per (UTC) day of their start time,
+# so product time bounds, extents and counts through time don't need to scan the datasets.
+DATASET_SUMMARY = Table(
+    'dataset_summary', _core.METADATA,
+    Column('dataset_type_ref', None, ForeignKey(DATASET_TYPE.c.id), primary_key=True),
+    Column('day', Date, primary_key=True),
+
+    Column('dataset_count', Integer, nullable=False),
+
+    # Earliest start and latest end time of the datasets
+    Column('time_min', DateTime(timezone=True), nullable=False),
+    Column('time_max', DateTime(timezone=True), nullable=False),
+
+    # Bounding box of the datasets, if their metadata type has lat/lon fields.
+    Column('west', postgres.DOUBLE_PRECISION),
+    Column('south', postgres.DOUBLE_PRECISION),
+    Column('east', postgres.DOUBLE_PRECISION),
+    Column('north', postgres.DOUBLE_PRECISION),
+)
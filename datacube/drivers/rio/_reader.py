@@ -1,12 +1,14 @@
 """ reader
 """
 from typing import (
-    List, Optional, Union, Any, Iterable,
+    List, Optional, Union, Any, Iterable, Sequence,
     Iterator, Tuple, NamedTuple, TypeVar
 )
+from collections import OrderedDict
+import threading
 import numpy as np
 from affine import Affine
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, Future
 import rasterio
 from rasterio.io import DatasetReader
 from rasterio.crs import CRS as RioCRS
@@ -19,6 +21,7 @@ from datacube.utils import (
     get_part_from_uri,
     datetime_to_seconds_since_1970,
 )
+from datacube.utils.rio import activate_from_config
 from datacube.drivers._types import (
     ReaderDriverEntry,
     ReaderDriver,
@@ -82,12 +85,61 @@ def _dc_crs(crs: Optional[RioCRS]) -> Optional[CRS]:
 
 
 def _read(src: DatasetReader,
+          lock: threading.Lock,
           bidx: int,
           window: Optional[RasterWindow],
           out_shape: Optional[RasterShape]) -> np.ndarray:
-    return src.read(bidx,
-                    window=_roi_to_window(window, src.shape),
-                    out_shape=out_shape)
+    # GDAL dataset handles are not safe to read from concurrently
+    with lock:
+        return src.read(bidx,
+                        window=_roi_to_window(window, src.shape),
+                        out_shape=out_shape)
+
+
+def _read_many(src: DatasetReader,
+               lock: threading.Lock,
+               bidxs: Sequence[int],
+               window: Optional[RasterWindow],
+               out_shape: Optional[RasterShape]) -> List[np.ndarray]:
+    """ Read several bands with one request, returns one 2d array per entry of ``bidxs``
+    """
+    indexes = sorted(set(bidxs))
+    if out_shape is not None:
+        out_shape = (len(indexes), *out_shape)
+
+    with lock:
+        pix = src.read(indexes,
+                       window=_roi_to_window(window, src.shape),
+                       out_shape=out_shape)
+
+    slot = {bidx: i for i, bidx in enumerate(indexes)}
+    out = []
+    seen = set()
+    for bidx in bidxs:
+        band = pix[slot[bidx]]
+        # same band requested more than once: callers might modify pixels in place
+        out.append(band.copy() if bidx in seen else band)
+        seen.add(bidx)
+    return out
+
+
+def _split_future(fut: Future, n: int) -> List[Future]:
+    """ Turn future of a list of ``n`` items into ``n`` futures
+    """
+    out = [Future() for _ in range(n)]  # type: List[Future]
+
+    def on_done(fut: Future) -> None:
+        try:
+            results = fut.result()
+        except Exception as e:  # pylint: disable=broad-except
+            for f in out:
+                f.set_exception(e)
+        else:
+            for f, r in zip(out, results):
+                f.set_result(r)
+
+    fut.add_done_callback(on_done)
+    return out
 
 
 def _rio_uri(band: BandInfo) -> str:
@@ -149,12 +201,81 @@ def _rio_band_idx(band: BandInfo, src: DatasetReader) -> int:
     return _find_netcdf_band_by_time(src, band.center_time)
 
 
+FileHandle = Tuple[DatasetReader, threading.Lock]  # pylint: disable=invalid-name
+
+
+class RIOLoadContext(object):
+    """ Cache of open file handles, keyed by normalised uri.
+
+        Shared by all ``open`` calls within a ``dc.load`` and recycled between
+        consecutive loads. At most ``max_open_files`` handles are kept, least
+        recently used handles are evicted first. Evicted handles are not closed
+        explicitly as readers might still be using them, they are closed once
+        the last reader referencing them is gone.
+    """
+
+    def __init__(self, max_open_files: int = 64):
+        assert max_open_files > 0
+        self._max_open_files = max_open_files
+        self._handles = OrderedDict()  # type: OrderedDict
+        self._lock = threading.Lock()
+
+    @property
+    def max_open_files(self) -> int:
+        return self._max_open_files
+
+    def __len__(self) -> int:
+        return len(self._handles)
+
+    def __contains__(self, uri: str) -> bool:
+        return uri in self._handles
+
+    def _lookup(self, uri: str) -> Optional[FileHandle]:
+        h = self._handles.get(uri)
+        if h is not None:
+            self._handles.move_to_end(uri)
+        return h
+
+    def open(self, uri: str) -> FileHandle:
+        """ Return cached handle for ``uri`` or open a new one.
+
+            raises Exception on failure
+        """
+        with self._lock:
+            h = self._lookup(uri)
+        if h is not None:
+            return h
+
+        # Open without holding the lock so that slow opens don't block cache hits
+        src = rasterio.open(uri, 'r')
+
+        with self._lock:
+            h = self._lookup(uri)
+            if h is None:
+                h = (src, threading.Lock())
+                self._handles[uri] = h
+                while len(self._handles) > self._max_open_files:
+                    self._handles.popitem(last=False)
+                return h
+
+        # Some other thread opened the same file in the meantime
+        src.close()
+        return h
+
+    def close(self) -> None:
+        """ Drop all cached handles.
+        """
+        with self._lock:
+            self._handles.clear()
+
+
 class RIOReader(GeoRasterReader):
     def __init__(self,
                  src: DatasetReader,
                  band_idx: int,
                  pool: ThreadPoolExecutor,
-                 overrides: Overrides = Overrides(None, None, None)):
+                 overrides: Overrides = Overrides(None, None, None),
+                 lock: Optional[threading.Lock] = None):
 
         transform = pick(overrides.transform, src.transform)
         if transform is not None and transform.is_identity:
@@ -166,7 +287,9 @@ class RIOReader(GeoRasterReader):
         self._nodata = pick(overrides.nodata, src.nodatavals[band_idx-1])
         self._band_idx = band_idx
         self._dtype = src.dtypes[band_idx-1]
+        self._overviews = tuple(src.overviews(band_idx))
         self._pool = pool
+        self._lock = threading.Lock() if lock is None else lock
 
     @property
     def crs(self) -> Optional[CRS]:
@@ -188,10 +311,29 @@ class RIOReader(GeoRasterReader):
     def nodata(self) -> Optional[Union[int, float]]:
         return self._nodata
 
+    @property
+    def overviews(self) -> Tuple[int, ...]:
+        return self._overviews
+
     def read(self,
              window: Optional[RasterWindow] = None,
              out_shape: Optional[RasterShape] = None) -> FutureNdarray:
-        return self._pool.submit(_read, self._src, self._band_idx, window, out_shape)
+        return self._pool.submit(_read, self._src, self._lock, self._band_idx, window, out_shape)
+
+    def read_many(self,
+                  others: Sequence[GeoRasterReader],
+                  window: Optional[RasterWindow] = None,
+                  out_shape: Optional[RasterShape] = None) -> List[FutureNdarray]:
+        """ When all readers share the same file handle, read all bands in one go.
+        """
+        shares_src = all(isinstance(rdr, RIOReader) and rdr._src is self._src  # pylint: disable=protected-access
+                         for rdr in others)
+        if not shares_src:
+            return super().read_many(others, window, out_shape)
+
+        bidxs = [rdr._band_idx for rdr in (self, *others)]  # pylint: disable=protected-access
+        fut = self._pool.submit(_read_many, self._src, self._lock, bidxs, window, out_shape)
+        return _split_future(fut, len(bidxs))
 
 
 def _compute_overrides(src: DatasetReader, bi: BandInfo) -> Overrides:
@@ -211,18 +353,24 @@ def _compute_overrides(src: DatasetReader, bi: BandInfo) -> Overrides:
     return Overrides(crs=crs, transform=transform, nodata=nodata)
 
 
-def _rdr_open(band: BandInfo, ctx: Any, pool: ThreadPoolExecutor) -> RIOReader:
+def _rdr_open(band: BandInfo, ctx: Optional[RIOLoadContext], pool: ThreadPoolExecutor) -> RIOReader:
     """ Open file pointed by BandInfo and return RIOReader instance.
 
-        raises Exception on failure
+        When ``ctx`` is supplied file handles are looked up in it first.
 
-        TODO: start using ctx for handle cache
+        raises Exception on failure
     """
+    activate_from_config()  # GDAL settings are per thread, this may be a new one
+
     normalised_uri = _rio_uri(band)
-    src = rasterio.open(normalised_uri, 'r')
-    bidx = _rio_band_idx(band, src)
+    if ctx is None:
+        src, lock = rasterio.open(normalised_uri, 'r'), threading.Lock()
+    else:
+        src, lock = ctx.open(normalised_uri)
 
-    return RIOReader(src, bidx, pool, _compute_overrides(src, band))
+    with lock:
+        bidx = _rio_band_idx(band, src)
+        return RIOReader(src, bidx, pool, _compute_overrides(src, band), lock=lock)
 
 
 class RIORdrDriver(ReaderDriver):
@@ -232,8 +380,13 @@ class RIORdrDriver(ReaderDriver):
 
     def new_load_context(self,
                          bands: Iterable[BandInfo],
-                         old_ctx: Optional[Any]) -> Any:
-        return None  # TODO: implement file handle cache with this
+                         old_ctx: Optional[Any]) -> RIOLoadContext:
+        max_open_files = self._cfg.get('max_open_files', 64)
+
+        if isinstance(old_ctx, RIOLoadContext) and old_ctx.max_open_files == max_open_files:
+            return old_ctx
+
+        return RIOLoadContext(max_open_files)
 
     def open(self, band: BandInfo, ctx: Any) -> FutureGeoRasterReader:
         return self._pool.submit(_rdr_open, band, ctx, self._pool)
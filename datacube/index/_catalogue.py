@@ -0,0 +1,229 @@
+# coding=utf-8
+"""
+Process-wide cache of the products and metadata types of an index.
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from datacube.model import DatasetType, MetadataType
+
+_LOG = logging.getLogger(__name__)
+
+#: Products and metadata types at one version of the catalogue, in name order.
+_Snapshot = namedtuple('_Snapshot', ['metadata_types', 'metadata_types_by_name',
+                                     'products', 'products_by_name'])
+
+
+class Catalogue(object):
+    """
+    All products and metadata types of a database, loaded together and shared by every index
+    in the process that connects to the same database.
+
+    Changes made through the index are seen immediately. Changes made by other processes are
+    noticed by comparing a cheap version of the catalogue tables with the database, at most
+    every :attr:`check_interval` seconds (or sooner, when something is looked up that we don't have).
+
+    A catalogue can be pickled with its content. Unpickling it primes (and returns) the shared catalogue
+    of the receiving process, so tasks that are sent one don't need to load the catalogue again. It checks
+    the database once an index there connects to it.
+
+    With ``auto_check=False`` the catalogue never queries the database itself: its owner checks
+    :meth:`is_due_check` and passes what it loads to :meth:`update` (as the asyncio index does).
+    """
+    #: Seconds between checks for changes made by other processes
+    check_interval = 30.0
+
+    def __init__(self, key, db=None, auto_check=True):
+        """
+        :param str key: identifies the database (see :func:`shared_catalogue`)
+        :type db: datacube.drivers.postgres._connections.PostgresDb
+        :param bool auto_check: load from the database when out of date
+        """
+        self.key = key
+        self._db = db
+        self._auto_check = auto_check
+        self._lock = threading.Lock()
+        # (version, metadata type rows, product rows): what we send to other processes
+        self._rows = None
+        self._snapshot = None  # type: _Snapshot
+        self._checked = 0.0
+
+    def metadata_types(self):
+        """
+        :rtype: list[datacube.model.MetadataType]
+        """
+        return list(self._current().metadata_types.values())
+
+    def products(self):
+        """
+        :rtype: list[datacube.model.DatasetType]
+        """
+        return list(self._current().products.values())
+
+    def metadata_type(self, id_):
+        """
+        :rtype: datacube.model.MetadataType or None
+        """
+        return self._lookup('metadata_types', id_)
+
+    def metadata_type_by_name(self, name):
+        """
+        :rtype: datacube.model.MetadataType or None
+        """
+        return self._lookup('metadata_types_by_name', name)
+
+    def product(self, id_):
+        """
+        :rtype: datacube.model.DatasetType or None
+        """
+        return self._lookup('products', id_)
+
+    def product_by_name(self, name):
+        """
+        :rtype: datacube.model.DatasetType or None
+        """
+        return self._lookup('products_by_name', name)
+
+    def invalidate(self):
+        """
+        Check the database for changes on next access.
+        """
+        self._checked = 0.0
+
+    @property
+    def version(self):
+        return self._rows[0] if self._rows else None
+
+    def is_due_check(self):
+        """
+        Is it time to compare with the database again?
+        """
+        return self._rows is None or time.time() - self._checked >= self.check_interval
+
+    def update(self, version, metadata_type_rows=None, product_rows=None):
+        """
+        Record a check of the database, with its content if the version has changed.
+
+        :param version: from :meth:`PostgresDbAPI.get_catalogue_version`
+        :param metadata_type_rows: rows of the metadata type table (None if unchanged)
+        :param product_rows: rows of the product table (None if unchanged)
+        """
+        with self._lock:
+            self._record(version, metadata_type_rows, product_rows)
+
+    @property
+    def _can_check(self):
+        # (An unpickled catalogue has no database until an index in this process uses it)
+        return self._auto_check and self._db is not None
+
+    def _lookup(self, table, key):
+        found = getattr(self._current(), table).get(key)
+        if found is None and self._can_check:
+            # It may have been added by someone else since we last checked.
+            found = getattr(self._current(force_check=True), table).get(key)
+        return found
+
+    def _current(self, force_check=False):
+        snapshot = self._snapshot
+        is_fresh = time.time() - self._checked < self.check_interval
+        if snapshot is not None and (not self._can_check or (is_fresh and not force_check)):
+            return snapshot
+
+        with self._lock:
+            if self._can_check and (force_check or not is_fresh or self._rows is None):
+                self._load()
+
+            if self._rows is None:
+                # Not yet given any content.
+                return self._make_snapshot([], [])
+            if self._snapshot is None:
+                self._snapshot = self._make_snapshot(*self._rows[1:])
+            return self._snapshot
+
+    def _load(self):
+        with self._db.connect() as connection:
+            version = connection.get_catalogue_version()
+            if version != self.version:
+                self._record(version, connection.get_all_metadata_types(), connection.get_all_dataset_types())
+            else:
+                self._record(version)
+
+    def _record(self, version, metadata_type_rows=None, product_rows=None):
+        if metadata_type_rows is not None:
+            _LOG.debug('Loading product catalogue (version %r)', version)
+            self._rows = (
+                version,
+                [(row['id'], row['definition']) for row in metadata_type_rows],
+                [(row['id'], row['metadata_type_ref'], row['definition']) for row in product_rows],
+            )
+            self._snapshot = None
+        self._checked = time.time()
+
+    def _make_snapshot(self, metadata_type_rows, product_rows):
+        if self._db is not None:
+            get_dataset_fields = self._db.get_dataset_fields
+        else:
+            # pylint: disable=cyclic-import
+            from datacube.drivers.postgres._api import get_dataset_fields
+        metadata_types = OrderedDict(
+            (id_, MetadataType(definition,
+                               dataset_search_fields=get_dataset_fields(definition),
+                               id_=id_))
+            for id_, definition in metadata_type_rows
+        )
+        products = OrderedDict(
+            (id_, DatasetType(metadata_types[metadata_type_ref], definition, id_=id_))
+            for id_, metadata_type_ref, definition in product_rows
+        )
+        return _Snapshot(
+            metadata_types=metadata_types,
+            metadata_types_by_name={type_.name: type_ for type_ in metadata_types.values()},
+            products=products,
+            products_by_name={product.name: product for product in products.values()},
+        )
+
+    def _adopt(self, rows, checked):
+        with self._lock:
+            if rows is not None and checked > self._checked:
+                self._rows, self._checked = rows, checked
+                self._snapshot = None
+
+    def __reduce__(self):
+        return _unpickle_catalogue, (self.key, self._rows, self._checked)
+
+    def __repr__(self):
+        return "Catalogue<key={!r}, version={!r}>".format(self.key, self.version)
+
+
+_CATALOGUES = {}  # type: dict
+_CATALOGUES_LOCK = threading.Lock()
+
+
+def _shared(key):
+    with _CATALOGUES_LOCK:
+        catalogue = _CATALOGUES.get(key)
+        if catalogue is None:
+            catalogue = _CATALOGUES[key] = Catalogue(key)
+        return catalogue
+
+
+def _unpickle_catalogue(key, rows, checked):
+    catalogue = _shared(key)
+    catalogue._adopt(rows, checked)  # pylint: disable=protected-access
+    return catalogue
+
+
+def shared_catalogue(db):
+    """
+    The catalogue of the database, shared by everyone in this process using the same database.
+
+    :type db: datacube.drivers.postgres._connections.PostgresDb
+    :rtype: Catalogue
+    """
+    # (repr() of the url hides the password)
+    catalogue = _shared(repr(db.url))
+    # Any connection to the database will do: use the newest, as older ones may since have been closed.
+    catalogue._db = db  # pylint: disable=protected-access
+    return catalogue
@@ -2,26 +2,46 @@
 """
 API for dataset indexing, access and search.
 """
+import datetime
+import functools
 import logging
 import warnings
-from collections import namedtuple
+from collections import OrderedDict, namedtuple
+from itertools import groupby
+from operator import attrgetter
+from types import SimpleNamespace
 from typing import Any, Iterable, Set, Tuple, Union, List
 from uuid import UUID
 
-from datacube.model import Dataset, DatasetType
+from datacube.model import Dataset, DatasetType, Range
 from datacube.model.utils import flatten_datasets
 from datacube.utils import jsonify_document, changes, cached_property
 from datacube.utils.changes import get_doc_changes
+from datacube.utils.dates import parse_time
+from datacube.utils.generic import chunked
+from datacube.utils.geometry import BoundingBox
 from . import fields
 
 import json
-from datacube.drivers.postgres._fields import SimpleDocField, DateDocField
+from datacube.drivers.postgres._fields import SimpleDocField, DateDocField, NativeField, RangeDocField
 from datacube.drivers.postgres._schema import DATASET
-from sqlalchemy import select, func
+from sqlalchemy import select, func, and_
+from sqlalchemy import DateTime, Float, Integer, Numeric
+from sqlalchemy.dialects.postgresql import INT4RANGE, TSTZRANGE
+from sqlalchemy.dialects.postgresql.ranges import RangeOperators
 from datacube.model.fields import Field
 
 _LOG = logging.getLogger(__name__)
 
+#: Outcome of adding one batch of datasets with :meth:`DatasetResource.add_many`.
+#: ``added`` and ``skipped`` are counts, on failure ``failed`` lists ids of all the datasets
+#: in the batch and ``error`` is the exception that caused it.
+BatchAddResult = namedtuple('BatchAddResult', ['added', 'skipped', 'failed', 'error'])
+
+#: One page of results from :meth:`DatasetResource.search_page`. ``next_token`` continues
+#: the search after this page (None after the last page).
+SearchPage = namedtuple('SearchPage', ['datasets', 'next_token'])
+
 
 # It's a public api, so we can't reorganise old methods.
 # pylint: disable=too-many-public-methods, too-many-lines
@@ -50,6 +70,141 @@ class DatasetSpatialMixin(object):
         return Dataset.bounds.__get__(self)
 
 
+def _to_uuid(x):
+    return x if isinstance(x, UUID) else UUID(x)
+
+
+def _arrow_type(sql_type):
+    """
+    Arrow type for values of a search field's database type: ids and other text become strings,
+    ranges become ``{lower, upper}`` structs and documents become json strings.
+    """
+    import pyarrow
+
+    if isinstance(sql_type, RangeOperators):
+        bound_type = _arrow_type({INT4RANGE: Integer(), TSTZRANGE: DateTime()}.get(type(sql_type), Float()))
+        return pyarrow.struct([('lower', bound_type), ('upper', bound_type)])
+    if isinstance(sql_type, DateTime):
+        return pyarrow.timestamp('us', tz='UTC')
+    if isinstance(sql_type, Integer):
+        return pyarrow.int64()
+    if isinstance(sql_type, Numeric):
+        return pyarrow.float64()
+    return pyarrow.string()
+
+
+def _arrow_value(value, arrow_type):
+    import pyarrow
+
+    if value is None:
+        return None
+    if pyarrow.types.is_struct(arrow_type):
+        return {bound.name: _arrow_value(getattr(value, bound.name), bound.type) for bound in arrow_type}
+    if pyarrow.types.is_floating(arrow_type):
+        # (numeric values are Decimals)
+        return float(value)
+    if pyarrow.types.is_string(arrow_type) and not isinstance(value, str):
+        return json.dumps(value, default=str) if isinstance(value, (dict, list)) else str(value)
+    return value
+
+
+def _arrow_record_batch(rows, schema):
+    """
+    Arrow record batch from search results. Every batch has the given schema, whatever its values.
+    """
+    import pyarrow
+
+    return pyarrow.RecordBatch.from_arrays(
+        [pyarrow.array([_arrow_value(value, field.type) for value in column], type=field.type)
+         for column, field in zip(zip(*rows), schema)],
+        schema=schema
+    )
+
+
+_NOT_COMPUTED = object()
+
+
+class DatasetRecord(DatasetSpatialMixin):
+    """
+    Compact, read-only dataset with only the information needed to load its data.
+
+    Returned by :meth:`DatasetResource.search_for_load`. Can be used in place of
+    :class:`datacube.model.Dataset` with :meth:`datacube.Datacube.load` (``datasets=``),
+    :meth:`datacube.Datacube.group_datasets` and :meth:`datacube.Datacube.load_data`.
+    """
+    __slots__ = ('id', 'type', 'uris', 'format', 'grid_spatial', 'measurements',
+                 'time', 'lon', 'center_time', '_extent')
+
+    def __init__(self, type_, id_, uris=None, format_=None, grid_spatial=None, measurements=None,
+                 time=None, lon=None):
+        # pylint: disable=too-many-arguments
+        self.type = type_
+        self.id = id_
+        self.uris = uris
+        self.format = format_
+        self.grid_spatial = grid_spatial
+        self.measurements = measurements or {}
+        self.time = time
+        self.lon = lon
+        self.center_time = None if time is None else time.begin + (time.end - time.begin) // 2
+        self._extent = _NOT_COMPUTED
+
+    @property
+    def extent(self):
+        if self._extent is _NOT_COMPUTED:
+            self._extent = Dataset.extent.func(self)
+        return self._extent
+
+    @property
+    def key_time(self):
+        return self.center_time
+
+    @property
+    def metadata_type(self):
+        return self.type.metadata_type
+
+    @property
+    def managed(self):
+        return self.type.managed
+
+    @property
+    def local_uri(self):
+        return Dataset.local_uri.__get__(self)
+
+    @property
+    def local_path(self):
+        return Dataset.local_path.__get__(self)
+
+    @property
+    def uri_scheme(self):
+        return Dataset.uri_scheme.__get__(self)
+
+    @property
+    def is_archived(self):
+        return False
+
+    @property
+    def is_active(self):
+        return True
+
+    @property
+    def metadata(self):
+        """
+        The few search fields that are available (only what's needed for grouping by solar day).
+        """
+        values = dict(id=str(self.id), format=self.format, time=self.time, lon=self.lon)
+        return SimpleNamespace(**{name: value for name, value in values.items() if value is not None})
+
+    def __eq__(self, other):
+        return self.id == other.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def __repr__(self):
+        return "DatasetRecord <id={id} type={type}>".format(id=self.id, type=self.type.name)
+
+
 class DatasetResource(object):
     """
     :type _db: datacube.drivers.postgres._connections.PostgresDb
@@ -80,12 +235,38 @@ class DatasetResource(object):
                 dataset = connection.get_dataset(id_)
                 return self._make(dataset, full_info=True) if dataset else None
 
-            datasets = {result['id']: (self._make(result, full_info=True), result)
-                        for result in connection.get_dataset_sources(id_)}
+            datasets = self._make_lineage_graph(connection.get_dataset_sources(id_))
 
-        if not datasets:
-            # No dataset found
-            return None
+        # (None if no dataset found)
+        return datasets.get(id_)
+
+    def bulk_get_with_sources(self, ids):
+        """
+        Get many datasets with their full provenance graphs.
+
+        The graphs are fetched together in one query, and ancestors shared by several of the
+        datasets are the same :class:`Dataset` object.
+
+        :param typing.Iterable[typing.Union[UUID, str]] ids: ids of the datasets to retrieve
+        :return: the datasets found, in the order of ``ids``
+        :rtype: list[Dataset]
+        """
+        ids = list(OrderedDict.fromkeys(_to_uuid(i) for i in ids))
+        if not ids:
+            return []
+
+        with self._db.connect() as connection:
+            datasets = self._make_lineage_graph(connection.get_datasets_sources(ids))
+
+        return [datasets[id_] for id_ in ids if id_ in datasets]
+
+    def _make_lineage_graph(self, results):
+        """
+        :return: datasets by id, with their sources linked to each other
+        :rtype: dict[UUID, Dataset]
+        """
+        datasets = {result['id']: (self._make(result, full_info=True), result)
+                    for result in results}
 
         for dataset, result in datasets.values():
             dataset.metadata.sources = {
@@ -96,13 +277,10 @@ class DatasetResource(object):
                 classifier: datasets[source][0]
                 for source, classifier in zip(result['sources'], result['classes']) if source
             }
-        return datasets[id_][0]
+        return {id_: dataset for id_, (dataset, _) in datasets.items()}
 
     def bulk_get(self, ids):
-        def to_uuid(x):
-            return x if isinstance(x, UUID) else UUID(x)
-
-        ids = [to_uuid(i) for i in ids]
+        ids = [_to_uuid(i) for i in ids]
 
         with self._db.connect() as connection:
             rows = connection.get_datasets(ids)
@@ -121,6 +299,23 @@ class DatasetResource(object):
                 for result in connection.get_derived_datasets(id_)
             ]
 
+    def get_all_derived(self, ids):
+        """
+        Get all datasets derived from the given ones: children, grandchildren, great-grandchildren...
+
+        :param Iterable[UUID] ids: dataset ids
+        :rtype: list[Dataset]
+        """
+        ids = [_to_uuid(i) for i in ids]
+        if not ids:
+            return []
+
+        with self._db.connect() as connection:
+            return [
+                self._make(result, full_info=True)
+                for result in connection.get_all_derived_datasets(ids)
+            ]
+
     def has(self, id_):
         """
         Have we already indexed this dataset?
@@ -209,6 +404,72 @@ class DatasetResource(object):
 
         return dataset
 
+    def add_many(self, datasets, with_lineage=True, batch_size=1000):
+        """
+        Add many datasets to the index, skipping those already present.
+
+        Same as calling :meth:`add` for every dataset, but much cheaper: every
+        batch of ``batch_size`` datasets is checked and added in a single
+        transaction with a handful of multi-row statements, instead of several
+        round trips per dataset.
+
+        A batch that fails is rolled back and reported, remaining batches are still added.
+
+        :param Iterable[Dataset] datasets: datasets to add
+        :param bool with_lineage: True -- attempt adding lineage if it's missing, False don't
+        :param int batch_size: number of datasets to add per transaction
+        :rtype: list[BatchAddResult]
+        """
+        results = []
+
+        for batch in chunked(datasets, batch_size):
+            try:
+                added, skipped = self._add_batch(batch, with_lineage)
+            except Exception as e:  # pylint: disable=broad-except
+                _LOG.error('Failed to add batch of %d datasets starting with %s: %s', len(batch), batch[0].id, e)
+                results.append(BatchAddResult(0, 0, [ds.id for ds in batch], e))
+                continue
+
+            _LOG.info('Indexed %d datasets, %d already present', added, skipped)
+            results.append(BatchAddResult(added, skipped, [], None))
+
+        return results
+
+    def _add_batch(self, batch, with_lineage):
+        top_level = {}
+        for ds in batch:
+            top_level.setdefault(ds.id, ds)
+
+        if with_lineage:
+            candidates = {}
+            for ds in top_level.values():
+                for id_, dss in flatten_datasets(ds).items():
+                    candidates.setdefault(id_, dss[0])
+        else:
+            candidates = dict(top_level)
+
+        with self._db.begin() as transaction:
+            present = set(transaction.datasets_intersection(list(candidates)))
+            new_dss = [ds for id_, ds in candidates.items() if id_ not in present]
+
+            # First insert all new datasets
+            inserted = transaction.insert_datasets_bulk((ds.metadata_doc_without_lineage(), ds.id, ds.type.id)
+                                                        for ds in new_dss)
+
+            # Second insert lineage graph edges
+            transaction.insert_dataset_sources_bulk((name, ds.id, src.id)
+                                                    for ds in new_dss if ds.id in inserted
+                                                    for name, src in (ds.sources or {}).items())
+
+            # Finally locations for top-level datasets only, in reverse order same as `add`
+            transaction.insert_dataset_locations_bulk((ds.id, uri)
+                                                      for ds in top_level.values()
+                                                      if ds.id in inserted and ds.uris
+                                                      for uri in ds.uris[::-1])
+
+        added = sum(1 for id_ in top_level if id_ in inserted)
+        return added, len(batch) - added
+
     def search_product_duplicates(self, product: DatasetType, *args) -> Iterable[Tuple[Any, Set[UUID]]]:
         """
         Find dataset ids who have duplicates of the given set of field names.
@@ -324,8 +585,26 @@ class DatasetResource(object):
         :param list[UUID] ids: list of dataset ids to archive
         """
         with self._db.begin() as transaction:
-            for id_ in ids:
-                transaction.archive_dataset(id_)
+            for batch in chunked(ids, 1000):
+                transaction.archive_datasets(batch)
+
+    def archive_many(self, ids, batch_size=1000):
+        """
+        Mark many datasets as archived.
+
+        Unlike :meth:`archive`, every batch of ``batch_size`` datasets is archived with
+        one statement in its own transaction, so a failure leaves earlier batches archived.
+
+        :param Iterable[UUID] ids: dataset ids to archive
+        :param int batch_size: number of datasets to archive per transaction
+        :return: number of datasets archived (those already archived aren't counted)
+        :rtype: int
+        """
+        archived = 0
+        for batch in chunked(ids, batch_size):
+            with self._db.begin() as transaction:
+                archived += transaction.archive_datasets(batch)
+        return archived
 
     def restore(self, ids):
         """
@@ -334,8 +613,23 @@ class DatasetResource(object):
         :param Iterable[UUID] ids: list of dataset ids to restore
         """
         with self._db.begin() as transaction:
-            for id_ in ids:
-                transaction.restore_dataset(id_)
+            for batch in chunked(ids, 1000):
+                transaction.restore_datasets(batch)
+
+    def restore_many(self, ids, batch_size=1000):
+        """
+        Mark many datasets as not archived, a batch of ``batch_size`` per transaction (see :meth:`archive_many`).
+
+        :param Iterable[UUID] ids: dataset ids to restore
+        :param int batch_size: number of datasets to restore per transaction
+        :return: number of datasets restored (those that weren't archived aren't counted)
+        :rtype: int
+        """
+        restored = 0
+        for batch in chunked(ids, batch_size):
+            with self._db.begin() as transaction:
+                restored += transaction.restore_datasets(batch)
+        return restored
 
     def get_field_names(self, product_name=None):
         """
@@ -368,6 +662,17 @@ class DatasetResource(object):
         with self._db.connect() as connection:
             return connection.get_locations(id_)
 
+    def get_locations_many(self, ids):
+        """
+        Get the storage locations of many datasets at once.
+
+        :param typing.Iterable[typing.Union[UUID, str]] ids: dataset ids
+        :return: the locations of each dataset, newest first (datasets without locations are left out)
+        :rtype: dict[UUID, list[str]]
+        """
+        with self._db.connect() as connection:
+            return connection.get_locations_many(ids)
+
     def get_archived_locations(self, id_):
         """
         Find locations which have been archived for a dataset
@@ -415,6 +720,29 @@ class DatasetResource(object):
         with self._db.connect() as connection:
             return connection.insert_dataset_location(id_, uri)
 
+    def add_locations_many(self, locations, batch_size=1000):
+        """
+        Add many locations, skipping those already recorded.
+
+        Each batch of ``batch_size`` locations is added with one statement.
+
+        :param Iterable[(typing.Union[UUID, str], str)] locations: (dataset id, fully qualified uri) pairs
+        :param int batch_size: number of locations to add per statement
+        :return: number of locations added
+        :rtype: int
+        """
+        added = 0
+        with self._db.connect() as connection:
+            for batch in chunked(locations, batch_size):
+                valid = []
+                for id_, uri in batch:
+                    if not uri:
+                        warnings.warn("Cannot add empty uri. (dataset %s)" % id_)
+                        continue
+                    valid.append((id_, uri))
+                added += connection.insert_dataset_locations_bulk(valid)
+        return added
+
     def get_datasets_for_location(self, uri, mode=None):
         """
         Find datasets that exist at the given URI
@@ -442,6 +770,23 @@ class DatasetResource(object):
             was_removed = connection.remove_location(id_, uri)
             return was_removed
 
+    def remove_locations_many(self, locations, batch_size=1000):
+        """
+        Remove many locations, ignoring those that don't exist.
+
+        Each batch of ``batch_size`` locations is removed with one statement.
+
+        :param Iterable[(typing.Union[UUID, str], str)] locations: (dataset id, fully qualified uri) pairs
+        :param int batch_size: number of locations to remove per statement
+        :return: number of locations removed
+        :rtype: int
+        """
+        removed = 0
+        with self._db.connect() as connection:
+            for batch in chunked(locations, batch_size):
+                removed += connection.remove_locations_bulk(batch)
+        return removed
+
     def archive_location(self, id_, uri):
         """
         Archive a location of the dataset if it exists.
@@ -480,21 +825,8 @@ class DatasetResource(object):
 
         :param bool full_info: Include all available fields
         """
-        if dataset_res.uris:
-            uris = [uri for uri in dataset_res.uris if uri]
-        else:
-            uris = []
-
         product = product or self.types.get(dataset_res.dataset_type_ref)
-
-        return Dataset(
-            type_=product,
-            metadata_doc=dataset_res.metadata,
-            uris=uris,
-            indexed_by=dataset_res.added_by if full_info else None,
-            indexed_time=dataset_res.added if full_info else None,
-            archived_time=dataset_res.archived
-        )
+        return dataset_from_row(dataset_res, product, full_info=full_info)
 
     def _make_many(self, query_result, product=None):
         """
@@ -515,31 +847,90 @@ class DatasetResource(object):
             for dataset in self._make_many(connection.search_datasets_by_metadata(metadata)):
                 yield dataset
 
-    def search(self, limit=None, **query):
+    def search(self, limit=None, fetch_size=None, **query):
         """
         Perform a search, returning results as Dataset objects.
 
+        To page through results, use :meth:`search_page`.
+
         :param Union[str,float,Range,list] query:
         :param int limit: Limit number of datasets
+        :param int fetch_size: Stream results from the database in batches of this many rows
+                               rather than loading the whole result set into memory at once
         :rtype: __generator[Dataset]
         """
         source_filter = query.pop('source_filter', None)
         for product, datasets in self._do_search_by_product(query,
                                                             source_filter=source_filter,
-                                                            limit=limit):
+                                                            limit=limit,
+                                                            fetch_size=fetch_size):
             yield from self._make_many(datasets, product)
 
+    def search_page(self, limit, after=None, **query):
+        """
+        Perform a search, returning one page of datasets and a token for the next page.
+
+        Datasets are ordered by start time, then id. Each page continues from the position
+        in that order where the last one ended (rather than skipping an offset of results),
+        so deep pages are as cheap as the first, and datasets added or archived meanwhile
+        don't shift the pages.
+
+        :param int limit: Maximum number of datasets in the page
+        :param str after: Token of the previous page (None for the first page)
+        :param Union[str,float,Range,list] query: Search terms, ``source_filter`` and
+                                                  ``fetch_size`` are not supported
+        :rtype: SearchPage
+        """
+        unsupported = sorted({'source_filter', 'fetch_size'} & set(query))
+        if unsupported:
+            raise ValueError('search_page() does not support {}'.format(', '.join(unsupported)))
+
+        after_key = _parse_page_token(after) if after is not None else None
+
+        product_groups = list(self._get_product_query_groups(query))
+        if not product_groups:
+            raise ValueError('No products match search terms: %r' % query)
+
+        # Take the first page of every group of products, and keep the first of them all.
+        found = []
+        with self._db.connect() as connection:
+            for q, products in product_groups:
+                dataset_fields = products[0].metadata_type.dataset_fields
+                query_exprs = tuple(fields.to_expressions(dataset_fields.get, **q))
+                time_field = dataset_fields.get('time')
+                products_by_id = {product.id: product for product in products}
+                found.extend(
+                    (row, products_by_id[row.dataset_type_ref])
+                    for row in connection.search_datasets_page(
+                        query_exprs,
+                        time_field=time_field if hasattr(time_field, 'lower') else None,
+                        after=after_key,
+                        limit=limit
+                    )
+                )
+
+        found.sort(key=lambda result: _page_key(result[0].page_time, result[0].id))
+        page = found[:limit] if limit is not None else found
+
+        next_token = None
+        if limit is not None and len(page) == limit:
+            last = page[-1][0]
+            next_token = _page_token(last.page_time, last.id)
+        return SearchPage([self._make(row, product=product) for row, product in page], next_token)
+
     def search_by_product(self, **query):
         """
         Perform a search, returning datasets grouped by product type.
 
+        Products are searched together where possible.
+
         :param dict[str,str|float|datacube.model.Range] query:
         :rtype: __generator[(DatasetType,  __generator[Dataset])]]
         """
-        for product, datasets in self._do_search_by_product(query):
+        for product, datasets in self._do_search_by_product(query, by_product=True):
             yield product, self._make_many(datasets, product)
 
-    def search_returning(self, field_names, limit=None, **query):
+    def search_returning(self, field_names, limit=None, fetch_size=None, **query):
         """
         Perform a search, returning only the specified fields.
 
@@ -550,6 +941,7 @@ class DatasetResource(object):
         :param tuple[str] field_names:
         :param Union[str,float,Range,list] query:
         :param int limit: Limit number of datasets
+        :param int fetch_size: Stream results from the database in batches of this many rows
         :returns __generator[tuple]: sequence of results, each result is a namedtuple of your requested fields
         """
         result_type = namedtuple('search_result', field_names)
@@ -557,11 +949,59 @@ class DatasetResource(object):
         for _, results in self._do_search_by_product(query,
                                                      return_fields=True,
                                                      select_field_names=field_names,
-                                                     limit=limit):
+                                                     limit=limit,
+                                                     fetch_size=fetch_size):
 
             for columns in results:
                 yield result_type(*columns)
 
+    def search_returning_columns(self, field_names, limit=None, fetch_size=10000, as_arrow=False, **query):
+        """
+        Perform a search, returning only the specified fields as columns of a table.
+
+        Same results as :meth:`search_returning`, but rows are streamed from the database
+        ``fetch_size`` at a time and each batch is turned into a table as it arrives. Rows are
+        still read as Python tuples, but only one batch of them is held at a time and no
+        namedtuple is built per row, so large result sets take much less memory.
+
+        Column types are as :meth:`search_returning`, except for Arrow, where each column has the
+        type of its search field: ids become strings, ranges become ``{lower, upper}`` structs and
+        documents become json strings.
+
+        :param tuple[str] field_names:
+        :param Union[str,float,Range,list] query:
+        :param int limit: Limit number of datasets
+        :param int fetch_size: Number of rows to fetch from the database at a time
+        :param bool as_arrow: Return a :class:`pyarrow.Table` instead of a :class:`pandas.DataFrame`
+                              (requires pyarrow)
+        :rtype: pandas.DataFrame or pyarrow.Table
+        """
+        field_names = tuple(field_names)
+        if as_arrow:
+            import pyarrow
+            # One schema for all batches: a batch's own values (all None, say) don't tell their type.
+            schema = pyarrow.schema([(name, _arrow_type(field.alchemy_expression.type))
+                                     for name, field in zip(field_names, self._search_fields(field_names, query))])
+            make_batch = functools.partial(_arrow_record_batch, schema=schema)
+        else:
+            import pandas
+            make_batch = functools.partial(pandas.DataFrame.from_records, columns=field_names)
+
+        batches = []
+        for _, results in self._do_search_by_product(query,
+                                                     return_fields=True,
+                                                     select_field_names=field_names,
+                                                     limit=limit,
+                                                     fetch_size=fetch_size):
+            batches.extend(make_batch(rows) for rows in chunked(results, fetch_size))
+
+        if as_arrow:
+            return pyarrow.Table.from_batches(batches, schema=schema)
+
+        if not batches:
+            return pandas.DataFrame(columns=field_names)
+        return pandas.concat(batches, ignore_index=True)
+
     def count(self, **query):
         """
         Perform a search, returning count of results.
@@ -569,12 +1009,7 @@ class DatasetResource(object):
         :param dict[str,str|float|datacube.model.Range] query:
         :rtype: int
         """
-        # This may be optimised into one query in the future.
-        result = 0
-        for product_type, count in self._do_count_by_product(query):
-            result += count
-
-        return result
+        return sum(count for _, count in self._do_count_by_product(query))
 
     def count_by_product(self, **query):
         """
@@ -629,10 +1064,41 @@ class DatasetResource(object):
             q['dataset_type_id'] = product.id
             yield q, product
 
+    def _search_fields(self, field_names, query):
+        """
+        The search fields of the given names, as the first product matching the query has them.
+
+        :rtype: list[datacube.drivers.postgres._fields.PgField]
+        """
+        for product, _ in self.types.search_robust(**query):
+            dataset_fields = product.metadata_type.dataset_fields
+            return [dataset_fields[field_name] for field_name in field_names]
+        raise ValueError('No products match search terms: %r' % query)
+
+    def _get_product_query_groups(self, query):
+        """
+        Like :meth:`_get_product_queries`, but with products grouped so each group can be searched
+        in one database query: products are grouped when they share a metadata type and the same
+        remaining query terms.
+
+        :rtype: __generator[(dict, list[DatasetType])]
+        """
+        return group_product_queries(self.types.search_robust(**query))
+
     # pylint: disable=too-many-locals
     def _do_search_by_product(self, query, return_fields=False, select_field_names=None,
                               with_source_ids=False, source_filter=None,
-                              limit=None):
+                              limit=None, fetch_size=None, by_product=False):
+        """
+        Search each group of products with one query.
+
+        Yields ``(product, results)``. The product is None when the results span several products,
+        unless ``by_product`` is set: then the results are sorted by product in the database
+        and yielded for each product in turn (including those without results). Each product's
+        rows are read before it is yielded, so the pairs can be kept and used in any order.
+
+        A ``limit`` applies to each product, so products are then searched one by one.
+        """
         if source_filter:
             product_queries = list(self._get_product_queries(source_filter))
             if not product_queries:
@@ -647,12 +1113,15 @@ class DatasetResource(object):
         else:
             source_exprs = None
 
-        product_queries = list(self._get_product_queries(query))
-        if not product_queries:
+        if limit is None:
+            product_groups = list(self._get_product_query_groups(query))
+        else:
+            product_groups = [(q, [product]) for q, product in self._get_product_queries(query)]
+        if not product_groups:
             raise ValueError('No products match search terms: %r' % query)
 
-        for q, product in product_queries:
-            dataset_fields = product.metadata_type.dataset_fields
+        for q, products in product_groups:
+            dataset_fields = products[0].metadata_type.dataset_fields
             query_exprs = tuple(fields.to_expressions(dataset_fields.get, **q))
             select_fields = None
             if return_fields:
@@ -663,26 +1132,44 @@ class DatasetResource(object):
                 else:
                     select_fields = tuple(dataset_fields[field_name]
                                           for field_name in select_field_names)
+            split_by_product = by_product and len(products) > 1
             with self._db.connect() as connection:
-                yield (product,
-                       connection.search_datasets(
-                           query_exprs,
-                           source_exprs,
-                           select_fields=select_fields,
-                           limit=limit,
-                           with_source_ids=with_source_ids
-                       ))
+                results = connection.search_datasets(
+                    query_exprs,
+                    source_exprs,
+                    select_fields=select_fields,
+                    limit=limit,
+                    with_source_ids=with_source_ids,
+                    fetch_size=fetch_size,
+                    order_by=(dataset_fields['dataset_type_id'],) if split_by_product else None
+                )
+                if len(products) == 1:
+                    yield products[0], results
+                elif not split_by_product:
+                    yield None, results
+                else:
+                    runs = groupby(results, key=attrgetter('dataset_type_ref'))
+                    run = next(runs, None)
+                    for product in sorted(products, key=attrgetter('id')):
+                        if run is not None and run[0] == product.id:
+                            product_results = list(run[1])
+                            run = next(runs, None)
+                            yield product, iter(product_results)
+                        else:
+                            yield product, iter(())
 
     def _do_count_by_product(self, query):
-        product_queries = self._get_product_queries(query)
+        product_groups = list(self._get_product_query_groups(query))
 
-        for q, product in product_queries:
-            dataset_fields = product.metadata_type.dataset_fields
-            query_exprs = tuple(fields.to_expressions(dataset_fields.get, **q))
-            with self._db.connect() as connection:
-                count = connection.count_datasets(query_exprs)
-            if count > 0:
-                yield product, count
+        with self._db.connect() as connection:
+            for q, products in product_groups:
+                dataset_fields = products[0].metadata_type.dataset_fields
+                query_exprs = tuple(fields.to_expressions(dataset_fields.get, **q))
+                counts = connection.count_datasets_by_product(query_exprs)
+                for product in products:
+                    count = counts.get(product.id, 0)
+                    if count > 0:
+                        yield product, count
 
     def _do_time_count(self, period, query, ensure_single=False):
         if 'time' not in query:
@@ -693,25 +1180,28 @@ class DatasetResource(object):
         start, end = query['time']
         del query['time']
 
-        product_queries = list(self._get_product_queries(query))
+        product_groups = list(self._get_product_query_groups(query))
         if ensure_single:
-            if len(product_queries) == 0:
+            matching_products = [product for _, products in product_groups for product in products]
+            if len(matching_products) == 0:
                 raise ValueError('No products match search terms: %r' % query)
-            if len(product_queries) > 1:
+            if len(matching_products) > 1:
                 raise ValueError('Multiple products match single query search: %r' %
-                                 ([dt.name for q, dt in product_queries],))
+                                 ([dt.name for dt in matching_products],))
 
-        for q, product in product_queries:
-            dataset_fields = product.metadata_type.dataset_fields
-            query_exprs = tuple(fields.to_expressions(dataset_fields.get, **q))
-            with self._db.connect() as connection:
-                yield product, list(connection.count_datasets_through_time(
+        with self._db.connect() as connection:
+            for q, products in product_groups:
+                dataset_fields = products[0].metadata_type.dataset_fields
+                query_exprs = tuple(fields.to_expressions(dataset_fields.get, **q))
+                periods = connection.count_datasets_through_time_by_product(
                     start,
                     end,
                     period,
                     dataset_fields.get('time'),
                     query_exprs
-                ))
+                )
+                for product in products:
+                    yield product, [(time_range, counts.get(product.id, 0)) for time_range, counts in periods]
 
     def search_summaries(self, **query):
         """
@@ -733,13 +1223,21 @@ class DatasetResource(object):
         """
         return list(self.search(**query))
 
-    def get_product_time_bounds(self, product: str):
+    def get_product_time_bounds(self, product: str, active_only=False):
         """
         Returns the minimum and maximum acquisition time of the product.
+
+        :param bool active_only: Leave out archived datasets. (These bounds can be read from
+            the product's dataset summaries, if the index uses them)
         """
+        product = self.types.get_by_name(product)
+
+        if active_only and self._db.uses_dataset_summary:
+            with self._db.connect() as connection:
+                summary = connection.get_product_summary(product.id)
+            return summary.time_min, summary.time_max
 
         # Get the offsets from dataset doc
-        product = self.types.get_by_name(product)
         dataset_section = product.metadata_type.definition['dataset']
         min_offset = dataset_section['search_fields']['time']['min_offset']
         max_offset = dataset_section['search_fields']['time']['max_offset']
@@ -763,12 +1261,115 @@ class DatasetResource(object):
                 select(
                     [func.min(time_min.alchemy_expression), func.max(time_max.alchemy_expression)]
                 ).where(
-                    DATASET.c.dataset_type_ref == product.id
+                    and_(DATASET.c.dataset_type_ref == product.id,
+                         *([DATASET.c.archived == None] if active_only else []))
                 )
             ).first()
 
         return result
 
+    def get_product_extent(self, product: str):
+        """
+        Returns the lat/lon bounding box of the active datasets of the product.
+
+        :rtype: datacube.utils.geometry.BoundingBox or None
+        """
+        product = self.types.get_by_name(product)
+
+        if self._db.uses_dataset_summary:
+            with self._db.connect() as connection:
+                bounds = tuple(connection.get_product_summary(product.id))[3:]
+        else:
+            dataset_fields = product.metadata_type.dataset_fields
+            lat, lon = dataset_fields.get('lat'), dataset_fields.get('lon')
+            if not isinstance(lat, RangeDocField) or not isinstance(lon, RangeDocField):
+                return None
+            with self._db.connect() as connection:
+                bounds = connection.execute(
+                    select([
+                        func.min(lon.lower.alchemy_expression), func.min(lat.lower.alchemy_expression),
+                        func.max(lon.greater.alchemy_expression), func.max(lat.greater.alchemy_expression),
+                    ]).where(
+                        and_(DATASET.c.dataset_type_ref == product.id, DATASET.c.archived == None)
+                    )
+                ).first()
+
+        if None in bounds:
+            return None
+        return BoundingBox(*bounds)
+
+    def search_for_load(self, limit=None, **query):
+        """
+        Perform a search, returning compact :class:`DatasetRecord` objects.
+
+        Only the parts of each dataset document needed to load it (id, locations, format,
+        spatial info, measurements and time) are fetched from the database, so this is
+        much cheaper than :meth:`search` for large searches.
+
+        :param Union[str,float,Range,list] query:
+        :param int limit: Limit number of datasets per product
+        :rtype: __generator[DatasetRecord]
+        """
+        if query.pop('source_filter', None):
+            raise ValueError('source_filter is not supported by search_for_load()')
+
+        product_queries = list(self._get_product_queries(query))
+        if not product_queries:
+            raise ValueError('No products match search terms: %r' % query)
+
+        for q, product in product_queries:
+            dataset_fields = product.metadata_type.dataset_fields
+            query_exprs = tuple(fields.to_expressions(dataset_fields.get, **q))
+            select_fields = self._load_fields(product)
+
+            with self._db.connect() as connection:
+                for row in connection.search_unique_datasets(query_exprs,
+                                                              select_fields=select_fields,
+                                                              limit=limit):
+                    yield self._make_record(dict(zip((f.name for f in select_fields), row)), product)
+
+    @staticmethod
+    def _load_fields(product):
+        """
+        Fields selected by :meth:`search_for_load`: sub-documents come back as parsed json.
+        """
+        dataset_fields = product.metadata_type.dataset_fields
+        dataset_section = product.metadata_type.definition['dataset']
+
+        def doc_field(name, as_text=False):
+            offset = dataset_section.get(name)
+            if not offset:
+                return None
+            expression = DATASET.c.metadata[tuple(offset)]
+            return NativeField(name, name, DATASET.c.metadata,
+                               alchemy_expression=expression.astext if as_text else expression)
+
+        select_fields = [dataset_fields['id'],
+                         Field('uris', 'uris'),
+                         doc_field('format', as_text=True),
+                         doc_field('grid_spatial'),
+                         doc_field('measurements'),
+                         dataset_fields.get('time'),
+                         dataset_fields.get('lon')]
+        return [field for field in select_fields if field is not None]
+
+    @staticmethod
+    def _make_record(values, product):
+        def to_range(value):
+            if value is None or value.lower is None or value.upper is None:
+                return None
+            return Range(value.lower, value.upper)
+
+        uris = values.get('uris')
+        return DatasetRecord(product,
+                             values['id'],
+                             uris=[uri for uri in uris if uri] if uris else [],
+                             format_=values.get('format'),
+                             grid_spatial=values.get('grid_spatial'),
+                             measurements=values.get('measurements'),
+                             time=to_range(values.get('time')),
+                             lon=to_range(values.get('lon')))
+
     # pylint: disable=redefined-outer-name
     def search_returning_datasets_light(self, field_names: tuple, custom_offsets=None, limit=None, **query):
         """
@@ -909,3 +1510,86 @@ class DatasetResource(object):
             custom_exprs.append(fields.as_expression(custom_field, custom_query[key]))
 
         return custom_exprs
+
+
+_PAGE_START = datetime.datetime.min.replace(tzinfo=datetime.timezone.utc)
+
+
+def _page_key(time, id_):
+    # As sorted by the database: datasets without a time first.
+    return (time is not None, time or _PAGE_START, id_)
+
+
+def _page_token(time, id_):
+    """
+    >>> _page_token(datetime.datetime(2017, 1, 2, tzinfo=datetime.timezone.utc),
+    ...             UUID('051a003f-5bba-43c7-b5f1-7f1da3ae9cfb'))
+    '2017-01-02T00:00:00+00:00_051a003f-5bba-43c7-b5f1-7f1da3ae9cfb'
+    >>> _page_token(None, UUID('051a003f-5bba-43c7-b5f1-7f1da3ae9cfb'))
+    '_051a003f-5bba-43c7-b5f1-7f1da3ae9cfb'
+    """
+    return '{}_{}'.format(time.isoformat() if time is not None else '', id_)
+
+
+def _parse_page_token(token):
+    """
+    >>> time, id_ = _parse_page_token('2017-01-02T00:00:00+00:00_051a003f-5bba-43c7-b5f1-7f1da3ae9cfb')
+    >>> time == datetime.datetime(2017, 1, 2, tzinfo=datetime.timezone.utc), id_
+    (True, UUID('051a003f-5bba-43c7-b5f1-7f1da3ae9cfb'))
+    >>> _parse_page_token('_051a003f-5bba-43c7-b5f1-7f1da3ae9cfb')
+    (None, UUID('051a003f-5bba-43c7-b5f1-7f1da3ae9cfb'))
+    >>> _parse_page_token('page 2')
+    Traceback (most recent call last):
+    ...
+    ValueError: Invalid search page token: 'page 2'
+    """
+    time, _, id_ = token.rpartition('_')
+    try:
+        return (parse_time(time) if time else None), UUID(id_)
+    except ValueError:
+        raise ValueError('Invalid search page token: {!r}'.format(token))
+
+
+def group_product_queries(product_queries):
+    """
+    Group products so each group can be searched in one database query: products are grouped
+    when they share a metadata type and the same remaining query terms.
+
+    :param product_queries: each matching product with its remaining query (see :func:`search_robust`)
+    :type product_queries: Iterable[(DatasetType, dict)]
+    :rtype: __generator[(dict, list[DatasetType])]
+    """
+    groups = []
+    for product, q in product_queries:
+        for group_q, products in groups:
+            if products[0].metadata_type.name == product.metadata_type.name and group_q == q:
+                products.append(product)
+                break
+        else:
+            groups.append((q, [product]))
+
+    for q, products in groups:
+        q['dataset_type_id'] = [product.id for product in products] if len(products) > 1 else products[0].id
+        yield q, products
+
+
+def dataset_from_row(dataset_res, product, full_info=False):
+    """
+    :param dataset_res: A row of the dataset table
+    :type product: DatasetType
+    :param bool full_info: Include all available fields
+    :rtype: Dataset
+    """
+    if dataset_res.uris:
+        uris = [uri for uri in dataset_res.uris if uri]
+    else:
+        uris = []
+
+    return Dataset(
+        type_=product,
+        metadata_doc=dataset_res.metadata,
+        uris=uris,
+        indexed_by=dataset_res.added_by if full_info else None,
+        indexed_time=dataset_res.added if full_info else None,
+        archived_time=dataset_res.archived
+    )
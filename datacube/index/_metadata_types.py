@@ -4,8 +4,7 @@ import logging
 import warnings
 from pathlib import Path
 
-from cachetools.func import lru_cache
-
+from datacube.index._catalogue import shared_catalogue
 from datacube.model import MetadataType
 from datacube.utils import jsonify_document, changes, _readable_offset, read_documents
 from datacube.utils.changes import check_doc_unchanged, get_doc_changes
@@ -26,21 +25,20 @@ class MetadataTypeResource(object):
         :type db: datacube.drivers.postgres._connections.PostgresDb
         """
         self._db = db
-
-        self.get_unsafe = lru_cache()(self.get_unsafe)
-        self.get_by_name_unsafe = lru_cache()(self.get_by_name_unsafe)
+        self._catalogue = shared_catalogue(db)
 
     def __getstate__(self):
         """
-        We define getstate/setstate to avoid pickling the caches
+        We define getstate/setstate to send the catalogue along (it primes the receiver's shared catalogue)
         """
-        return (self._db,)
+        return self._db, self._catalogue
 
     def __setstate__(self, state):
         """
-        We define getstate/setstate to avoid pickling the caches
+        We define getstate/setstate to send the catalogue along (it primes the receiver's shared catalogue)
         """
-        self.__init__(*state)
+        db, _ = state
+        self.__init__(db)
 
     def from_doc(self, definition):
         """
@@ -78,6 +76,7 @@ class MetadataTypeResource(object):
                     definition=metadata_type.definition,
                     concurrently=not allow_table_lock
                 )
+            self._catalogue.invalidate()
         return self.get_by_name(metadata_type.name)
 
     def can_update(self, metadata_type, allow_unsafe_updates=False):
@@ -150,8 +149,7 @@ class MetadataTypeResource(object):
                 concurrently=not allow_table_lock
             )
 
-        self.get_by_name_unsafe.cache_clear()
-        self.get_unsafe.cache_clear()
+        self._catalogue.invalidate()
         return self.get_by_name(metadata_type.name)
 
     def update_document(self, definition, allow_unsafe_updates=False):
@@ -184,23 +182,17 @@ class MetadataTypeResource(object):
         except KeyError:
             return None
 
-    # This is memoized in the constructor
-    # pylint: disable=method-hidden
-    def get_unsafe(self, id_):  # type: ignore
-        with self._db.connect() as connection:
-            record = connection.get_metadata_type(id_)
-        if record is None:
-            raise KeyError('%s is not a valid MetadataType id')
-        return self._make_from_query_row(record)
-
-    # This is memoized in the constructor
-    # pylint: disable=method-hidden
-    def get_by_name_unsafe(self, name):  # type: ignore
-        with self._db.connect() as connection:
-            record = connection.get_metadata_type_by_name(name)
-        if not record:
+    def get_unsafe(self, id_):
+        metadata_type = self._catalogue.metadata_type(id_)
+        if metadata_type is None:
+            raise KeyError('%s is not a valid MetadataType id' % id_)
+        return metadata_type
+
+    def get_by_name_unsafe(self, name):
+        metadata_type = self._catalogue.metadata_type_by_name(name)
+        if metadata_type is None:
             raise KeyError('%s is not a valid MetadataType name' % name)
-        return self._make_from_query_row(record)
+        return metadata_type
 
     def check_field_indexes(self, allow_table_lock=False, rebuild_all=None,
                             rebuild_views=False, rebuild_indexes=False):
@@ -232,20 +224,7 @@ class MetadataTypeResource(object):
 
         :rtype: iter[datacube.model.MetadataType]
         """
-        with self._db.connect() as connection:
-            return self._make_many(connection.get_all_metadata_types())
-
-    def _make_many(self, query_rows):
-        """
-        :rtype: list[datacube.model.MetadataType]
-        """
-        return (self._make_from_query_row(c) for c in query_rows)
-
-    def _make_from_query_row(self, query_row):
-        """
-        :rtype: datacube.model.MetadataType
-        """
-        return self._make(query_row['definition'], query_row['id'])
+        return iter(self._catalogue.metadata_types())
 
     def _make(self, definition, id_=None):
         """
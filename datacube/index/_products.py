@@ -2,9 +2,8 @@
 
 import logging
 
-from cachetools.func import lru_cache
-
 from datacube.index import fields
+from datacube.index._catalogue import shared_catalogue
 from datacube.model import DatasetType
 from datacube.utils import InvalidDocException, jsonify_document, changes, _readable_offset
 from datacube.utils.changes import check_doc_unchanged, get_doc_changes
@@ -27,21 +26,20 @@ class ProductResource(object):
         """
         self._db = db
         self.metadata_type_resource = metadata_type_resource
-
-        self.get_unsafe = lru_cache()(self.get_unsafe)
-        self.get_by_name_unsafe = lru_cache()(self.get_by_name_unsafe)
+        self._catalogue = shared_catalogue(db)
 
     def __getstate__(self):
         """
-        We define getstate/setstate to avoid pickling the caches
+        We define getstate/setstate to send the catalogue along (it primes the receiver's shared catalogue)
         """
-        return self._db, self.metadata_type_resource
+        return self._db, self.metadata_type_resource, self._catalogue
 
     def __setstate__(self, state):
         """
-        We define getstate/setstate to avoid pickling the caches
+        We define getstate/setstate to send the catalogue along (it primes the receiver's shared catalogue)
         """
-        self.__init__(*state)
+        db, metadata_type_resource, _ = state
+        self.__init__(db, metadata_type_resource)
 
     def from_doc(self, definition):
         """
@@ -106,6 +104,7 @@ class ProductResource(object):
                     definition=product.definition,
                     concurrently=not allow_table_lock,
                 )
+            self._catalogue.invalidate()
         return self.get_by_name(product.name)
 
     def can_update(self, product, allow_unsafe_updates=False):
@@ -217,8 +216,7 @@ class ProductResource(object):
                 concurrently=not allow_table_lock
             )
 
-        self.get_by_name_unsafe.cache_clear()
-        self.get_unsafe.cache_clear()
+        self._catalogue.invalidate()
         return self.get_by_name(product.name)
 
     def update_document(self, definition, allow_unsafe_updates=False, allow_table_lock=False):
@@ -275,23 +273,17 @@ class ProductResource(object):
         except KeyError:
             return None
 
-    # This is memoized in the constructor
-    # pylint: disable=method-hidden
-    def get_unsafe(self, id_):  # type: ignore
-        with self._db.connect() as connection:
-            result = connection.get_dataset_type(id_)
-        if not result:
+    def get_unsafe(self, id_):
+        product = self._catalogue.product(id_)
+        if product is None:
             raise KeyError('"%s" is not a valid Product id' % id_)
-        return self._make(result)
-
-    # This is memoized in the constructor
-    # pylint: disable=method-hidden
-    def get_by_name_unsafe(self, name):  # type: ignore
-        with self._db.connect() as connection:
-            result = connection.get_dataset_type_by_name(name)
-        if not result:
+        return product
+
+    def get_by_name_unsafe(self, name):
+        product = self._catalogue.product_by_name(name)
+        if product is None:
             raise KeyError('"%s" is not a valid Product name' % name)
-        return self._make(result)
+        return product
 
     def get_with_fields(self, field_names):
         """
@@ -325,48 +317,13 @@ class ProductResource(object):
         :param dict query:
         :rtype: __generator[(DatasetType, dict)]
         """
-
-        def _listify(v):
-            return v if isinstance(v, list) else [v]
-
-        for type_ in self.get_all():
-            remaining_matchable = query.copy()
-            # If they specified specific product/metadata-types, we can quickly skip non-matches.
-            if type_.name not in _listify(remaining_matchable.pop('product', type_.name)):
-                continue
-            if type_.metadata_type.name not in _listify(remaining_matchable.pop('metadata_type',
-                                                                                type_.metadata_type.name)):
-                continue
-
-            # Check that all the keys they specified match this product.
-            for key, value in list(remaining_matchable.items()):
-                field = type_.metadata_type.dataset_fields.get(key)
-                if not field:
-                    # This type doesn't have that field, so it cannot match.
-                    break
-                if not hasattr(field, 'extract'):
-                    # non-document/native field
-                    continue
-                if field.extract(type_.metadata_doc) is None:
-                    # It has this field but it's not defined in the type doc, so it's unmatchable.
-                    continue
-
-                expr = fields.as_expression(field, value)
-                if expr.evaluate(type_.metadata_doc):
-                    remaining_matchable.pop(key)
-                else:
-                    # A property doesn't match this type, skip to next type.
-                    break
-
-            else:
-                yield type_, remaining_matchable
+        return search_robust(self.get_all(), query)
 
     def get_all(self) -> Iterable[DatasetType]:
         """
         Retrieve all Products
         """
-        with self._db.connect() as connection:
-            return (self._make(record) for record in connection.get_all_dataset_types())
+        return iter(self._catalogue.products())
 
     def _make_many(self, query_rows):
         return (self._make(c) for c in query_rows)
@@ -377,3 +334,47 @@ class ProductResource(object):
             metadata_type=self.metadata_type_resource.get(query_row['metadata_type_ref']),
             id_=query_row['id'],
         )
+
+
+def search_robust(products, query):
+    """
+    The products that match the match-able fields of a query, each with a dict of its remaining fields.
+
+    :type products: Iterable[DatasetType]
+    :param dict query:
+    :rtype: __generator[(DatasetType, dict)]
+    """
+    def _listify(v):
+        return v if isinstance(v, list) else [v]
+
+    for type_ in products:
+        remaining_matchable = query.copy()
+        # If they specified specific product/metadata-types, we can quickly skip non-matches.
+        if type_.name not in _listify(remaining_matchable.pop('product', type_.name)):
+            continue
+        if type_.metadata_type.name not in _listify(remaining_matchable.pop('metadata_type',
+                                                                            type_.metadata_type.name)):
+            continue
+
+        # Check that all the keys they specified match this product.
+        for key, value in list(remaining_matchable.items()):
+            field = type_.metadata_type.dataset_fields.get(key)
+            if not field:
+                # This type doesn't have that field, so it cannot match.
+                break
+            if not hasattr(field, 'extract'):
+                # non-document/native field
+                continue
+            if field.extract(type_.metadata_doc) is None:
+                # It has this field but it's not defined in the type doc, so it's unmatchable.
+                continue
+
+            expr = fields.as_expression(field, value)
+            if expr.evaluate(type_.metadata_doc):
+                remaining_matchable.pop(key)
+            else:
+                # A property doesn't match this type, skip to next type.
+                break
+
+        else:
+            yield type_, remaining_matchable
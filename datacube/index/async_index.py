@@ -0,0 +1,252 @@
+# coding=utf-8
+"""
+An asyncio index, for services that handle many concurrent requests (such as tile servers).
+
+It covers the lookups and searches such services need, with the same query semantics as :class:`Index`::
+
+    index = index_connect(local_config)  # with "index_driver: asyncpg"
+    product = await index.products.get_by_name('ls8_nbar_albers')
+    datasets = await index.datasets.search(product='ls8_nbar_albers', time=('2017-01', '2017-02'))
+"""
+import logging
+from uuid import UUID
+
+from datacube.drivers.postgres._async import AsyncPostgresDb
+from datacube.model import MetadataType
+from . import fields
+from ._catalogue import Catalogue
+from ._datasets import dataset_from_row, group_product_queries
+from ._products import search_robust
+
+_LOG = logging.getLogger(__name__)
+
+
+class AsyncProductResource(object):
+    """
+    :type _db: datacube.drivers.postgres._async.AsyncPostgresDb
+    """
+
+    def __init__(self, db, catalogue):
+        self._db = db
+        self._catalogue = catalogue
+
+    async def get(self, id_):
+        """
+        Retrieve Product by id
+
+        :param int id_: id of the Product
+        :rtype: DatasetType
+        """
+        return await self._lookup(Catalogue.product, id_)
+
+    async def get_by_name(self, name):
+        """
+        Retrieve Product by name
+
+        :param str name: name of the Product
+        :rtype: DatasetType
+        """
+        return await self._lookup(Catalogue.product_by_name, name)
+
+    async def get_all(self):
+        """
+        Retrieve all Products
+
+        :rtype: list[DatasetType]
+        """
+        return (await self._current()).products()
+
+    async def search_robust(self, **query):
+        """
+        Return dataset types that match match-able fields and dict of remaining un-matchable fields.
+
+        :param dict query:
+        :rtype: list[(DatasetType, dict)]
+        """
+        return list(search_robust(await self.get_all(), query))
+
+    async def _lookup(self, get, key):
+        found = get(await self._current(), key)
+        if found is None:
+            # It may have been added by someone else since we last checked.
+            found = get(await self._current(force_check=True), key)
+        return found
+
+    async def _current(self, force_check=False):
+        """
+        The catalogue, checked against the database if it's due.
+
+        (Concurrent tasks may check at the same time: that's harmless, and rarer than waiting on each other)
+
+        :rtype: Catalogue
+        """
+        catalogue = self._catalogue
+        if force_check or catalogue.is_due_check():
+            async with self._db.connect() as connection:
+                version = await connection.get_catalogue_version()
+                if version == catalogue.version:
+                    catalogue.update(version)
+                else:
+                    catalogue.update(version,
+                                     await connection.get_all_metadata_types(),
+                                     await connection.get_all_dataset_types())
+        return catalogue
+
+
+class AsyncDatasetResource(object):
+    """
+    :type _db: datacube.drivers.postgres._async.AsyncPostgresDb
+    :type types: AsyncProductResource
+    """
+
+    def __init__(self, db, dataset_type_resource):
+        self._db = db
+        self.types = dataset_type_resource
+
+    async def get(self, id_):
+        """
+        Get dataset by id
+
+        :param UUID id_: id of the dataset to retrieve
+        :rtype: Dataset
+        """
+        if isinstance(id_, str):
+            id_ = UUID(id_)
+
+        async with self._db.connect() as connection:
+            dataset = await connection.get_dataset(id_)
+        return await self._make(dataset, full_info=True) if dataset else None
+
+    async def bulk_get(self, ids):
+        """
+        :param typing.Iterable[typing.Union[UUID, str]] ids: ids of the datasets to retrieve
+        :rtype: list[Dataset]
+        """
+        ids = [id_ if isinstance(id_, UUID) else UUID(id_) for id_ in ids]
+        if not ids:
+            return []
+
+        async with self._db.connect() as connection:
+            rows = await connection.get_datasets(ids)
+        return [await self._make(row, full_info=True) for row in rows]
+
+    async def search(self, limit=None, **query):
+        """
+        Perform a search, returning results as Dataset objects.
+
+        Unlike :meth:`DatasetResource.search`, all results are returned at once, so use a ``limit``
+        for searches that could be large. (Source filters aren't supported.)
+
+        :param Union[str,float,Range,list] query:
+        :param int limit: Limit number of datasets (for each group of products searched together)
+        :rtype: list[Dataset]
+        """
+        product_groups = await self._get_product_query_groups(query)
+        if not product_groups:
+            raise ValueError('No products match search terms: %r' % query)
+
+        datasets = []
+        async with self._db.connect() as connection:
+            for q, products in product_groups:
+                dataset_fields = products[0].metadata_type.dataset_fields
+                query_exprs = tuple(fields.to_expressions(dataset_fields.get, **q))
+                products_by_id = {product.id: product for product in products}
+                datasets.extend(dataset_from_row(row, products_by_id[row.dataset_type_ref])
+                                for row in await connection.search_datasets(query_exprs, limit=limit))
+        return datasets
+
+    async def count(self, **query):
+        """
+        Perform a search, returning count of results.
+
+        :param dict[str,str|float|datacube.model.Range] query:
+        :rtype: int
+        """
+        total = 0
+        product_groups = await self._get_product_query_groups(query)
+        async with self._db.connect() as connection:
+            for q, products in product_groups:
+                dataset_fields = products[0].metadata_type.dataset_fields
+                query_exprs = tuple(fields.to_expressions(dataset_fields.get, **q))
+                total += sum((await connection.count_datasets_by_product(query_exprs)).values())
+        return total
+
+    async def _get_product_query_groups(self, query):
+        return list(group_product_queries(await self.types.search_robust(**query)))
+
+    async def _make(self, dataset_res, full_info=False):
+        """
+        :rtype: Dataset
+        """
+        product = await self.types.get(dataset_res.dataset_type_ref)
+        return dataset_from_row(dataset_res, product, full_info=full_info)
+
+
+class AsyncIndex(object):
+    """
+    Access to the datacube index, for use with asyncio.
+
+    Products and metadata types are cached as they are by :class:`Index`.
+
+    :type products: AsyncProductResource
+    :type datasets: AsyncDatasetResource
+    """
+
+    def __init__(self, db):
+        """
+        :type db: datacube.drivers.postgres._async.AsyncPostgresDb
+        """
+        self._db = db
+        # Not shared with synchronous indexes: we load it ourselves, without blocking.
+        self.catalogue = Catalogue(repr(db.url), db=db, auto_check=False)
+
+        self.products = AsyncProductResource(db, self.catalogue)
+        self.datasets = AsyncDatasetResource(db, self.products)
+
+    @property
+    def url(self) -> str:
+        return self._db.url
+
+    @classmethod
+    def from_config(cls, config, application_name=None, validate_connection=True):
+        db = AsyncPostgresDb.from_config(config, application_name=application_name,
+                                         validate_connection=validate_connection)
+        return cls(db)
+
+    @classmethod
+    def get_dataset_fields(cls, doc):
+        return AsyncPostgresDb.get_dataset_fields(doc)
+
+    async def close(self):
+        """
+        Close all database connections.
+        """
+        await self._db.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, type_, value, traceback):
+        await self.close()
+
+    def __repr__(self):
+        return "AsyncIndex<db={!r}>".format(self._db)
+
+
+class AsyncIndexDriver(object):
+    @staticmethod
+    def connect_to_index(config, application_name=None, validate_connection=True):
+        return AsyncIndex.from_config(config, application_name, validate_connection)
+
+    @staticmethod
+    def metadata_type_from_doc(definition: dict) -> MetadataType:
+        """
+        :param definition:
+        """
+        MetadataType.validate(definition)  # type: ignore
+        return MetadataType(definition,
+                            dataset_search_fields=AsyncIndex.get_dataset_fields(definition))
+
+
+def index_driver_init():
+    return AsyncIndexDriver()
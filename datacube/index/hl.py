@@ -124,7 +124,7 @@ def dataset_resolver(index,
                      skip_lineage=False):
     match_product = product_matcher(product_matching_rules)
 
-    def resolve_no_lineage(ds, uri):
+    def resolve_no_lineage(ds, uri, db_dss=None):
         doc = ds.doc_without_lineage_sources
         try:
             product = match_product(doc)
@@ -133,7 +133,11 @@ def dataset_resolver(index,
 
         return Dataset(product, doc, uris=[uri], sources={}), None
 
-    def resolve(main_ds, uri):
+    def resolve(main_ds, uri, db_dss=None):
+        """
+        :param dict db_dss: The datasets of the document already in the database, by string id,
+                            if already looked up (it may include others)
+        """
         try:
             main_ds = SimpleDocNav(dedup_lineage(main_ds))
         except InvalidDocException as e:
@@ -143,7 +147,8 @@ def dataset_resolver(index,
 
         ds_by_uuid = toolz.valmap(toolz.first, flatten_datasets(main_ds))
         all_uuid = list(ds_by_uuid)
-        db_dss = {str(ds.id): ds for ds in index.datasets.bulk_get(all_uuid)}
+        if db_dss is None:
+            db_dss = {str(ds.id): ds for ds in index.datasets.bulk_get(all_uuid)}
 
         lineage_uuids = set(filter(lambda x: x != main_uuid, all_uuid))
         missing_lineage = lineage_uuids - set(db_dss)
@@ -259,6 +264,8 @@ class Doc2Dataset(object):
         if rules is None:
             raise ValueError(err_msg)
 
+        self._index = index
+        self._skip_lineage = skip_lineage
         self._ds_resolve = dataset_resolver(index,
                                             rules,
                                             fail_on_missing_lineage=fail_on_missing_lineage,
@@ -277,7 +284,36 @@ class Doc2Dataset(object):
         if not isinstance(doc, SimpleDocNav):
             doc = SimpleDocNav(doc)
 
-        dataset, err = self._ds_resolve(doc, uri)
+        return self._checked(self._ds_resolve(doc, uri))
+
+    def resolve_many(self, docs):
+        """Construct datasets from many metadata documents.
+
+        Same as calling this object for each ``(doc, uri)`` pair, but the lineage
+        datasets of all the documents are looked up in the database at once.
+
+        :param docs: Sequence of (Dictionary or SimpleDocNav, uri) pairs
+        :return: (dataset, None) or (None, ErrorMessage) for each document, in order
+        """
+        docs = [(doc if isinstance(doc, SimpleDocNav) else SimpleDocNav(doc), uri) for doc, uri in docs]
+        if self._skip_lineage:
+            return [self._checked(self._ds_resolve(doc, uri)) for doc, uri in docs]
+
+        all_uuid = set()
+        for doc, _ in docs:
+            try:
+                all_uuid.update(flatten_datasets(SimpleDocNav(dedup_lineage(doc))))
+            except InvalidDocException:
+                # Reported when resolving the document
+                continue
+        all_uuid.discard(None)
+        db_dss = {str(ds.id): ds for ds in self._index.datasets.bulk_get(all_uuid)} if all_uuid else {}
+
+        return [self._checked(self._ds_resolve(doc, uri, db_dss=db_dss)) for doc, uri in docs]
+
+    @staticmethod
+    def _checked(result):
+        dataset, err = result
         if dataset is None:
             return None, err
 
@@ -1,6 +1,7 @@
 import logging
 
 from datacube.drivers.postgres import PostgresDb
+from datacube.index._catalogue import shared_catalogue
 from datacube.index._datasets import DatasetResource
 from datacube.index._metadata_types import MetadataTypeResource, default_metadata_type_docs
 from datacube.index._products import ProductResource
@@ -46,6 +47,23 @@ class Index(object):
     def url(self) -> str:
         return self._db.url
 
+    @property
+    def catalogue(self):
+        """
+        The products and metadata types of this index, cached for the whole process.
+
+        :rtype: datacube.index._catalogue.Catalogue
+        """
+        return shared_catalogue(self._db)
+
+    def pool_metrics(self):
+        """
+        Usage of the database connection pool: connections in use, and time spent waiting for them.
+
+        :rtype: datacube.drivers.postgres._connections.PoolMetrics
+        """
+        return self._db.pool_metrics()
+
     @classmethod
     def from_config(cls, config, application_name=None, validate_connection=True):
         db = PostgresDb.from_config(config, application_name=application_name,
@@ -58,6 +76,7 @@ class Index(object):
 
     def init_db(self, with_default_types=True, with_permissions=True):
         is_new = self._db.init(with_permissions=with_permissions)
+        self.catalogue.invalidate()
 
         if is_new and with_default_types:
             _LOG.info('Adding default metadata types.')
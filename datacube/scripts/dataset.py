@@ -14,10 +14,11 @@ from datacube.index.exceptions import MissingRecordError
 from datacube.index.hl import Doc2Dataset, check_dataset_consistent
 from datacube.index.index import Index
 from datacube.model import Dataset
+from datacube.model.utils import flatten_datasets
 from datacube.ui import click as ui
 from datacube.ui.click import cli
 from datacube.ui.common import ui_path_doc_stream
-from datacube.utils import changes
+from datacube.utils import changes, DocumentCache
 from datacube.utils.serialise import SafeDatacubeDumper
 
 _LOG = logging.getLogger('datacube-dataset')
@@ -117,6 +118,14 @@ def load_datasets_for_update(doc_stream, index):
                     'default behaviour is to skip those top-level datasets that have lineage data '
                     'different from the version in the DB. This option allows omitting verification step.'))
 @click.option('--dry-run', help='Check if everything is ok', is_flag=True, default=False)
+@click.option('--jobs', '-j', type=click.IntRange(min=1), default=1, show_default=True,
+              help='Number of processes to read and parse dataset documents with')
+@click.option('--batch-size', type=click.IntRange(min=1), default=1, show_default=True,
+              help=('Resolve lineage and add datasets this many at a time, '
+                    'looking up and inserting each batch with a few queries'))
+@click.option('--document-cache', type=click.Path(file_okay=False),
+              help=('Directory to keep parsed documents in, so that unchanged documents '
+                    'are not parsed again by later runs'))
 @click.option('--ignore-lineage',
               help="Pretend that there is no lineage data in the datasets being indexed",
               is_flag=True, default=False)
@@ -131,6 +140,9 @@ def index_cmd(index, product_names,
               auto_add_lineage,
               verify_lineage,
               dry_run,
+              jobs,
+              batch_size,
+              document_cache,
               ignore_lineage,
               confirm_ignore_lineage,
               dataset_paths):
@@ -161,7 +173,17 @@ def index_cmd(index, product_names,
         sys.exit(2)
 
     def run_it(dataset_paths):
-        doc_stream = ui_path_doc_stream(dataset_paths, logger=_LOG, uri=True)
+        doc_stream = ui_path_doc_stream(dataset_paths, logger=_LOG, uri=True, jobs=jobs,
+                                        cache=DocumentCache(document_cache) if document_cache else None)
+        if batch_size > 1:
+            index_dataset_batches(doc_stream,
+                                  ds_resolve,
+                                  index,
+                                  batch_size=batch_size,
+                                  auto_add_lineage=auto_add_lineage,
+                                  dry_run=dry_run)
+            return
+
         dss = dataset_stream(doc_stream, ds_resolve)
         index_datasets(dss,
                        index,
@@ -180,10 +202,84 @@ def index_datasets(dss, index, auto_add_lineage, dry_run):
     for dataset in dss:
         _LOG.info('Matched %s', dataset)
         if not dry_run:
-            try:
-                index.datasets.add(dataset, with_lineage=auto_add_lineage)
-            except (ValueError, MissingRecordError) as e:
-                _LOG.error('Failed to add dataset %s: %s', dataset.local_uri, e)
+            add_dataset(dataset, index, auto_add_lineage)
+
+
+def add_dataset(dataset, index, auto_add_lineage):
+    try:
+        index.datasets.add(dataset, with_lineage=auto_add_lineage)
+    except (ValueError, MissingRecordError) as e:
+        _LOG.error('Failed to add dataset %s: %s', dataset.local_uri, e)
+
+
+def index_dataset_batches(doc_stream, ds_resolve, index, batch_size, auto_add_lineage, dry_run):
+    """
+    Same as :func:`dataset_stream` followed by :func:`index_datasets`, but a batch of documents
+    at a time: the lineage of a batch is looked up with one query and its datasets added together.
+    """
+    for batch in document_batches(doc_stream, batch_size):
+        dss = []
+        for dataset, err in ds_resolve.resolve_many([(doc, uri) for uri, doc in batch]):
+            if dataset is None:
+                _LOG.error('%s', str(err))
+                continue
+            _LOG.info('Matched %s', dataset)
+            dss.append(dataset)
+
+        if not dry_run:
+            add_dataset_batch(dss, index, auto_add_lineage)
+
+
+def document_batches(doc_stream, batch_size):
+    """
+    Group a stream of `(uri, doc)` pairs into lists of at most `batch_size`.
+
+    A batch ends early before a document whose lineage includes an earlier document of the batch,
+    so that (as when adding one at a time) the earlier one is in the index when the later one is resolved.
+    """
+    batch, batch_ids = [], set()
+    for uri, doc in doc_stream:
+        try:
+            lineage_ids = set(flatten_datasets(doc)) - {doc.id}
+        except Exception:  # pylint: disable=broad-except
+            # A bad document: it's reported when resolved.
+            lineage_ids = set()
+
+        if len(batch) >= batch_size or not lineage_ids.isdisjoint(batch_ids):
+            yield batch
+            batch, batch_ids = [], set()
+
+        batch.append((uri, doc))
+        batch_ids.add(doc.id)
+
+    if batch:
+        yield batch
+
+
+def add_dataset_batch(dss, index, auto_add_lineage):
+    """
+    Add datasets with :meth:`DatasetResource.add_many`, reporting them as :meth:`DatasetResource.add` would.
+    """
+    if not dss:
+        return
+
+    new_dss = []
+    seen = set()
+    for dataset, present in zip(dss, index.datasets.bulk_has([ds.id for ds in dss])):
+        if present or dataset.id in seen:
+            _LOG.warning('Dataset %s is already in the database', dataset.id)
+            continue
+        seen.add(dataset.id)
+        new_dss.append(dataset)
+
+    if not new_dss:
+        return
+
+    result, = index.datasets.add_many(new_dss, with_lineage=auto_add_lineage, batch_size=len(new_dss))
+    if result.error is not None:
+        # Add them one at a time, so only the failing datasets are left out, and each is reported.
+        for dataset in new_dss:
+            add_dataset(dataset, index, auto_add_lineage)
 
 
 def parse_update_rules(keys_that_can_change):
@@ -206,9 +302,12 @@ def parse_update_rules(keys_that_can_change):
 'archive' - mark as archived
 'forget' - remove from the index
 ''')
+@click.option('--document-cache', type=click.Path(file_okay=False),
+              help=('Directory to keep parsed documents in, so that unchanged documents '
+                    'are not parsed again by later runs'))
 @click.argument('dataset-paths', nargs=-1)
 @ui.pass_index()
-def update_cmd(index, keys_that_can_change, dry_run, location_policy, dataset_paths):
+def update_cmd(index, keys_that_can_change, dry_run, location_policy, document_cache, dataset_paths):
     def loc_action(action, new_ds, existing_ds, action_name):
         if len(existing_ds.uris) == 0:
             return None
@@ -247,7 +346,8 @@ def update_cmd(index, keys_that_can_change, dry_run, location_policy, dataset_pa
     success, fail = 0, 0
 
     for dataset, existing_ds in load_datasets_for_update(
-            ui_path_doc_stream(dataset_paths, logger=_LOG, uri=True), index):
+            ui_path_doc_stream(dataset_paths, logger=_LOG, uri=True,
+                               cache=DocumentCache(document_cache) if document_cache else None), index):
         _LOG.info('Matched %s', dataset)
 
         if location_policy != 'keep':
@@ -395,21 +495,33 @@ def info_cmd(index: Index, show_sources: bool, show_derived: bool,
 
 
 @dataset_cmd.command('search')
-@click.option('--limit', help='Limit the number of results',
+@click.option('--limit', help='Limit the number of results. Results are then ordered by time, '
+                              'and the token for the next page is printed to stderr',
               type=int, default=None)
+@click.option('--after', help='Token of the previous page of results',
+              type=str, default=None)
 @click.option('-f', help='Output format',
               type=click.Choice(list(_OUTPUT_WRITERS)), default='yaml', show_default=True)
 @ui.parsed_search_expressions
 @ui.pass_index()
-def search_cmd(index, limit, f, expressions):
+def search_cmd(index, limit, after, f, expressions):
     """
     Search available Datasets
     """
-    datasets = index.datasets.search(limit=limit, **expressions)
+    if limit is None:
+        if after is not None:
+            raise click.BadParameter('--after needs a --limit for the page size', param_hint='--after')
+        datasets = index.datasets.search(**expressions)
+        next_token = None
+    else:
+        datasets, next_token = index.datasets.search_page(limit, after=after, **expressions)
+
     _OUTPUT_WRITERS[f](
         build_dataset_info(index, dataset)
         for dataset in datasets
     )
+    if next_token is not None:
+        click.echo('Next page: --after {}'.format(next_token), err=True)
 
 
 def _get_derived_set(index, id_):
@@ -418,11 +530,7 @@ def _get_derived_set(index, id_):
     (children, grandchildren, great-grandchildren...)
     """
     derived_set = {index.datasets.get(id_)}
-    to_process = {id_}
-    while to_process:
-        derived = index.datasets.get_derived(to_process.pop())
-        to_process.update(d.id for d in derived)
-        derived_set.update(derived)
+    derived_set.update(index.datasets.get_all_derived([id_]))
     return derived_set
 
 
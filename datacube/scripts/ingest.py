@@ -1,7 +1,6 @@
 import time
 import logging
 import click
-import cachetools
 import itertools
 import sys
 from copy import deepcopy
@@ -169,11 +168,6 @@ def ensure_output_type(index: Index,
     return source_type, output_type
 
 
-@cachetools.cached(cache={}, key=lambda index, id_: id_)
-def get_full_lineage(index, id_):
-    return index.datasets.get(id_, include_sources=True)
-
-
 def load_config_from_file(path):
     config_file = Path(path)
     _, config = next(read_documents(config_file))
@@ -206,8 +200,17 @@ def create_task_list(index, output_type, year, source_type, config):
 
         return not require_fusing
 
+    tasks = [task for task in tasks if check_valid(**task)]
+
+    # Fetch the lineage of every source dataset together, rather than one query per source per tile.
+    source_ids = {dataset.id
+                  for task in tasks
+                  for sources in task['tile'].sources.values
+                  for dataset in sources}
+    lineage = {dataset.id: dataset for dataset in index.datasets.bulk_get_with_sources(source_ids)}
+
     def update_sources(sources):
-        return tuple(get_full_lineage(index, dataset.id) for dataset in sources)
+        return tuple(lineage.get(dataset.id) for dataset in sources)
 
     def update_task(task):
         tile = task['tile']
@@ -215,7 +218,7 @@ def create_task_list(index, output_type, year, source_type, config):
             tile.sources.values[i] = update_sources(tile.sources.values[i])
         return task
 
-    tasks = (update_task(task) for task in tasks if check_valid(**task))
+    tasks = (update_task(task) for task in tasks)
     return tasks
 
 
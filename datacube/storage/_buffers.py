@@ -0,0 +1,98 @@
+""" Scratch buffers re-used between reads
+"""
+import threading
+from typing import Dict, List, Tuple, Optional, Union
+import numpy as np
+
+BufferKey = Tuple[Tuple[int, ...], np.dtype]  # pylint: disable=invalid-name
+
+
+class BufferPool(object):
+    """ Pool of scratch arrays keyed by shape and dtype.
+
+    Arrays handed out by :meth:`take` have undefined content, once caller is
+    done with an array it should be returned with :meth:`give`. Pool is safe
+    to share between threads, use :func:`thread_buffer_pool` for a pool
+    private to the current thread.
+
+    At most ``max_bytes`` worth of idle arrays are kept around.
+    """
+
+    def __init__(self, max_bytes: int = 256*(1 << 20)):
+        self._max_bytes = max_bytes
+        self._free = {}  # type: Dict[BufferKey, List[np.ndarray]]
+        self._free_bytes = 0
+        self._lock = threading.Lock()
+        self.n_alloc = 0
+        self.n_reuse = 0
+
+    @property
+    def free_bytes(self) -> int:
+        return self._free_bytes
+
+    def take(self, shape: Tuple[int, ...], dtype: Union[str, np.dtype]) -> np.ndarray:
+        """ Get array of a given shape and type, content is undefined.
+        """
+        key = (tuple(shape), np.dtype(dtype))
+
+        with self._lock:
+            free = self._free.get(key)
+            if free:
+                buf = free.pop()
+                self._free_bytes -= buf.nbytes
+                self.n_reuse += 1
+                return buf
+            self.n_alloc += 1
+
+        return np.empty(*key)
+
+    def full(self, shape: Tuple[int, ...], fill_value, dtype: Union[str, np.dtype]) -> np.ndarray:
+        """ Same as :meth:`take`, but also fill array with ``fill_value``.
+        """
+        buf = self.take(shape, dtype)
+        buf.fill(fill_value)
+        return buf
+
+    def give(self, buf: Optional[np.ndarray]) -> None:
+        """ Return array to the pool for re-use.
+
+        Arrays that are views into other arrays are ignored, as somebody else
+        might still be using the underlying memory.
+        """
+        if buf is None or buf.base is not None or not buf.flags.c_contiguous:
+            return
+
+        key = (buf.shape, buf.dtype)
+        with self._lock:
+            if self._free_bytes + buf.nbytes > self._max_bytes:
+                return
+            self._free.setdefault(key, []).append(buf)
+            self._free_bytes += buf.nbytes
+
+    def clear(self) -> None:
+        """ Drop all idle arrays.
+        """
+        with self._lock:
+            self._free.clear()
+            self._free_bytes = 0
+
+
+_THREAD_STATE = threading.local()
+
+#: Most idle bytes kept by each thread's pool, see :func:`thread_buffer_pool`
+THREAD_POOL_MAX_BYTES = 32*(1 << 20)
+
+
+def thread_buffer_pool() -> BufferPool:
+    """ Buffer pool private to the current thread.
+
+    For callers that fuse many tiles in one worker thread and want scratch
+    space kept between calls (pass it as ``buffer_pool``). Idle arrays live
+    as long as the thread, up to :data:`THREAD_POOL_MAX_BYTES` worth (as it
+    was when the pool was created), call ``.clear()`` to release them sooner.
+    """
+    pool = getattr(_THREAD_STATE, 'buffer_pool', None)
+    if pool is None:
+        pool = BufferPool(max_bytes=THREAD_POOL_MAX_BYTES)
+        _THREAD_STATE.buffer_pool = pool
+    return pool
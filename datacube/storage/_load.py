@@ -6,19 +6,25 @@ Important functions are:
 """
 import logging
 from collections import OrderedDict
+from itertools import groupby
+from concurrent.futures import (
+    Executor, Future, ThreadPoolExecutor,
+    wait, FIRST_COMPLETED
+)
 import numpy as np
 from xarray.core.dataarray import DataArray as XrDataArray
 from xarray.core.dataset import Dataset as XrDataset
 from typing import (
     Union, Optional, Callable,
-    List, Any, Iterator, Iterable, Mapping, Tuple
+    List, Any, Iterator, Iterable, Mapping, Tuple, Dict
 )
 
 from datacube.utils import ignore_exceptions_if
-from datacube.utils.geometry import GeoBox, Coordinate, roi_is_empty
+from datacube.utils.geometry import GeoBox, Coordinate, roi_is_empty, roi_shape
 from datacube.model import Measurement
 from datacube.drivers._types import ReaderDriver
 from . import DataSource, BandInfo
+from ._buffers import BufferPool
 
 _LOG = logging.getLogger(__name__)
 
@@ -26,13 +32,20 @@ FuserFunction = Callable[[np.ndarray, np.ndarray], Any]  # pylint: disable=inval
 ProgressFunction = Callable[[int, int], Any]  # pylint: disable=invalid-name
 
 
-def _default_fuser(dst: np.ndarray, src: np.ndarray, dst_nodata: float) -> None:
+def _default_fuser(dst: np.ndarray, src: np.ndarray, dst_nodata: float,
+                   mask: Optional[np.ndarray] = None) -> None:
     """ Overwrite only those pixels in `dst` with `src` that are "not valid"
 
         For every pixel in dst that equals to dst_nodata replace it with pixel
         from src.
+
+        :param mask: Optional boolean scratch array of the same shape as `dst`,
+                     used to avoid allocating the nodata mask on every call
     """
-    where_nodata = (dst == dst_nodata) if not np.isnan(dst_nodata) else np.isnan(dst)
+    if np.isnan(dst_nodata):
+        where_nodata = np.isnan(dst, out=mask)
+    else:
+        where_nodata = np.equal(dst, dst_nodata, out=mask)
     np.copyto(dst, src, where=where_nodata)
 
 
@@ -43,7 +56,8 @@ def reproject_and_fuse(datasources: List[DataSource],
                        resampling: str = 'nearest',
                        fuse_func: Optional[FuserFunction] = None,
                        skip_broken_datasets: bool = False,
-                       progress_cbk: Optional[ProgressFunction] = None):
+                       progress_cbk: Optional[ProgressFunction] = None,
+                       buffer_pool: Optional[BufferPool] = None):
     """
     Reproject and fuse `sources` into a 2D numpy array `destination`.
 
@@ -53,16 +67,14 @@ def reproject_and_fuse(datasources: List[DataSource],
     :param skip_broken_datasets: Carry on in the face of adversity and failing reads.
     :param progress_cbk: If supplied will be called with 2 integers `Items processed, Total Items`
                          after reading each file.
+    :param buffer_pool: Scratch space for fusing multiple sources. By default it's
+                        only kept for this call, pass a pool (such as
+                        :func:`thread_buffer_pool`) to re-use it between calls.
     """
     # pylint: disable=too-many-locals
     from ._read import read_time_slice
     assert len(destination.shape) == 2
 
-    def copyto_fuser(dest: np.ndarray, src: np.ndarray) -> None:
-        _default_fuser(dest, src, dst_nodata)
-
-    fuse_func = fuse_func or copyto_fuser
-
     destination.fill(dst_nodata)
     if len(datasources) == 0:
         return destination
@@ -77,18 +89,31 @@ def reproject_and_fuse(datasources: List[DataSource],
         return destination
     else:
         # Multiple sources, we need to fuse them together into a single array
-        buffer_ = np.full(destination.shape, dst_nodata, dtype=destination.dtype)
-        for n_so_far, source in enumerate(datasources, 1):
-            with ignore_exceptions_if(skip_broken_datasets):
-                with source.open() as rdr:
-                    roi = read_time_slice(rdr, buffer_, dst_gbox, resampling, dst_nodata)
-
-                if not roi_is_empty(roi):
-                    fuse_func(destination[roi], buffer_[roi])
-                    buffer_[roi] = dst_nodata  # clean up for next read
-
-            if progress_cbk:
-                progress_cbk(n_so_far, len(datasources))
+        if buffer_pool is None:
+            buffer_pool = BufferPool()
+
+        buffer_ = buffer_pool.full(destination.shape, dst_nodata, destination.dtype)
+        mask = None if fuse_func else buffer_pool.take(destination.shape, 'bool')
+
+        try:
+            for n_so_far, source in enumerate(datasources, 1):
+                with ignore_exceptions_if(skip_broken_datasets):
+                    with source.open() as rdr:
+                        roi = read_time_slice(rdr, buffer_, dst_gbox, resampling, dst_nodata)
+
+                    if not roi_is_empty(roi):
+                        if fuse_func:
+                            fuse_func(destination[roi], buffer_[roi])
+                        else:
+                            h, w = roi_shape(roi)
+                            _default_fuser(destination[roi], buffer_[roi], dst_nodata, mask=mask[:h, :w])
+                        buffer_[roi] = dst_nodata  # clean up for next read
+
+                if progress_cbk:
+                    progress_cbk(n_so_far, len(datasources))
+        finally:
+            buffer_pool.give(buffer_)
+            buffer_pool.give(mask)
 
         return destination
 
@@ -125,16 +150,90 @@ def _allocate_storage(coords: Mapping[str, XrDataArray],
     return xx
 
 
+def _plan_reads(groups: List[Tuple[Measurement, Any, List[BandInfo]]]) -> Iterator[List[Tuple[int, int]]]:
+    """ Group band reads that can be served by one request.
+
+    Bands of the same dataset stored in the same file (same ``uri`` and
+    ``layer``) and loaded with the same resampling method share a read plan,
+    so all of them can be fetched with one multi-band read.
+
+    :param groups: ``(measurement, time index, [BandInfo per dataset])``, with
+                   all measurements of one time index next to each other
+    :returns: lists of ``(group index, dataset index)`` to read together
+    """
+    def resampling(m: Measurement) -> str:
+        return m.get('resampling_method', 'nearest')
+
+    for _, block in groupby(enumerate(groups), key=lambda g: g[1][1]):
+        block = list(block)
+        _, (_, _, first_bbi) = block[0]
+
+        for bidx in range(len(first_bbi)):
+            plan = OrderedDict()  # type: Dict[Tuple[str, Optional[str], str], List[Tuple[int, int]]]
+            for gidx, (m, _, bbi) in block:
+                band = bbi[bidx]
+                plan.setdefault((band.uri, band.layer, resampling(m)), []).append((gidx, bidx))
+
+            yield from plan.values()
+
+
+def _submit_inline(fn: Callable[..., Any], *args) -> Future:
+    """ Run ``fn(*args)`` in the current thread, return completed Future.
+    """
+    fut = Future()  # type: Future
+    try:
+        fut.set_result(fn(*args))
+    except Exception as e:  # pylint: disable=broad-except
+        fut.set_exception(e)
+    return fut
+
+
+class InlineExecutor(Executor):
+    """ Executor that runs submitted work in the calling thread.
+
+    For reader drivers used from code that is already running in parallel,
+    such as dask tasks.
+    """
+
+    def submit(self, fn, *args, **kwargs):  # pylint: disable=arguments-differ
+        return _submit_inline(lambda: fn(*args, **kwargs))
+
+
 def xr_load(sources: XrDataArray,
             geobox: GeoBox,
             measurements: List[Measurement],
             driver: ReaderDriver,
             driver_ctx_prev: Optional[Any] = None,
-            skip_broken_datasets: bool = False) -> Tuple[XrDataset, Any]:
-    # pylint: disable=too-many-locals
-    from ._read import read_time_slice_v2
+            skip_broken_datasets: bool = False,
+            max_in_flight: int = 1,
+            pool: Optional[Executor] = None,
+            progress_cbk: Optional[ProgressFunction] = None,
+            dst: Optional[XrDataset] = None) -> Tuple[XrDataset, Any]:
+    """ Load data from ``sources`` into a newly allocated :class:`xarray.Dataset`.
+
+    Up to ``max_in_flight`` open+read operations are kept running at once,
+    across time slices and measurements. Results are fused into destination
+    slices as soon as they are available, but within one destination slice
+    sources are always fused in the order they appear in ``sources``.
+
+    Measurements of a dataset that live in the same file are read with one
+    multi-band request, see :func:`_plan_reads`.
+
+    :param max_in_flight: Maximum number of concurrent open+read operations,
+                          1 means load sequentially in the current thread
+    :param pool: Executor used to run open+read operations, if not supplied and
+                 ``max_in_flight > 1`` a temporary thread pool is created
+    :param progress_cbk: If supplied will be called with 2 integers `Items processed, Total Items`
+                         after fusing each source, from the calling thread. Exceptions it raises
+                         stop the load, leaving whatever was fused so far in the output.
+    :param dst: Load into this :class:`xarray.Dataset` (of the shape and types
+                :func:`_allocate_storage` would make) instead of allocating a new one
+    :returns: (loaded data, driver load context)
+    """
+    # pylint: disable=too-many-locals,too-many-statements
+    from ._read import read_time_slices_v2
 
-    out = _allocate_storage(sources.coords, geobox, measurements)
+    out = dst if dst is not None else _allocate_storage(sources.coords, geobox, measurements)
 
     def all_groups() -> Iterator[Tuple[Any, int, List[BandInfo]]]:
         for idx, dss in np.ndenumerate(sources.values):
@@ -149,22 +248,85 @@ def xr_load(sources: XrDataArray,
     groups = list(all_groups())
     ctx = driver.new_load_context(just_bands(groups), driver_ctx_prev)
 
-    # TODO: run upto N concurrently
-    for m, idx, bbi in groups:
-        dst = out[m.name].values[idx]
-        dst[:] = m.nodata
-        resampling = m.get('resampling_method', 'nearest')
+    def load_bands(slots: List[Tuple[int, int]]) -> List[Tuple[Optional[np.ndarray], Tuple[slice, slice]]]:
+        ms = [groups[gidx][0] for gidx, _ in slots]
+        rdrs = [driver.open(groups[gidx][2][bidx], ctx) for gidx, bidx in slots]
+        rdrs = [rdr.result() for rdr in rdrs]
+        return read_time_slices_v2(rdrs, geobox,
+                                   ms[0].get('resampling_method', 'nearest'),
+                                   [m.nodata for m in ms],
+                                   buffer_pool=buffer_pool)
+
+    for m, idx, _ in groups:
+        out[m.name].values[idx] = m.nodata
+
+    # Shared between worker threads, pixels go back once fused
+    buffer_pool = BufferPool()
+
+    # Per group: index of the next source to fuse and results that arrived out of order
+    next_to_fuse = [0]*len(groups)
+    ready = [{} for _ in groups]  # type: List[Dict[int, Tuple[Future, int]]]
+    n_total = sum(len(bbi) for _, _, bbi in groups)
+    n_so_far = 0
+
+    def fuse_ready(gidx: int) -> None:
+        nonlocal n_so_far
+        m, idx, _ = groups[gidx]
+        t_slice = out[m.name].values[idx]
         fuse_func = m.get('fuser', None)
+        pending = ready[gidx]
 
-        for band in bbi:
-            rdr = driver.open(band, ctx).result()
+        while next_to_fuse[gidx] in pending:
+            fut, k = pending.pop(next_to_fuse[gidx])
+            next_to_fuse[gidx] += 1
 
-            pix, roi = read_time_slice_v2(rdr, geobox, resampling, m.nodata)
-
-            if pix is not None:
-                if fuse_func:
-                    fuse_func(dst[roi], pix)
-                else:
-                    _default_fuser(dst[roi], pix, m.nodata)
+            with ignore_exceptions_if(skip_broken_datasets):
+                pix, roi = fut.result()[k]
+                if pix is not None:
+                    if fuse_func:
+                        fuse_func(t_slice[roi], pix)
+                    else:
+                        mask = buffer_pool.take(pix.shape, 'bool')
+                        _default_fuser(t_slice[roi], pix, m.nodata, mask=mask)
+                        buffer_pool.give(mask)
+                        buffer_pool.give(pix)
+
+            n_so_far += 1
+            if progress_cbk:
+                progress_cbk(n_so_far, n_total)
+
+    own_pool = None
+    if pool is None and max_in_flight > 1:
+        pool = own_pool = ThreadPoolExecutor(max_workers=max_in_flight)
+
+    submit = pool.submit if pool is not None else _submit_inline
+    max_in_flight = max(1, max_in_flight)
+    in_flight = {}  # type: Dict[Future, List[Tuple[int, int]]]
+
+    def on_done(done: Iterable[Future]) -> None:
+        for fut in done:
+            slots = in_flight.pop(fut)
+            for k, (gidx, bidx) in enumerate(slots):
+                ready[gidx][bidx] = (fut, k)
+            for gidx in OrderedDict.fromkeys(gidx for gidx, _ in slots):
+                fuse_ready(gidx)
+
+    try:
+        for slots in _plan_reads(groups):
+            if len(in_flight) >= max_in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                on_done(done)
+
+            fut = submit(load_bands, slots)
+            in_flight[fut] = slots
+
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            on_done(done)
+    finally:
+        for fut in in_flight:
+            fut.cancel()
+        if own_pool is not None:
+            own_pool.shutdown(wait=True)
 
     return out, ctx
@@ -2,7 +2,7 @@
 """
 from affine import Affine
 import numpy as np
-from typing import Tuple
+from typing import Tuple, List, Optional, Sequence
 
 from ..utils.math import is_almost_int, valid_mask
 
@@ -19,6 +19,7 @@ from ..utils.geometry import (
 
 from ..utils.geometry._warp import is_resampling_nn, Resampling, Nodata
 from ..utils.geometry import gbox as gbx
+from ._buffers import BufferPool
 
 
 def rdr_geobox(rdr) -> GeoBox:
@@ -82,6 +83,13 @@ def can_paste(rr, stol=1e-3, ttol=1e-2):
 
 
 def pick_read_scale(scale: float, rdr=None, tol=1e-3):
+    """ Pick integer scale factor to read source image at.
+
+    When reader is supplied and it has overviews, pick the largest overview
+    that is not coarser than requested scale, so that pixels come straight
+    from the overview image and the remaining scaling is done by the
+    requested resampling method.
+    """
     assert scale > 0
     # First find nearest integer scale
     #    Scale down to nearest integer, unless we can scale up by less than tol
@@ -98,13 +106,26 @@ def pick_read_scale(scale: float, rdr=None, tol=1e-3):
 
     scale = int(scale)
 
-    if rdr is not None:
-        # TODO: check available overviews in rdr
-        pass
+    if rdr is not None and scale > 1:
+        overviews = [ovr for ovr in getattr(rdr, 'overviews', ()) if ovr <= scale]
+        if overviews:
+            return max(overviews)
 
     return scale
 
 
+def _paste_ok(rr, scale: int, is_nn: bool) -> bool:
+    """ Check if can read and paste, given read scale picked by :func:`pick_read_scale`.
+
+    Paste reads at scale of ``rr``, for non-nearest resampling prefer reading
+    from a finer overview and resampling over pasting decimated pixels.
+    """
+    paste_ok, _ = can_paste(rr, ttol=0.9 if is_nn else 0.01)
+    if paste_ok and not is_nn and scale < np.round(rr.scale):
+        return False
+    return paste_ok
+
+
 def read_time_slice(rdr,
                     dst: np.ndarray,
                     dst_gbox: GeoBox,
@@ -125,7 +146,7 @@ def read_time_slice(rdr,
     is_nn = is_resampling_nn(resampling)
     scale = pick_read_scale(rr.scale, rdr)
 
-    paste_ok, _ = can_paste(rr, ttol=0.9 if is_nn else 0.01)
+    paste_ok = _paste_ok(rr, scale, is_nn)
 
     def norm_read_args(roi, shape):
         if roi_is_full(roi, rdr.shape):
@@ -187,18 +208,49 @@ def read_time_slice_v2(rdr,
 
     :returns: pixels read and ROI of dst_gbox that was affected
     """
+    (pix, roi), = read_time_slices_v2([rdr], dst_gbox, resampling, [dst_nodata])
+    return pix, roi
+
+
+def _read_window(rdrs: Sequence, window, out_shape) -> List[np.ndarray]:
+    if len(rdrs) == 1:
+        return [rdrs[0].read(window, out_shape).result()]
+
+    rdr, *others = rdrs
+    return [f.result() for f in rdr.read_many(others, window, out_shape)]
+
+
+def read_time_slices_v2(rdrs: Sequence,
+                        dst_gbox: GeoBox,
+                        resampling: Resampling,
+                        dst_nodata: Sequence[Nodata],
+                        buffer_pool: Optional[BufferPool] = None) -> List[Tuple[Optional[np.ndarray],
+                                                                                Tuple[slice, slice]]]:
+    """ Same as :func:`read_time_slice_v2` but for several readers at once.
+
+    All readers must have the same geobox, i.e. be different bands of the same
+    file, so the read plan is computed once and pixels for all bands are
+    requested in one go with ``read_many``.
+
+    :param dst_nodata: destination nodata value for each reader
+    :param buffer_pool: If supplied, reprojection destinations are taken from
+                        this pool, caller can return them once done
+    :returns: pixels read and ROI of dst_gbox that was affected, for each reader
+    """
     # pylint: disable=too-many-locals
+    assert len(rdrs) == len(dst_nodata)
+    rdr = rdrs[0]
     src_gbox = rdr_geobox(rdr)
 
     rr = compute_reproject_roi(src_gbox, dst_gbox)
 
     if roi_is_empty(rr.roi_dst):
-        return None, rr.roi_dst
+        return [(None, rr.roi_dst) for _ in rdrs]
 
     is_nn = is_resampling_nn(resampling)
     scale = pick_read_scale(rr.scale, rdr)
 
-    paste_ok, _ = can_paste(rr, ttol=0.9 if is_nn else 0.01)
+    paste_ok = _paste_ok(rr, scale, is_nn)
 
     def norm_read_args(roi, shape):
         if roi_is_full(roi, rdr.shape):
@@ -209,23 +261,26 @@ def read_time_slice_v2(rdr,
 
         return roi, shape
 
+    out = []
+
     if paste_ok:
         read_shape = roi_shape(rr.roi_dst)
         A = rr.transform.linear
         sx, sy = A.a, A.e
 
-        pix = rdr.read(*norm_read_args(rr.roi_src, read_shape)).result()
-
-        if sx < 0:
-            pix = pix[:, ::-1]
-        if sy < 0:
-            pix = pix[::-1, :]
+        for src, pix, nodata in zip(rdrs,
+                                    _read_window(rdrs, *norm_read_args(rr.roi_src, read_shape)),
+                                    dst_nodata):
+            if sx < 0:
+                pix = pix[:, ::-1]
+            if sy < 0:
+                pix = pix[::-1, :]
 
-        # normalise nodata to be equal to `dst_nodata`
-        if rdr.nodata is not None and rdr.nodata != dst_nodata:
-            pix[pix == rdr.nodata] = dst_nodata
+            # normalise nodata to be equal to `dst_nodata`
+            if src.nodata is not None and src.nodata != nodata:
+                pix[pix == src.nodata] = nodata
 
-        dst = pix
+            out.append((pix, rr.roi_dst))
     else:
         if rr.is_st:
             # add padding on src/dst ROIs, it was set to tight bounds
@@ -238,15 +293,22 @@ def read_time_slice_v2(rdr,
         if scale > 1:
             src_gbox = gbx.zoom_out(src_gbox, scale)
 
-        dst = np.full(dst_gbox.shape, dst_nodata, dtype=rdr.dtype)
-        pix = rdr.read(*norm_read_args(rr.roi_src, src_gbox.shape)).result()
-
-        if rr.transform.linear is not None:
-            A = (~src_gbox.transform)*dst_gbox.transform
-            warp_affine(pix, dst, A, resampling,
-                        src_nodata=rdr.nodata, dst_nodata=dst_nodata)
-        else:
-            rio_reproject(pix, dst, src_gbox, dst_gbox, resampling,
-                          src_nodata=rdr.nodata, dst_nodata=dst_nodata)
-
-    return dst, rr.roi_dst
+        for src, pix, nodata in zip(rdrs,
+                                    _read_window(rdrs, *norm_read_args(rr.roi_src, src_gbox.shape)),
+                                    dst_nodata):
+            if buffer_pool is None:
+                dst = np.full(dst_gbox.shape, nodata, dtype=src.dtype)
+            else:
+                dst = buffer_pool.full(dst_gbox.shape, nodata, src.dtype)
+
+            if rr.transform.linear is not None:
+                A = (~src_gbox.transform)*dst_gbox.transform
+                warp_affine(pix, dst, A, resampling,
+                            src_nodata=src.nodata, dst_nodata=nodata)
+            else:
+                rio_reproject(pix, dst, src_gbox, dst_gbox, resampling,
+                              src_nodata=src.nodata, dst_nodata=nodata)
+
+            out.append((dst, rr.roi_dst))
+
+    return out
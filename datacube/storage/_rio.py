@@ -10,7 +10,7 @@ import numpy as np
 from affine import Affine
 import rasterio
 from urllib.parse import urlparse
-from typing import Optional, Iterator
+from typing import Optional, Iterator, Tuple
 
 from datacube.utils import datetime_to_seconds_since_1970
 from datacube.utils import geometry
@@ -76,6 +76,11 @@ class BandDataSource(GeoRasterReader):
     def shape(self) -> RasterShape:
         return self.source.shape
 
+    @property
+    def overviews(self) -> Tuple[int, ...]:
+        with maybe_lock(self._lock):
+            return tuple(self.source.ds.overviews(self.source.bidx))
+
     def read(self, window: Optional[RasterWindow] = None,
              out_shape: Optional[RasterShape] = None) -> Optional[np.ndarray]:
         """Read data in the native format, returning a numpy array
@@ -125,6 +130,11 @@ class OverrideBandDataSource(GeoRasterReader):
     def shape(self) -> RasterShape:
         return self.source.shape
 
+    @property
+    def overviews(self) -> Tuple[int, ...]:
+        with maybe_lock(self._lock):
+            return tuple(self.source.ds.overviews(self.source.bidx))
+
     def read(self, window: Optional[RasterWindow] = None,
              out_shape: Optional[RasterShape] = None) -> Optional[np.ndarray]:
         """Read data in the native format, returning a native array
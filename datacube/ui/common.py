@@ -2,6 +2,8 @@
 """
 Common methods for UI code.
 """
+import functools
+import multiprocessing
 from pathlib import Path
 from typing import Union
 
@@ -64,7 +66,7 @@ def _find_any_metadata_suffix(path):
     return existing_paths[0]
 
 
-def ui_path_doc_stream(paths, logger=None, uri=True, raw=False):
+def ui_path_doc_stream(paths, logger=None, uri=True, raw=False, jobs=1, cache=None):
     """Given a stream of URLs, or Paths that could be directories, generate a stream of
     (path, doc) tuples.
 
@@ -83,6 +85,11 @@ def ui_path_doc_stream(paths, logger=None, uri=True, raw=False):
     :param raw: By default docs are wrapped in :class:`SimpleDocNav`, but you can
     instead request them to be raw dictionaries
 
+    :param jobs: Number of processes to read and parse files with. Documents are
+    still generated in the order of their paths.
+
+    :param cache: A :class:`datacube.utils.documents.DocumentCache` of already parsed documents
+
     """
 
     def on_error1(p, e):
@@ -94,7 +101,7 @@ def ui_path_doc_stream(paths, logger=None, uri=True, raw=False):
             logger.error('Failed reading documents from %s', str(p))
 
     yield from _path_doc_stream(_resolve_doc_files(paths, on_error=on_error1),
-                                on_error=on_error2, uri=uri, raw=raw)
+                                on_error=on_error2, uri=uri, raw=raw, jobs=jobs, cache=cache)
 
 
 def _resolve_doc_files(paths, on_error):
@@ -105,14 +112,38 @@ def _resolve_doc_files(paths, on_error):
             on_error(p, e)
 
 
-def _path_doc_stream(files, on_error, uri=True, raw=False):
+def _path_doc_stream(files, on_error, uri=True, raw=False, jobs=1, cache=None):
     """See :func:`ui_path_doc_stream` for documentation"""
     maybe_wrap = identity if raw else SimpleDocNav
 
+    if jobs > 1:
+        with multiprocessing.Pool(jobs) as pool:
+            for fname, docs, error in pool.imap(functools.partial(_read_file_documents, uri=uri, cache=cache), files):
+                for p, doc in docs:
+                    yield p, maybe_wrap(doc)
+                if error is not None:
+                    on_error(fname, error)
+        return
+
     for fname in files:
         try:
-            for p, doc in read_documents(fname, uri=uri):
+            for p, doc in read_documents(fname, uri=uri, cache=cache):
                 yield p, maybe_wrap(doc)
 
         except InvalidDocException as e:
             on_error(fname, e)
+
+
+def _read_file_documents(fname, uri=True, cache=None):
+    """
+    Read all documents of a file (in a worker process).
+
+    :return: The file name, the documents read, and the error that stopped reading (or None)
+    """
+    docs = []
+    try:
+        for p, doc in read_documents(fname, uri=uri, cache=cache):
+            docs.append((p, doc))
+    except InvalidDocException as e:
+        return fname, docs, e
+    return fname, docs, None
@@ -10,7 +10,7 @@ from datacube.utils.dates import parse_time
 from .dates import datetime_to_seconds_since_1970
 from .documents import InvalidDocException, SimpleDocNav, DocReader, is_supported_document_type, \
     read_strings_from_netcdf, read_documents, validate_document, NoDatesSafeLoader, get_doc_offset, \
-    get_doc_offset_safe, netcdf_extract_string, without_lineage_sources
+    get_doc_offset_safe, netcdf_extract_string, without_lineage_sources, DocumentCache
 from .math import unsqueeze_data_array, iter_slices, unsqueeze_dataset, data_resolution_and_offset
 from .py import cached_property, ignore_exceptions_if, import_function
 from .serialise import jsonify_document
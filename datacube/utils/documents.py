@@ -2,9 +2,14 @@
 # Functions for working with YAML documents and configurations
 ###
 import gzip
+import hashlib
+import io
 import json
 import logging
+import os
+import pickle
 import sys
+import tempfile
 from collections import OrderedDict, Mapping
 from contextlib import contextmanager
 from itertools import chain
@@ -24,6 +29,11 @@ try:
 except ImportError:
     from yaml import SafeLoader
 
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None
+
 from datacube.utils.generic import map_with_lookahead
 from datacube.utils.uris import mk_part_uri, as_url, uri_to_local_path
 
@@ -72,12 +82,28 @@ def parse_yaml(doc: str) -> typing.Mapping[str, Any]:
     return yaml.load(doc, Loader=SafeLoader)
 
 
+def parse_json(doc):
+    """
+    Convert a JSON string (or bytes) into a parsed document.
+
+    Uses orjson when it's installed, with the standard library as a fallback
+    for the few documents it refuses (such as those with NaN or Infinity values).
+
+    >>> parse_json(b'{"a": [1, 2.5, NaN]}')
+    {'a': [1, 2.5, nan]}
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(doc)
+        except orjson.JSONDecodeError:
+            pass
+    if PY35 and isinstance(doc, bytes):
+        doc = doc.decode('utf8')
+    return json.loads(doc)
+
+
 def load_from_json(handle):
-    if PY35:
-        data = handle.read().decode('utf8')
-        yield json.loads(data)
-    else:
-        yield json.load(handle)
+    yield parse_json(handle.read())
 
 
 def load_from_netcdf(path):
@@ -92,7 +118,63 @@ _PARSERS = {
 }
 
 
-def load_documents(path):
+class DocumentCache(object):
+    """
+    A cache of parsed documents in a directory, keyed by a hash of the file contents.
+
+    Files are still read, but documents unchanged since an earlier run (such as when
+    re-indexing or updating datasets) don't need parsing again.
+
+    Entries are pickled, so only use a directory that is as trusted as your own code.
+    """
+    #: Change to invalidate all entries, if the documents we parse would change.
+    VERSION = b'1'
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+
+    def key(self, kind, content):
+        """
+        :param str kind: How the content is parsed (the file's suffixes)
+        :param bytes content: Contents of the file
+        """
+        return hashlib.sha256(self.VERSION + kind.encode('utf8') + b'\0' + content).hexdigest()
+
+    def _path(self, key):
+        return self.directory / key[:2] / key
+
+    def get(self, key):
+        """
+        :return: The documents, or None if they aren't cached
+        :rtype: Optional[list[dict]]
+        """
+        try:
+            with self._path(key).open('rb') as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:  # pylint: disable=broad-except
+            _LOG.debug('Ignoring unreadable cached documents %s: %s', key, e)
+            return None
+
+    def put(self, key, docs):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Written aside and moved into place, as other processes may be reading the same entry.
+        fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), prefix='.' + key)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(docs, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, str(path))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def __repr__(self):
+        return 'DocumentCache({!r})'.format(str(self.directory))
+
+
+def load_documents(path, cache=None):
     """
     Load document/s from the specified path.
 
@@ -103,6 +185,8 @@ def load_documents(path):
      - Data Cube Dataset Documents inside local NetCDF files.
 
     :param path: path or URI to load documents from
+    :param DocumentCache cache: Where to look for (and keep) already parsed documents.
+                                NetCDF files aren't cached.
     :return: generator of dicts
     """
     path = str(path)
@@ -114,19 +198,30 @@ def load_documents(path):
         path = uri_to_local_path(url)
         yield from load_from_netcdf(path)
     else:
+        if compressed:
+            path = path[:-3]
+        suffix = Path(path).suffix
+        parser = _PARSERS[suffix]
+
         with _PROTOCOL_OPENERS[scheme](url) as fh:
+            if cache is not None:
+                content = fh.read()
+                key = cache.key(suffix + ('.gz' if compressed else ''), content)
+                docs = cache.get(key)
+                if docs is None:
+                    fh = io.BytesIO(content)
+                    docs = list(parser(gzip.open(fh) if compressed else fh))
+                    cache.put(key, docs)
+                yield from docs
+                return
+
             if compressed:
                 fh = gzip.open(fh)
-                path = path[:-3]
-
-            suffix = Path(path).suffix
-
-            parser = _PARSERS[suffix]
 
             yield from parser(fh)
 
 
-def read_documents(*paths, uri=False):
+def read_documents(*paths, uri=False, cache=None):
     """
     Read and parse documents from the filesystem or remote URLs (yaml or json).
 
@@ -138,12 +233,13 @@ def read_documents(*paths, uri=False):
 
     :param uri: When True yield URIs instead of Paths
     :param paths: input Paths or URIs
+    :param DocumentCache cache: Reuse documents already parsed, by file contents (see :func:`load_documents`)
     :type uri: Bool
     :rtype: tuple[(str, dict)]
     """
 
     def process_file(path):
-        docs = load_documents(path)
+        docs = load_documents(path, cache=cache)
 
         if not uri:
             for doc in docs:
@@ -257,6 +353,12 @@ def is_supported_document_type(path):
 
 
 class NoDatesSafeLoader(SafeLoader):  # pylint: disable=too-many-ancestors
+    """
+    A safe yaml loader that leaves dates as strings.
+
+    Parsing is done by libyaml (via PyYAML's CSafeLoader) when PyYAML was built with it.
+    """
+
     @classmethod
     def remove_implicit_resolver(cls, tag_to_remove):
         """
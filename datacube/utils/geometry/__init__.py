@@ -44,6 +44,8 @@ from .tools import (
     get_scale_at_point,
     native_pix_transform,
     compute_reproject_roi,
+    reproject_roi_cache_info,
+    reproject_roi_cache_clear,
     split_translation,
     compute_axis_overlap,
     w_,
@@ -95,6 +97,8 @@ __all__ = [
     "get_scale_at_point",
     "native_pix_transform",
     "compute_reproject_roi",
+    "reproject_roi_cache_info",
+    "reproject_roi_cache_clear",
     "split_translation",
     "warp_affine",
     "rio_reproject",
@@ -89,6 +89,18 @@ def _make_crs(crs_str):
     return crs
 
 
+def _to_canonical_proj4(crs):
+    return set(crs.ExportToProj4().split() + ['+wktext'])
+
+
+@cachetools.cached({})
+def _crs_hash(crs_str):
+    # CRSs that compare equal can be described differently (EPSG code, WKT with or without
+    # authorities, proj4 text), so hash only what IsSame() requires them to have in common.
+    crs = _make_crs(crs_str)
+    return hash((crs.IsGeographic() == 1, crs.GetSemiMajor()))
+
+
 class CRS(object):
     """
     Wrapper around `osr.SpatialReference` providing a more pythonic interface
@@ -212,16 +224,19 @@ class CRS(object):
             other = CRS(other)
         elif not isinstance(other, CRS):
             return False
+        if self.crs_str == other.crs_str:
+            return True
         gdal_thinks_issame = self._crs.IsSame(other._crs) == 1  # pylint: disable=protected-access
         if gdal_thinks_issame:
             return True
 
-        def to_canonincal_proj4(crs):
-            return set(crs.ExportToProj4().split() + ['+wktext'])
         # pylint: disable=protected-access
-        proj4_repr_is_same = to_canonincal_proj4(self._crs) == to_canonincal_proj4(other._crs)
+        proj4_repr_is_same = _to_canonical_proj4(self._crs) == _to_canonical_proj4(other._crs)
         return proj4_repr_is_same
 
+    def __hash__(self):
+        return _crs_hash(self.crs_str)
+
     def __ne__(self, other):
         if isinstance(other, str):
             other = CRS(other)
@@ -946,6 +961,9 @@ class GeoBox(object):
                 and self.transform == other.transform
                 and self.crs == other.crs)
 
+    def __hash__(self):
+        return hash((self.shape, self.transform, self.crs))
+
 
 def scaled_down_geobox(src_geobox, scaler: int):
     """Given a source geobox and integer scaler compute geobox of a scaled down image.
@@ -4,6 +4,8 @@ import rasterio.crs
 import numpy as np
 from affine import Affine
 from . import GeoBox
+from .tools import is_affine_st
+from ..math import valid_mask
 
 Resampling = Union[str, int, rasterio.warp.Resampling]  # pylint: disable=invalid-name
 Nodata = Optional[Union[int, float]]  # pylint: disable=invalid-name
@@ -30,6 +32,153 @@ def is_resampling_nn(resampling: Resampling) -> bool:
     return resampling == rasterio.warp.Resampling.nearest
 
 
+def _np_resampling(resampling: Resampling) -> Optional[str]:
+    """ Map resampling to 'nearest'|'bilinear', None for anything else.
+    """
+    if is_resampling_nn(resampling):
+        return 'nearest'
+    if isinstance(resampling, str):
+        return 'bilinear' if resampling.lower() == 'bilinear' else None
+    return 'bilinear' if resampling == rasterio.warp.Resampling.bilinear else None
+
+
+def can_warp_affine_np(src: np.ndarray,
+                       dst: np.ndarray,
+                       A: Affine,
+                       resampling: Resampling) -> bool:
+    """
+    Check if :func:`warp_affine_np` can handle this case.
+
+    Supported are 2d numeric images, Scale+Translation transforms and
+    nearest or bilinear resampling, bilinear only when not shrinking
+    the image (GDAL widens the kernel when shrinking).
+    """
+    if src.ndim != 2 or dst.ndim != 2:
+        return False
+    if src.dtype.kind not in 'uif' or dst.dtype.kind not in 'uif':
+        return False
+    if not is_affine_st(A) or A.a == 0 or A.e == 0:
+        return False
+
+    mode = _np_resampling(resampling)
+    if mode == 'nearest':
+        return True
+    if mode == 'bilinear':
+        return abs(A.a) <= 1 and abs(A.e) <= 1
+    return False
+
+
+def _np_nn_index(n_dst: int, n_src: int, scale: float, offset: float):
+    """ Source pixel coordinate of every destination pixel center along one axis.
+
+    :returns: (clamped source pixel index, is index inside source, source coordinate)
+    """
+    x = (np.arange(n_dst, dtype='float64') + 0.5)*scale + offset
+    ix = np.floor(x).astype('int64')
+    ok = (ix >= 0) & (ix < n_src)
+    return np.clip(ix, 0, n_src - 1), ok, x
+
+
+def _np_bilinear_index(x: np.ndarray, n_src: int):
+    """ Neighbouring source pixels and their weights along one axis.
+
+    Out of bounds neighbours get zero weight.
+
+    :returns: [(clamped index, weight), (clamped index, weight)]
+    """
+    x = x - 0.5
+    x0 = np.floor(x).astype('int64')
+    w1 = x - x0
+    out = []
+    for ix, w in ((x0, 1 - w1), (x0 + 1, w1)):
+        ok = (ix >= 0) & (ix < n_src)
+        out.append((np.clip(ix, 0, n_src - 1), w*ok))
+    return out
+
+
+def warp_affine_np(src: np.ndarray,
+                   dst: np.ndarray,
+                   A: Affine,
+                   resampling: Resampling,
+                   src_nodata: Nodata = None,
+                   dst_nodata: Nodata = None) -> np.ndarray:
+    """
+    Perform Scale+Translation warp with nearest or bilinear resampling using numpy only.
+
+    Output is the same as :func:`warp_affine_rio`, except that valid source
+    pixels equal to ``dst_nodata`` are copied as is with nearest resampling.
+    See :func:`can_warp_affine_np` for supported cases.
+
+    :param        src: image as ndarray
+    :param        dst: image as ndarray
+    :param          A: Affine transformm, maps from dst_coords to src_coords
+    :param resampling: 'nearest'|'bilinear'
+    :param src_nodata: Value representing "no data" in the source image
+    :param dst_nodata: Value to represent "no data" in the destination image
+
+    :returns: dst
+    """
+    # pylint: disable=too-many-locals
+    assert can_warp_affine_np(src, dst, A, resampling)
+
+    if dst_nodata is None:
+        dst_nodata = src_nodata
+
+    # same as rasterio: missing pixels are set to 0 when there is no nodata value
+    fill_value = 0 if dst_nodata is None else dst_nodata
+
+    ny, nx = src.shape
+    ix, x_ok, xx = _np_nn_index(dst.shape[1], nx, A.a, A.c)
+    iy, y_ok, yy = _np_nn_index(dst.shape[0], ny, A.e, A.f)
+
+    valid = y_ok[:, None] & x_ok[None, :]
+    if src_nodata is not None:
+        # GDAL skips pixels whose "nearest" source pixel is missing, for any resampling
+        pix = src.take(iy, axis=0).take(ix, axis=1)
+        valid &= valid_mask(pix, src_nodata)
+
+    if _np_resampling(resampling) == 'nearest':
+        if src_nodata is None:
+            pix = src.take(iy, axis=0).take(ix, axis=1)
+    else:
+        xs = _np_bilinear_index(xx, nx)
+        ys = _np_bilinear_index(yy, ny)
+
+        if src_nodata is None:
+            # weights are separable, normalise them per axis to account for missing edge pixels
+            sx = xs[0][1] + xs[1][1]
+            sy = ys[0][1] + ys[1][1]
+            with np.errstate(invalid='ignore', divide='ignore'):
+                rows = sum((w/sy)[:, None]*src.take(i, axis=0) for i, w in ys)
+                pix = sum(rows.take(i, axis=1)*(w/sx) for i, w in xs)
+        else:
+            acc = np.zeros(dst.shape, dtype='float64')
+            wsum = np.zeros(dst.shape, dtype='float64')
+            for iy_, wy in ys:
+                rows = src.take(iy_, axis=0)
+                for ix_, wx in xs:
+                    v = rows.take(ix_, axis=1)
+                    ok = valid_mask(v, src_nodata)
+                    w = np.outer(wy, wx)*ok
+                    acc += w*np.where(ok, v, 0)
+                    wsum += w
+
+            valid &= wsum > 1e-5
+            with np.errstate(invalid='ignore', divide='ignore'):
+                pix = acc/wsum
+
+        if dst.dtype.kind in 'ui':
+            info = np.iinfo(dst.dtype)
+            pix = np.clip(np.floor(pix + 0.5), info.min, info.max)
+            if dst_nodata is not None:
+                # like GDAL, don't let interpolated values turn into nodata
+                pix[pix == dst_nodata] = dst_nodata + (1 if dst_nodata == info.min else -1)
+
+    dst[~valid] = fill_value
+    np.copyto(dst, pix, where=valid, casting='unsafe')
+    return dst
+
+
 def warp_affine_rio(src: np.ndarray,
                     dst: np.ndarray,
                     A: Affine,
@@ -95,7 +244,11 @@ def warp_affine(src: np.ndarray,
                 dst_nodata: Nodata = None,
                 **kwargs) -> np.ndarray:
     """
-    Perform Affine warp using best available backend (GDAL via rasterio is the only one so far).
+    Perform Affine warp using best available backend.
+
+    Scale+Translation transforms with nearest or bilinear resampling are done
+    with numpy (:func:`warp_affine_np`), everything else goes through GDAL via
+    rasterio (:func:`warp_affine_rio`).
 
     :param        src: image as ndarray
     :param        dst: image as ndarray
@@ -104,10 +257,15 @@ def warp_affine(src: np.ndarray,
     :param src_nodata: Value representing "no data" in the source image
     :param dst_nodata: Value to represent "no data" in the destination image
 
-    **kwargs -- any other args to pass to implementation
+    **kwargs -- any other args to pass to implementation, forces rasterio backend
 
     :returns: dst
     """
+    if not kwargs and can_warp_affine_np(src, dst, A, resampling):
+        return warp_affine_np(src, dst, A, resampling,
+                              src_nodata=src_nodata,
+                              dst_nodata=dst_nodata)
+
     return warp_affine_rio(src, dst, A, resampling,
                            src_nodata=src_nodata,
                            dst_nodata=dst_nodata,
@@ -1,9 +1,11 @@
 """ Geometric operations on GeoBox class
 """
 
-from typing import Optional, Tuple, Dict, Iterable
+from typing import Optional, Tuple, Dict, Iterable, List
+from collections import OrderedDict
 import itertools
 import math
+import numpy as np
 from affine import Affine
 
 from . import Geometry, GeoBox, BoundingBox
@@ -215,3 +217,73 @@ class GeoboxTiles():
             gbox = self[idx]
             if gbox.extent.intersects(poly):
                 yield idx
+
+    def ranges_from_bboxes(self, bboxes: np.ndarray) -> Tuple[np.ndarray, np.ndarray,
+                                                              np.ndarray, np.ndarray]:
+        """ Vectorised version of :meth:`range_from_bbox`
+
+        :param bboxes: ``(N, 4)`` array of ``left, bottom, right, top`` in the CRS of the tiles
+        :returns: ``(y0, y1, x0, x1)``, each an array of ``N`` integers, such that
+                  rows ``range(y0[i], y1[i])`` and columns ``range(x0[i], x1[i])``
+                  overlap with the i-th bounding box
+        """
+        sy, sx = self._tile_shape
+        A = Affine.scale(1.0/sx, 1.0/sy)*(~self._gbox.transform)
+        # A maps from X,Y in meters to chunk index
+
+        left, bottom, right, top = np.asarray(bboxes, dtype='float64').reshape(-1, 4).T
+        xx = np.stack([left, left, right, right])
+        yy = np.stack([bottom, top, bottom, top])
+        cx = A.a*xx + A.b*yy + A.c
+        cy = A.d*xx + A.e*yy + A.f
+
+        NY, NX = self.shape
+
+        def clamped(v: np.ndarray, N: int) -> np.ndarray:
+            return np.clip(v, 0, N).astype('int64')
+
+        return (clamped(np.floor(cy.min(axis=0)), NY),
+                clamped(np.ceil(cy.max(axis=0)), NY),
+                clamped(np.floor(cx.min(axis=0)), NX),
+                clamped(np.ceil(cx.max(axis=0)), NX))
+
+    def tiles_many(self, polygons: Iterable[Geometry]) -> List[List[Tuple[int, int]]]:
+        """ Same as :meth:`tiles`, but for many geometries at once.
+
+        Each distinct footprint is converted to the CRS of the tiles only once
+        and bounding box pre-filtering is done for all of them in one go. Exact
+        intersection tests are skipped for footprints that are axis aligned
+        rectangles, as all tiles within their bounding box overlap.
+
+        :returns: List of tile indexes for every input geometry
+        """
+        keys = []
+        polys = OrderedDict()  # type: Dict[Tuple[str, str], Geometry]
+
+        for polygon in polygons:
+            key = (str(polygon.crs), polygon.wkt)
+            keys.append(key)
+            if key not in polys:
+                polys[key] = polygon.to_crs(self._gbox.crs)
+
+        if len(polys) == 0:
+            return []
+
+        y0, y1, x0, x1 = self.ranges_from_bboxes(np.asarray([tuple(poly.boundingbox)
+                                                             for poly in polys.values()]))
+
+        def is_rectangle(poly: Geometry) -> bool:
+            bbox = poly.boundingbox
+            bbox_area = bbox.width*bbox.height
+            return abs(bbox_area - poly.area) <= 1e-6*bbox_area
+
+        tiles = {}
+        for i, (key, poly) in enumerate(polys.items()):
+            idxs = itertools.product(range(y0[i], y1[i]), range(x0[i], x1[i]))
+            if is_rectangle(poly):
+                tiles[key] = list(idxs)
+            else:
+                tiles[key] = [idx for idx in idxs
+                              if self[idx].extent.intersects(poly)]
+
+        return [tiles[key] for key in keys]
@@ -1,8 +1,10 @@
 import numpy as np
 import collections
+import threading
 from types import SimpleNamespace
 from typing import Tuple
 from affine import Affine
+import cachetools
 
 # This is numeric code, short names make sense in this context, so disabling
 # "invalid name" checks for the whole file
@@ -552,6 +554,54 @@ def roi_from_points(xy, shape, padding=0, align=None):
     return to_roi(yy, xx)
 
 
+RoiCacheInfo = collections.namedtuple('RoiCacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+class _ReprojectRoiCache(object):
+    """ Bounded memo cache for :func:`compute_reproject_roi`, safe to share between threads.
+
+    Gridded products read the same (src, dst) pair over and over, so it's
+    worth remembering the answer. Cached results are copied on the way out as
+    callers are allowed to modify them.
+    """
+
+    def __init__(self, maxsize):
+        self._cache = cachetools.LRUCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, src, dst, padding=None, align=None):
+        key = (src, dst, padding, align)
+
+        try:
+            with self._lock:
+                rr = self._cache[key]
+                self.hits += 1
+        except KeyError:
+            rr = _compute_reproject_roi(src, dst, padding=padding, align=align)
+            with self._lock:
+                self._cache[key] = rr
+                self.misses += 1
+        except TypeError:  # un-hashable padding/align, don't cache
+            return _compute_reproject_roi(src, dst, padding=padding, align=align)
+
+        return SimpleNamespace(**vars(rr))
+
+    def cache_info(self):
+        with self._lock:
+            return RoiCacheInfo(self.hits, self.misses, self._cache.maxsize, len(self._cache))
+
+    def cache_clear(self):
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_reproject_roi_cache = _ReprojectRoiCache(maxsize=1024)
+
+
 def compute_reproject_roi(src, dst, padding=None, align=None):
     """Given two GeoBoxes find the region within the source GeoBox that overlaps
     with the destination GeoBox, and also compute the scale factor (>1 means
@@ -594,6 +644,15 @@ def compute_reproject_roi(src, dst, padding=None, align=None):
 
     For scale direction is: "scale > 1 --> shrink src to fit dst"
 
+    Results are cached per (src, dst, padding, align), see
+    :func:`reproject_roi_cache_info`. Returned object is a fresh copy every time.
+
+    """
+    return _reproject_roi_cache(src, dst, padding=padding, align=align)
+
+
+def _compute_reproject_roi(src, dst, padding=None, align=None):
+    """ Uncached version of :func:`compute_reproject_roi`.
     """
     pts_per_side = 5
 
@@ -640,3 +699,17 @@ def compute_reproject_roi(src, dst, padding=None, align=None):
                            scale2=scale2,
                            is_st=is_st,
                            transform=tr)
+
+
+def reproject_roi_cache_info():
+    """ Hit/miss counters of the :func:`compute_reproject_roi` cache.
+
+    :returns: RoiCacheInfo(hits, misses, maxsize, currsize)
+    """
+    return _reproject_roi_cache.cache_info()
+
+
+def reproject_roi_cache_clear():
+    """ Drop all cached :func:`compute_reproject_roi` results and reset counters.
+    """
+    _reproject_roi_cache.cache_clear()
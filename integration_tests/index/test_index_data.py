@@ -198,6 +198,16 @@ def test_transactions(index: Index,
     # Should have been rolled back.
     assert not index.datasets.has(_telemetry_uuid)
 
+    # Statements prepared within a failed transaction outlive it, and are reused on its connection.
+    db = PostgresDb(initialised_postgres_db._engine, prepared_statements=True)
+    with pytest.raises(ValueError):
+        with db.begin() as transaction:
+            assert not transaction.contains_dataset(_telemetry_uuid)
+            raise ValueError('Failed transaction')
+    for _ in range(3):
+        with db.connect() as connection:
+            assert not connection.contains_dataset(_telemetry_uuid)
+
 
 def test_get_missing_things(index: Index) -> None:
     """
@@ -249,6 +259,103 @@ def test_index_dataset_with_sources(index, default_metadata_type):
         index.datasets.add(child, sources_policy=p)
 
 
+
+def test_bulk_get_with_sources(index, default_metadata_type):
+    type_ = index.products.add_document(_pseudo_telemetry_dataset_type)
+
+    parent = Dataset(type_, _telemetry_dataset.copy(), None, sources={})
+
+    def mk_child(id_):
+        doc = _telemetry_dataset.copy()
+        doc['lineage'] = {'source_datasets': {'source': _telemetry_dataset}}
+        doc['id'] = id_
+        return Dataset(type_, doc, local_uri=None, sources={'source': parent})
+
+    child_a = mk_child('051a003f-5bba-43c7-b5f1-7f1da3ae9cfb')
+    child_b = mk_child('051a003f-5bba-43c7-b5f1-7f1da3ae9cfc')
+    index.datasets.add(child_a)
+    index.datasets.add(child_b)
+
+    missing = UUID('f226a278-e422-11e6-b501-185e0f80a5c0')
+    a, b = index.datasets.bulk_get_with_sources([str(child_b.id), child_a.id, missing, child_b.id])
+    assert (a.id, b.id) == (child_b.id, child_a.id)
+    # The shared parent is fetched once.
+    assert a.sources['source'] is b.sources['source']
+    assert a.sources['source'].id == parent.id
+    assert a.metadata.sources['source'] == a.sources['source'].metadata_doc
+
+    assert index.datasets.bulk_get_with_sources([]) == []
+
+
+def test_index_many_datasets(index, default_metadata_type):
+    type_ = index.products.add_document(_pseudo_telemetry_dataset_type)
+
+    parent = Dataset(type_, _telemetry_dataset.copy(), None, sources={})
+
+    def mk_child(id_, uris):
+        doc = _telemetry_dataset.copy()
+        doc['lineage'] = {'source_datasets': {'source': _telemetry_dataset}}
+        doc['id'] = id_
+        return Dataset(type_, doc, uris=uris, sources={'source': parent})
+
+    child_a = mk_child('051a003f-5bba-43c7-b5f1-7f1da3ae9cfb', ['file:///tmp/a1.yaml', 'file:///tmp/a2.yaml'])
+    child_b = mk_child('051a003f-5bba-43c7-b5f1-7f1da3ae9cfc', None)
+
+    results = index.datasets.add_many([child_a], with_lineage=False)
+    assert len(results) == 1
+    assert isinstance(results[0].error, MissingRecordError)
+    assert results[0].failed == [child_a.id]
+    assert not index.datasets.has(child_a.id)
+
+    results = index.datasets.add_many([child_a, child_b, child_a], batch_size=2)
+    assert [(r.added, r.skipped, r.error) for r in results] == [(2, 0, None), (0, 1, None)]
+
+    for ds in (parent, child_a, child_b):
+        assert index.datasets.has(ds.id)
+
+    assert index.datasets.get(child_a.id, include_sources=True).sources['source'].id == parent.id
+    assert index.datasets.get_locations(child_a.id) == child_a.uris
+    assert index.datasets.get_locations(child_b.id) == []
+    assert index.datasets.get_locations(parent.id) == []
+    assert index.datasets.get_locations_many([child_a.id, child_b.id, parent.id]) == {child_a.id: child_a.uris}
+    assert index.datasets.get_locations_many([]) == {}
+
+
+def test_many_archive_and_locations(index, default_metadata_type):
+    type_ = index.products.add_document(_pseudo_telemetry_dataset_type)
+
+    def mk_dataset(id_, source=None):
+        doc = _telemetry_dataset.copy()
+        doc['id'] = id_
+        if source is not None:
+            doc['lineage'] = {'source_datasets': {'source': source.metadata_doc}}
+        return Dataset(type_, doc, None, sources={} if source is None else {'source': source})
+
+    parent = mk_dataset(str(_telemetry_uuid))
+    child = mk_dataset('051a003f-5bba-43c7-b5f1-7f1da3ae9cfb', parent)
+    grandchild = mk_dataset('051a003f-5bba-43c7-b5f1-7f1da3ae9cfc', child)
+    index.datasets.add(grandchild)
+
+    assert {d.id for d in index.datasets.get_all_derived([parent.id])} == {child.id, grandchild.id}
+    assert [d.id for d in index.datasets.get_all_derived([str(child.id)])] == [grandchild.id]
+    assert index.datasets.get_all_derived([grandchild.id]) == []
+
+    assert index.datasets.archive_many([parent.id, child.id, child.id], batch_size=2) == 2
+    assert index.datasets.archive_many([parent.id, grandchild.id]) == 1
+    assert index.datasets.search_eager() == []
+    assert index.datasets.restore_many([parent.id, child.id]) == 2
+    assert len(index.datasets.search_eager()) == 2
+
+    uris = ['file:///tmp/a.yaml', 'file:///tmp/b.yaml']
+    assert index.datasets.add_locations_many([(parent.id, uris[0]), (child.id, uris[0]), (parent.id, uris[1])]) == 3
+    assert index.datasets.add_locations_many([(parent.id, uris[0]), (str(child.id), uris[1])]) == 1
+    assert index.datasets.get_locations(parent.id) == uris[::-1]
+
+    assert index.datasets.remove_locations_many([(parent.id, uris[0]), (child.id, uris[0]),
+                                                 (grandchild.id, uris[0])], batch_size=2) == 2
+    assert index.datasets.get_locations(parent.id) == [uris[1]]
+    assert index.datasets.get_locations(child.id) == [uris[1]]
+
 # Make sure that both normal and s3aio index can handle normal data locations correctly
 @pytest.mark.parametrize('datacube_env_name', ('datacube', 's3aio_env',), indirect=True)
 def test_index_dataset_with_location(index: Index, default_metadata_type: MetadataType):
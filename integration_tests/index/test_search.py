@@ -21,6 +21,7 @@ import datacube.scripts.search_tool
 from datacube.config import LocalConfig
 from datacube.drivers.postgres import PostgresDb
 from datacube.drivers.postgres._connections import DEFAULT_DB_USER
+from datacube.drivers.postgres._schema import DATASET_EXTENT, DATASET_SUMMARY
 from datacube.index.index import Index
 from datacube.model import Dataset
 from datacube.model import DatasetType
@@ -357,6 +358,54 @@ def test_search_dataset_ranges(index: Index, pseudo_ls8_dataset: Dataset) -> Non
     assert len(datasets) == 0
 
 
+def test_search_dataset_extent(index: Index,
+                               initialised_postgres_db: PostgresDb,
+                               pseudo_ls8_dataset: Dataset) -> None:
+    assert initialised_postgres_db.has_extent_index
+
+    # Bounding box is maintained on insert
+    lat, lon = pseudo_ls8_dataset.metadata.lat, pseudo_ls8_dataset.metadata.lon
+    with initialised_postgres_db.connect() as connection:
+        [row] = connection.execute(DATASET_EXTENT.select()).fetchall()
+    assert str(row.dataset_ref) == str(pseudo_ls8_dataset.id)
+    assert (row.west, row.south, row.east, row.north) == pytest.approx((lon.begin, lat.begin, lon.end, lat.end))
+
+    # lat and lon are searched together through the extent box
+    inside = dict(lat=Range(lat.begin - 1, lat.begin + 0.5), lon=Range(lon.begin - 1, lon.begin + 0.5))
+    outside = dict(lat=inside['lat'], lon=Range(lon.end + 1, lon.end + 2))
+
+    datasets = index.datasets.search_eager(**inside)
+    assert [str(ds.id) for ds in datasets] == [str(pseudo_ls8_dataset.id)]
+    assert index.datasets.count(**inside) == 1
+
+    assert index.datasets.search_eager(**outside) == []
+    assert index.datasets.count(**outside) == 0
+
+    # Datasets without an extent (such as those indexed by older versions) are still found by lat and lon
+    with initialised_postgres_db.connect() as connection:
+        connection.execute(DATASET_EXTENT.delete())
+    assert [str(ds.id) for ds in index.datasets.search_eager(**inside)] == [str(pseudo_ls8_dataset.id)]
+    assert index.datasets.count(**inside) == 1
+    assert index.datasets.count(**outside) == 0
+
+    # Rebuilding from scratch gives the same result
+    with initialised_postgres_db.begin() as transaction:
+        transaction.update_dataset_extents()
+    assert index.datasets.count(**inside) == 1
+
+
+def test_dataset_extent_ingest_user(initialised_postgres_db: PostgresDb,
+                                    pseudo_ls8_dataset: Dataset) -> None:
+    # Updating a dataset replaces its extent, which ingest users are allowed to do
+    with initialised_postgres_db.begin() as transaction:
+        transaction.execute('set local role agdc_ingest')
+        transaction.update_dataset_extents([pseudo_ls8_dataset.id], replace=True)
+
+    with initialised_postgres_db.connect() as connection:
+        [row] = connection.execute(DATASET_EXTENT.select()).fetchall()
+    assert str(row.dataset_ref) == str(pseudo_ls8_dataset.id)
+
+
 def test_search_globally(index: Index, pseudo_ls8_dataset: Dataset) -> None:
     # Insert dataset. It should be matched to the telemetry collection.
     # No expressions means get all.
@@ -422,6 +471,27 @@ def test_search_limit(index, pseudo_ls8_dataset, pseudo_ls8_dataset2):
     assert len(datasets) == 2
 
 
+def test_search_fetch_size(index, pseudo_ls8_dataset, pseudo_ls8_dataset2):
+    expected = {pseudo_ls8_dataset.id, pseudo_ls8_dataset2.id}
+
+    # Server-side cursor, smaller and larger batches than the result set
+    for fetch_size in (1, 100):
+        datasets = list(index.datasets.search(fetch_size=fetch_size))
+        assert {ds.id for ds in datasets} == expected
+
+        ids = list(index.datasets.search_returning(('id',), fetch_size=fetch_size))
+        assert {r.id for r in ids} == expected
+
+    datasets = list(index.datasets.search(limit=1, fetch_size=1))
+    assert len(datasets) == 1
+
+    # Abandoning the stream part way through must release the connection cleanly
+    it = index.datasets.search(fetch_size=1)
+    next(it)
+    it.close()
+    assert index.datasets.count() == 2
+
+
 def test_search_or_expressions(index: Index,
                                pseudo_ls8_type: DatasetType,
                                pseudo_ls8_dataset: Dataset,
@@ -828,6 +898,57 @@ def test_count_by_product_searches(index: Index,
     assert products == ()
 
 
+def test_count_by_product_groups(index: Index,
+                                 indexed_ls5_scene_products: List[DatasetType],
+                                 ls5_dataset_w_children: Dataset) -> None:
+    # The LS5 scene products share a metadata type, so are counted together in one query.
+    counts = dict(index.datasets.count_by_product())
+    assert len(counts) >= 2
+    for product, count in counts.items():
+        assert index.datasets.count(product=product.name) == count
+    assert sum(counts.values()) == index.datasets.count() == len(index.datasets.search_eager())
+
+    time_range = Range(datetime.datetime(1980, 1, 1, tzinfo=tz.tzutc()),
+                       datetime.datetime(2020, 1, 1, tzinfo=tz.tzutc()))
+    timelines = dict(index.datasets.count_by_product_through_time('10 years', time=time_range))
+    assert set(timelines) == set(indexed_ls5_scene_products)
+    for product, timeline in timelines.items():
+        assert len(timeline) == 4
+        assert timeline == index.datasets.count_product_through_time('10 years',
+                                                                     product=product.name,
+                                                                     time=time_range)
+        assert sum(count for _, count in timeline) == counts.get(product, 0)
+
+
+def test_search_page(index: Index,
+                     indexed_ls5_scene_products: List[DatasetType],
+                     ls5_dataset_w_children: Dataset) -> None:
+    everything = index.datasets.search_page(None)
+    assert everything.next_token is None
+    assert len(everything.datasets) == index.datasets.count() >= 3
+
+    # Paging through two at a time gives the same datasets in the same order.
+    paged = []
+    token = None
+    while True:
+        page = index.datasets.search_page(2, after=token)
+        paged.extend(page.datasets)
+        if page.next_token is None:
+            break
+        assert len(page.datasets) == 2
+        token = page.next_token
+    assert [d.id for d in paged] == [d.id for d in everything.datasets]
+
+    with pytest.raises(ValueError):
+        index.datasets.search_page(2, after='page 2')
+
+    # Options of search() that can't be paged
+    with pytest.raises(ValueError, match='source_filter'):
+        index.datasets.search_page(2, source_filter={'product': 'ls5_level1_scene'})
+    with pytest.raises(ValueError, match='fetch_size'):
+        index.datasets.search_page(2, fetch_size=100)
+
+
 def test_count_time_groups(index: Index,
                            pseudo_ls8_type: DatasetType,
                            pseudo_ls8_dataset: Dataset) -> None:
@@ -857,6 +978,64 @@ def test_count_time_groups(index: Index,
     ]
 
 
+def test_dataset_summary(index: Index,
+                         initialised_postgres_db: PostgresDb,
+                         pseudo_ls8_type: DatasetType,
+                         pseudo_ls8_dataset: Dataset,
+                         monkeypatch) -> None:
+    assert initialised_postgres_db.has_dataset_summary
+    # Kept up to date, but only read when turned on.
+    assert not initialised_postgres_db.uses_dataset_summary
+    monkeypatch.setattr(initialised_postgres_db, '_use_dataset_summaries', True)
+
+    def summaries():
+        with initialised_postgres_db.connect() as connection:
+            return connection.execute(DATASET_SUMMARY.select()).fetchall()
+
+    # Summarised on insert
+    [row] = summaries()
+    assert row.dataset_type_ref == pseudo_ls8_type.id
+    assert row.day == datetime.date(2014, 7, 26)
+    assert row.dataset_count == 1
+    lat, lon = pseudo_ls8_dataset.metadata.lat, pseudo_ls8_dataset.metadata.lon
+    assert (row.west, row.south, row.east, row.north) == pytest.approx((lon.begin, lat.begin, lon.end, lat.end))
+
+    time_min, time_max = index.datasets.get_product_time_bounds(pseudo_ls8_type.name, active_only=True)
+    assert time_min == datetime.datetime(2014, 7, 26, 23, 48, 0, 343853, tzinfo=tz.tzutc())
+    assert time_max == datetime.datetime(2014, 7, 26, 23, 52, 0, 343853, tzinfo=tz.tzutc())
+    extent = index.datasets.get_product_extent(pseudo_ls8_type.name)
+    assert tuple(extent) == pytest.approx((lon.begin, lat.begin, lon.end, lat.end))
+
+    # Whole-day slices are counted from the summaries, others from the datasets: they agree.
+    time_range = Range(datetime.datetime(2014, 7, 25, tzinfo=tz.tzutc()),
+                       datetime.datetime(2014, 7, 27, tzinfo=tz.tzutc()))
+    by_day = index.datasets.count_product_through_time('1 day', product=pseudo_ls8_type.name, time=time_range)
+    by_hours = index.datasets.count_product_through_time('24 hours', product=pseudo_ls8_type.name, time=time_range)
+    assert by_day == by_hours
+    assert [count for _, count in by_day] == [0, 1]
+
+    # Archived datasets are removed from the summaries, and restored ones added back.
+    index.datasets.archive([pseudo_ls8_dataset.id])
+    assert summaries() == []
+    assert index.datasets.get_product_time_bounds(pseudo_ls8_type.name, active_only=True) == (None, None)
+    assert index.datasets.get_product_extent(pseudo_ls8_type.name) is None
+    # (Also without summaries)
+    with monkeypatch.context() as m:
+        m.setattr(initialised_postgres_db, '_dataset_summary', False)
+        assert tuple(index.datasets.get_product_time_bounds(pseudo_ls8_type.name,
+                                                            active_only=True)) == (None, None)
+    # Archived datasets are still included by default.
+    assert tuple(index.datasets.get_product_time_bounds(pseudo_ls8_type.name)) == (time_min, time_max)
+
+    index.datasets.restore([pseudo_ls8_dataset.id])
+    assert [tuple(row) for row in summaries()] == [tuple(row)]
+
+    # Rebuilding from scratch gives the same result
+    with initialised_postgres_db.begin() as transaction:
+        transaction.update_dataset_summaries()
+    assert [tuple(row) for row in summaries()] == [tuple(row)]
+
+
 @pytest.mark.usefixtures('ga_metadata_type',
                          'indexed_ls5_scene_products')
 def test_source_filter(clirunner, index, example_ls5_dataset_path):
@@ -186,6 +186,24 @@ def check_bad_yaml(clirunner, index):
     assert 'ERROR Failed reading documents from ' in r.output
 
 
+def check_batched_add(clirunner, index):
+    ds = SimpleDocNav(gen_dataset_test_dag(44, force_tree=True))
+
+    # Lineage first, then the dataset derived from it, which has to wait for the next batch.
+    docs = [ds.sources[x].doc for x in ('ab', 'ac', 'ae')] + [ds.doc]
+    prefix = write_files({'batch.yml': yaml.safe_dump_all(docs)})
+
+    clirunner(['dataset', 'add', '--batch-size', '10', '--jobs', '2', str(prefix / 'batch.yml')])
+
+    ds_ = index.datasets.get(ds.id, include_sources=True)
+    assert ds_ is not None
+    assert str(ds_.sources['ab'].id) == ds.sources['ab'].id
+    assert str(ds_.sources['ac'].sources['cd'].id) == ds.sources['ac'].sources['cd'].id
+
+    r = clirunner(['dataset', 'add', '--batch-size', '10', str(prefix / 'batch.yml')])
+    assert 'Dataset {} is already in the database'.format(ds.id) in r.output
+
+
 def test_dataset_add(dataset_add_configs, index_empty, clirunner):
     p = dataset_add_configs
     index = index_empty
@@ -231,6 +249,7 @@ def test_dataset_add(dataset_add_configs, index_empty, clirunner):
     check_missing_lineage(clirunner, index)
     check_no_confirm(clirunner, p.datasets)
     check_bad_yaml(clirunner, index)
+    check_batched_add(clirunner, index)
 
     # check --product=nosuchproduct
     r = clirunner(['dataset', 'add', '--product', 'nosuchproduct', p.datasets],
@@ -1,4 +1,5 @@
 import pytest
+from dateutil import tz
 from pathlib import PosixPath
 
 from integration_tests.test_full_ingestion import ensure_datasets_are_indexed
@@ -96,6 +97,32 @@ def test_index_datasets_search_light(index, tmpdir, clirunner,
     assert len(results_with_uri[0].uri) == 2
 
 
+@pytest.mark.parametrize('datacube_env_name', ('datacube',), indirect=True)
+@pytest.mark.usefixtures('default_metadata_type',
+                         'indexed_ls5_scene_products')
+def test_index_datasets_search_for_load(index, clirunner, example_ls5_dataset_paths):
+    for ls5_dataset_path in example_ls5_dataset_paths.values():
+        clirunner(['dataset', 'add', str(ls5_dataset_path)])
+    ensure_datasets_are_indexed(index, list(example_ls5_dataset_paths))
+
+    datasets = {ds.id: ds for ds in index.datasets.search(product='ls5_nbar_scene')}
+    records = list(index.datasets.search_for_load(product='ls5_nbar_scene'))
+    assert len(records) == len(datasets) > 0
+
+    for record in records:
+        ds = datasets[record.id]
+        assert record.type.name == 'ls5_nbar_scene'
+        assert record.uris == ds.uris
+        assert record.format == ds.format
+        assert record.measurements == ds.measurements
+        assert record.crs == ds.crs
+        assert record.extent.boundingbox == ds.extent.boundingbox
+        # Times come back from the database in the session time zone
+        assert record.center_time == ds.center_time.replace(tzinfo=ds.center_time.tzinfo or tz.tzutc())
+
+    assert len(list(index.datasets.search_for_load(product='ls5_nbar_scene', limit=1))) == 1
+
+
 @pytest.mark.parametrize('datacube_env_name', ('datacube',), indirect=True)
 @pytest.mark.usefixtures('default_metadata_type',
                          'indexed_ls5_scene_products')
@@ -18,13 +18,14 @@ tests_require = [
 ]
 
 extras_require = {
-    'performance': ['ciso8601', 'bottleneck'],
+    'performance': ['ciso8601', 'bottleneck', 'orjson'],
     'interactive': ['matplotlib', 'fiona'],
     'distributed': ['distributed', 'dask[distributed]'],
     'doc': ['Sphinx', 'setuptools'],
     'replicas': ['paramiko', 'sshtunnel', 'tqdm'],
     'celery': ['celery>=4', 'redis'],
     's3': ['boto3', 'SharedArray', 'pathos', 'zstandard'],
+    'async': ['asyncpg'],
     'test': tests_require,
 }
 # An 'all' option, following ipython naming conventions.
@@ -133,6 +134,7 @@ setup(
         ],
         'datacube.plugins.index': [
             'default = datacube.index.index:index_driver_init',
+            'asyncpg = datacube.index.async_index:index_driver_init [async]',
             *extra_plugins['index'],
         ],
     },
@@ -90,3 +90,180 @@ def test_dask_chunks():
 
     with pytest.raises(KeyError):
         _calculate_chunk_sizes(sources, geobox, {'zz': 1})
+
+
+def test_lazy_load_graph():
+    from collections import OrderedDict
+    from dask import array as da
+    from datacube.api.core import _LazyLoadGraph, _make_dask_array, _tokenize_dataset
+    from datacube.model import Measurement
+    from datacube.utils.geometry.gbox import GeoboxTiles
+
+    gbox = AlbersGS.tile_geobox((0, 0))[:6, :7]
+    gbt = GeoboxTiles(gbox, (4, 4))
+    assert gbt.shape == (2, 2)
+
+    ds1 = SimpleNamespace(id=UUID(int=1))
+    ds2 = SimpleNamespace(id=UUID(int=2))
+    dsk = OrderedDict((_tokenize_dataset(ds), ds) for ds in (ds1, ds2))
+
+    chunked = np.empty(3, dtype=object)
+    chunked[0] = {(0, 0): [ds1], (1, 1): [ds1, ds2]}
+    chunked[1] = {}
+    chunked[2] = {(0, 1): [ds2]}
+    chunked_srcs = xr.DataArray(chunked, dims=('time',), coords={'time': np.arange(3)})
+
+    m = Measurement(name='a', dtype='int16', nodata=-1, units='1')
+    graph = _LazyLoadGraph('xx', chunked_srcs, dsk, gbt, m)
+
+    assert len(graph) == 2 + 3*2*2
+    assert len(list(graph)) == len(graph)
+    assert list(graph)[:2] == list(dsk)
+    assert ('xx', 2, 1, 1) in graph
+    assert ('xx', 3, 0, 0) not in graph
+    assert ('yy', 0, 0, 0) not in graph
+    assert ('xx', 0, 0) not in graph
+    assert graph[_tokenize_dataset(ds2)] is ds2
+
+    task = graph[('xx', 0, 1, 1)]
+    assert task[1] == [_tokenize_dataset(ds1), _tokenize_dataset(ds2)]
+    assert task[2] == gbt[1, 1]
+    assert task[-1] == 1
+
+    empty = graph[('xx', 1, 1, 0)]
+    assert empty[1:] == ((1, 2, 4), -1, 'int16')
+
+    xx = _make_dask_array(chunked_srcs, dsk, gbt, m, chunks=(1, 4, 4))
+    assert isinstance(xx, da.Array)
+    assert xx.shape == (3, 6, 7)
+    assert xx.chunks == ((1, 1, 1), (4, 2), (4, 3))
+    assert (xx[1].compute() == -1).all()
+
+
+def test_fused_band_graph(monkeypatch):
+    from collections import OrderedDict
+    import dask
+    from dask.array.core import getter_inline
+    from datacube.api import core
+    from datacube.api.core import _LazyFusedBandGraph, _make_fused_dask_arrays, _tokenize_dataset
+    from datacube.model import Measurement
+    from datacube.utils.geometry.gbox import GeoboxTiles
+
+    gbox = AlbersGS.tile_geobox((0, 0))[:6, :7]
+    gbt = GeoboxTiles(gbox, (4, 4))
+
+    ds1 = SimpleNamespace(id=UUID(int=1))
+    ds2 = SimpleNamespace(id=UUID(int=2))
+    dsk = OrderedDict((_tokenize_dataset(ds), ds) for ds in (ds1, ds2))
+
+    chunked = np.empty(2, dtype=object)
+    chunked[0] = {(0, 0): [ds1], (1, 1): [ds1, ds2]}
+    chunked[1] = {}
+    chunked_srcs = xr.DataArray(chunked, dims=('time',), coords={'time': np.arange(2)})
+
+    mm = [Measurement(name=n, dtype='int16', nodata=-1, units='1') for n in ('a', 'b', 'c')]
+    graph = _LazyFusedBandGraph('b', 'ff', 1, chunked_srcs, dsk, gbt, mm)
+
+    assert len(graph) == 2 + 2*2*2 + 2
+    assert len(list(graph)) == len(graph)
+    assert ('ff', 0, 1, 1) in graph
+    assert ('ff', 0, 0, 1) not in graph
+    assert ('ff', 1, 0, 0) not in graph
+
+    assert graph[('b', 0, 1, 1)] == (getter_inline, ('ff', 0, 1, 1), 1)
+    assert graph[('b', 1, 0, 0)][1:] == ((1, 4, 4), -1, 'int16')
+
+    task = graph[('ff', 0, 1, 1)]
+    assert task[1] == [_tokenize_dataset(ds1), _tokenize_dataset(ds2)]
+    assert task[2] == gbt[1, 1]
+    assert task[3] == mm
+
+    calls = []
+
+    def fake_fuse_lazy_many(datasets, geobox, measurements, skip_broken_datasets=False, prepend_dims=0):
+        calls.append(tuple(ds.id.int for ds in datasets))
+        return tuple(np.full((1,)*prepend_dims + geobox.shape, len(datasets), dtype=m.dtype)
+                     for m in measurements)
+
+    monkeypatch.setattr(core, 'fuse_lazy_many', fake_fuse_lazy_many)
+
+    arrays = _make_fused_dask_arrays(chunked_srcs, dsk, gbt, mm, chunks=(1, 4, 4))
+    assert list(arrays) == ['a', 'b', 'c']
+
+    a, b, c = dask.compute(*arrays.values(), scheduler='sync')
+    assert a.shape == (2, 6, 7)
+    assert (a == b).all() and (b == c).all()
+    assert (a[0, :4, :4] == 1).all()
+    assert (a[0, 4:, 4:] == 2).all()
+    assert (a[0, :4, 4:] == -1).all()
+    assert (a[1] == -1).all()
+
+    # all bands are loaded by one call per non-empty chunk
+    assert sorted(calls) == [(1,), (1, 2)]
+
+    # band selection is inlined into consumers, leaving just the fused loads as tasks
+    total = arrays['a'] + arrays['b'] + arrays['c']
+    dsk = total.__dask_optimize__(dict(total.__dask_graph__()), total.__dask_keys__())
+    tasks = [v for v in dsk.values() if isinstance(v, tuple) and callable(v[0])]
+    assert not any(t[0] is getter_inline for t in tasks)
+    assert sum(t[0] is fake_fuse_lazy_many for t in tasks) == 2
+
+
+def test_load_iter(monkeypatch):
+    import threading
+    from datacube.api.core import _prefetch_map
+
+    gbox = AlbersGS.tile_geobox((0, 0))[:6, :7]
+    product = SimpleNamespace(grid_spec=None,
+                              lookup_measurements=lambda measurements: ['m'])
+    index = SimpleNamespace(products=SimpleNamespace(get_by_name=lambda name: product))
+
+    datasets = [SimpleNamespace(center_time=datetime.datetime(2018, 1, d), id=UUID(int=d))
+                for d in (5, 1, 3, 2, 4)]
+
+    calls = []
+
+    def fake_load_data(sources, geobox, measurements, **kwargs):
+        calls.append(threading.current_thread())
+        assert geobox is gbox
+        assert measurements == ['m']
+        return xr.Dataset({'ids': ('time', [dss[0].id.int for dss in sources.values])},
+                          coords={'time': sources.time})
+
+    monkeypatch.setattr(Datacube, 'load_data', staticmethod(fake_load_data))
+    dc = Datacube(index=index)
+
+    blocks = list(dc.load_iter('p', datasets=datasets, like=SimpleNamespace(geobox=gbox), time_chunk=2))
+    assert [list(b.ids.values) for b in blocks] == [[1, 2], [3, 4], [5]]
+    assert threading.current_thread() not in calls
+
+    calls.clear()
+    blocks = dc.load_iter('p', datasets=datasets, like=SimpleNamespace(geobox=gbox), time_chunk=3, prefetch=False)
+    assert [list(b.ids.values) for b in blocks] == [[1, 2, 3], [4, 5]]
+    assert calls == [threading.current_thread()]*2
+
+    with pytest.raises(ValueError):
+        list(dc.load_iter('p', datasets=datasets, time_chunk=0))
+
+    # same argument handling as load()
+    with pytest.raises(DeprecationWarning):
+        list(dc.load_iter('p', datasets=datasets, like=SimpleNamespace(geobox=gbox), stack='time'))
+
+    extra = []
+    monkeypatch.setattr(Datacube, 'load_data',
+                        staticmethod(lambda *args, **kwargs: extra.append(kwargs) or fake_load_data(*args)))
+    list(dc.load_iter('p', datasets=datasets, like=SimpleNamespace(geobox=gbox), time_chunk=5, use_threads=True))
+    assert extra[0]['use_threads'] is True
+
+    # errors from background thread end up with the caller
+    def bad(x):
+        if x == 2:
+            raise IOError('bad')
+        return x
+
+    xx = _prefetch_map(bad, [(0,), (1,), (2,), (3,)])
+    assert next(xx) == 0
+    assert next(xx) == 1
+    with pytest.raises(IOError):
+        next(xx)
+    assert list(_prefetch_map(bad, [])) == []
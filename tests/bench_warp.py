@@ -0,0 +1,53 @@
+""" Throughput of warp_affine backends.
+
+Run with::
+
+   python -m tests.bench_warp
+
+"""
+import timeit
+import numpy as np
+from affine import Affine
+
+from datacube.utils.geometry._warp import warp_affine_np, warp_affine_rio
+
+
+def bench_warp_affine(sizes=(64, 256, 1024), dtype='int16', nodata=-999, number=10):
+    """ Time both backends on a few common Scale+Translation warps.
+
+    :returns: [(size, name, resampling, rio seconds per call, numpy seconds per call)]
+    """
+    cases = [('shift', 'nearest', Affine.translation(7, -3)),
+             ('subpixel', 'bilinear', Affine.translation(3.3, 4.1)),
+             ('zoom-in', 'bilinear', Affine.translation(2.5, 1.5)*Affine.scale(0.5)),
+             ('zoom-out', 'nearest', Affine.scale(2.5))]
+
+    rng = np.random.RandomState(0)
+    out = []
+
+    for n in sizes:
+        src = rng.randint(0, 10000, size=(3*n, 3*n)).astype(dtype)
+        src[::17, ::13] = nodata
+        dst = np.empty((n, n), dtype=dtype)
+
+        for name, resampling, A in cases:
+            def run(warp):
+                return min(timeit.repeat(lambda: warp(src, dst, A, resampling,
+                                                      src_nodata=nodata, dst_nodata=nodata),
+                                         number=number, repeat=3))/number
+
+            out.append((n, name, resampling, run(warp_affine_rio), run(warp_affine_np)))
+
+    return out
+
+
+def main():
+    print('{:>6} {:>10} {:>10} {:>10} {:>10} {:>8}'.format('size', 'case', 'resampling',
+                                                         'rio ms', 'numpy ms', 'speedup'))
+    for n, name, resampling, t_rio, t_np in bench_warp_affine():
+        print('{:6d} {:>10} {:>10} {:10.3f} {:10.3f} {:8.1f}'.format(n, name, resampling,
+                                                                     t_rio*1e3, t_np*1e3, t_rio/t_np))
+
+
+if __name__ == '__main__':
+    main()
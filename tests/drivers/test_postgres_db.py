@@ -0,0 +1,149 @@
+# coding=utf-8
+from sqlalchemy import String, bindparam, column, select, table
+from sqlalchemy.dialects.postgresql import psycopg2
+
+from datacube.drivers.postgres import _api
+from datacube.drivers.postgres._connections import PostgresDb, _as_bool
+
+
+class MockConnection(object):
+    def __init__(self):
+        self.dialect = psycopg2.dialect()
+        # The DBAPI connection
+        self.connection = self
+        self.info = {}
+        self.executed = []
+
+    def execution_options(self, **options):
+        assert options == {'no_parameters': True}
+        return self
+
+    def execute(self, statement):
+        self.executed.append(statement)
+
+
+def test_prepared_query():
+    thing = table('thing', column('id'), column('name'))
+    query = _api._PreparedQuery(
+        'get_thing',
+        select([thing.c.name + '%']).where(
+            (thing.c.id == bindparam('id')) | (thing.c.name == bindparam('name', type_=String))
+        )
+    )
+
+    connection = MockConnection()
+    query.execute(connection, id=5, name='ls8')
+    query.execute(connection, id=6, name='ls7')
+
+    prepare, first, second = connection.executed
+    # Prepared only once per connection, with numbered parameters.
+    assert prepare == ('PREPARE get_thing AS SELECT thing.name || $1 AS anon_1 \nFROM thing \n'
+                       'WHERE thing.id = $2 OR thing.name = $3')
+    assert str(first) == 'EXECUTE get_thing(:name_1, :id, :name)'
+    assert first.compile().params == {'name_1': '%', 'id': 5, 'name': 'ls8'}
+    assert second.compile().params == {'name_1': '%', 'id': 6, 'name': 'ls7'}
+
+    # A rollback doesn't remove prepared statements, so it isn't prepared again afterwards.
+    api = _api.PostgresDbAPI(connection, prepared_statements=True)
+    api.rollback()
+    query.execute(connection, id=7, name='ls5')
+    assert [str(statement) for statement in connection.executed[3:]] == ['ROLLBACK',
+                                                                         'EXECUTE get_thing(:name_1, :id, :name)']
+
+    # Only a new connection prepares it again.
+    connection = MockConnection()
+    query.execute(connection, id=8, name='ls5')
+    assert connection.executed[0] == prepare
+
+
+def test_pool_settings():
+    db = PostgresDb.from_config(
+        {
+            'db_hostname': 'localhost',
+            'db_database': 'pool_test',
+            'db_pool_size': '3',
+            'db_max_overflow': '7',
+            'db_prepared_statements': 'yes',
+            'db_dataset_summaries': 'yes',
+        },
+        validate_connection=False
+    )
+    assert db._prepared_statements is True
+    assert db._use_dataset_summaries is True
+
+    metrics = db.pool_metrics()
+    assert metrics.size == 3
+    assert metrics.checked_out == 0
+    assert metrics.checkouts == 0
+    assert db._engine.pool._max_overflow == 7
+
+    # Off unless asked for, as they don't work through poolers such as pgbouncer.
+    db = PostgresDb.from_config({'db_hostname': 'localhost', 'db_database': 'pool_test'}, validate_connection=False)
+    assert db._prepared_statements is False
+    # Other clients may not keep the summaries up to date.
+    assert db._use_dataset_summaries is False
+
+
+def test_as_bool():
+    assert _as_bool('false') is False
+    assert _as_bool('Off') is False
+    assert _as_bool('yes') is True
+    assert _as_bool(True) is True
+
+
+class MockStreamConnection(object):
+    def __init__(self, transaction_status=0, engine=None):
+        self.connection = self
+        self.engine = engine
+        self.transaction_status = transaction_status
+        self.options = []
+        self.closed = False
+
+    def in_transaction(self):
+        return False
+
+    def get_transaction_status(self):
+        return self.transaction_status
+
+    def execution_options(self, **options):
+        self.options.append(options)
+        return self
+
+    def execute(self, query):
+        rows = [(1,), (2,), (3,)]
+
+        class Result(object):
+            def fetchmany(self, size):
+                batch = rows[:size]
+                del rows[:size]
+                return batch
+
+            def close(self):
+                pass
+
+        return Result()
+
+    def connect(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.closed = True
+
+
+def test_stream_results():
+    # Outside a transaction the connection itself streams.
+    connection = MockStreamConnection()
+    api = _api.PostgresDbAPI(connection)
+    assert list(api._stream_results('query', 2)) == [(1,), (2,), (3,)]
+    assert connection.options == [dict(isolation_level='READ COMMITTED', stream_results=True, max_row_buffer=2)]
+
+    # Inside db.begin()'s transaction, another connection streams, so the transaction is left alone.
+    other = MockStreamConnection()
+    connection = MockStreamConnection(transaction_status=2, engine=other)
+    api = _api.PostgresDbAPI(connection)
+    assert list(api._stream_results('query', 2)) == [(1,), (2,), (3,)]
+    assert connection.options == []
+    assert other.options and other.closed
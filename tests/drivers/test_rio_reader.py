@@ -10,6 +10,7 @@ import warnings
 
 from datacube.drivers.rio._reader import (
     RDEntry,
+    RIOLoadContext,
     _dc_crs,
     _rio_uri,
     _rio_band_idx,
@@ -209,6 +210,49 @@ def test_rio_driver_open(data_folder):
     assert src.nodata == bi.nodata
 
 
+def test_rio_load_context(data_folder):
+    base = "file://" + str(data_folder) + "/metadata.yml"
+
+    rdr = RDEntry().new_instance({'max_open_files': 1})
+    ctx = rdr.new_load_context(iter([]), None)
+    assert isinstance(ctx, RIOLoadContext)
+    assert ctx.max_open_files == 1
+    assert len(ctx) == 0
+
+    # context is recycled between loads
+    assert rdr.new_load_context(iter([]), ctx) is ctx
+    assert rdr.new_load_context(iter([]), object()) is not ctx
+
+    bi_a = mk_band('a', base, path="test.tif", format=GeoTIFF)
+    bi_b = mk_band('b', base, path="test.tif", format=GeoTIFF, band=2)
+
+    src_a = rdr.open(bi_a, ctx).result()
+    src_b = rdr.open(bi_b, ctx).result()
+    assert len(ctx) == 1
+    assert _rio_uri(bi_a) in ctx
+    assert src_a._src is src_b._src
+    assert src_a._lock is src_b._lock
+
+    xx = src_b.read().result()
+    assert xx.shape == src_b.shape
+
+    # LRU eviction: older handle is dropped from the cache, but stays usable
+    bi_c = mk_band('c', base, path="sample_tile_151_-29.tif", format=GeoTIFF)
+    src_c = rdr.open(bi_c, ctx).result()
+    assert len(ctx) == 1
+    assert _rio_uri(bi_c) in ctx
+    assert _rio_uri(bi_a) not in ctx
+    assert src_c._src is not src_a._src
+    assert src_a.read().result().shape == src_a.shape
+
+    ctx.close()
+    assert len(ctx) == 0
+
+    with pytest.raises(IOError):
+        ctx.open('/this-file-hopefully/doesnot/exist-4718193.tiff')
+    assert len(ctx) == 0
+
+
 def test_testutils_iodriver(data_folder):
     fpath = str(data_folder) + '/test.tif'
     src = open_reader(fpath)
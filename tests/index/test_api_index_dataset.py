@@ -201,6 +201,23 @@ class MockDb(object):
     def insert_dataset_source(self, classifier, dataset_id, source_dataset_id):
         self.dataset_source.add((classifier, dataset_id, source_dataset_id))
 
+    def insert_datasets_bulk(self, rows):
+        inserted = set()
+        for metadata_doc, dataset_id, dataset_type_id in rows:
+            if dataset_id not in self.dataset:
+                self.insert_dataset(metadata_doc, dataset_id, dataset_type_id)
+                inserted.add(dataset_id)
+        return inserted
+
+    def insert_dataset_sources_bulk(self, edges):
+        edges = set(edges) - self.dataset_source
+        self.dataset_source.update(edges)
+        return len(edges)
+
+    def insert_dataset_locations_bulk(self, locations):
+        self.locations = getattr(self, 'locations', []) + list(locations)
+        return len(self.locations)
+
 
 class MockTypesResource(object):
     def __init__(self, type_):
@@ -265,3 +282,241 @@ def test_index_two_levels_already_ingested():
     dataset = datasets.add(_EXAMPLE_NBAR_DATASET)
     assert len(mock_db.dataset) == 3
     assert len(mock_db.dataset_source) == 2
+
+
+def test_index_many_datasets():
+    mock_db = MockDb()
+    mock_types = MockTypesResource(_EXAMPLE_DATASET_TYPE)
+    datasets = DatasetResource(mock_db, mock_types)
+
+    ortho = _EXAMPLE_NBAR_DATASET.sources['ortho']
+    results = datasets.add_many([ortho, _EXAMPLE_NBAR_DATASET, ortho], batch_size=2)
+
+    assert [(r.added, r.skipped, r.error) for r in results] == [(2, 0, None), (0, 1, None)]
+    assert set(mock_db.dataset) == {_nbar_uuid, _ortho_uuid, _telemetry_uuid}
+    assert mock_db.dataset_source == {
+        ('ortho', _nbar_uuid, _ortho_uuid),
+        ('satellite_telemetry_data', _ortho_uuid, _telemetry_uuid)
+    }
+    # only top-level datasets get locations
+    assert sorted(mock_db.locations) == sorted([(_nbar_uuid, 'file://test.zzz'),
+                                                (_ortho_uuid, 'file://test.zzz')])
+
+    # Nothing ingested, all already present
+    results = datasets.add_many([_EXAMPLE_NBAR_DATASET])
+    assert [(r.added, r.skipped) for r in results] == [(0, 1)]
+    assert len(mock_db.dataset) == 3
+
+    # Failed batches are reported, others still go through
+    mock_db = MockDb()
+    datasets = DatasetResource(mock_db, mock_types)
+
+    def fail_on_nbar(rows):
+        rows = list(rows)
+        if any(dataset_id == _nbar_uuid for _, dataset_id, _ in rows):
+            raise IOError('db is down')
+        return MockDb.insert_datasets_bulk(mock_db, rows)
+
+    mock_db.insert_datasets_bulk = fail_on_nbar
+
+    results = datasets.add_many([_EXAMPLE_NBAR_DATASET, ortho], batch_size=1)
+    assert results[0].failed == [_nbar_uuid]
+    assert isinstance(results[0].error, IOError)
+    assert results[1] == (1, 0, [], None)
+    assert set(mock_db.dataset) == {_ortho_uuid, _telemetry_uuid}
+
+
+def test_dataset_record():
+    from psycopg2.extras import DateTimeTZRange
+    from datacube.index._datasets import DatasetRecord
+    from datacube.storage import BandInfo, measurement_paths
+    from datacube.testutils import mk_sample_dataset
+    from datacube.api.query import query_group_by
+    from datacube.api.core import Datacube
+
+    ds = mk_sample_dataset([dict(name='red', path='red.tif', dtype='int16', nodata=-999, units='1')],
+                           uri='file:///tmp/ds/agdc-metadata.yaml',
+                           timestamp='2018-06-29T10:00:00+00:00')
+    ds.metadata_doc['grid_spatial'] = {'projection': {
+        'spatial_reference': 'EPSG:3577',
+        'geo_ref_points': {'ul': {'x': 0, 'y': 100},
+                           'ur': {'x': 100, 'y': 100},
+                           'll': {'x': 0, 'y': 0},
+                           'lr': {'x': 100, 'y': 0}}}}
+
+    # As returned by the database for search_for_load()
+    row = dict(id=ds.id,
+               uris=ds.uris + [None],
+               format='GeoTiff',
+               grid_spatial=ds.metadata_doc['grid_spatial']['projection'],
+               measurements=ds.metadata_doc['image']['bands'],
+               time=DateTimeTZRange(ds.time.begin, ds.time.end, '[]'))
+    record = DatasetResource._make_record(row, ds.type)
+
+    assert isinstance(record, DatasetRecord)
+    assert not hasattr(record, '__dict__')
+    assert record == ds
+    assert hash(record) == hash(ds)
+    assert record.uris == ds.uris
+    assert record.local_uri == ds.local_uri
+    assert record.format == ds.format
+    assert record.center_time == ds.center_time
+    assert record.crs == ds.crs
+    assert record.transform == ds.transform
+    assert record.bounds == ds.bounds
+    assert record.extent.boundingbox == ds.extent.boundingbox
+    assert record.extent is record.extent
+    assert record.metadata.time == record.time
+    assert not hasattr(record.metadata, 'lon')
+
+    assert measurement_paths(record) == measurement_paths(ds)
+    for name in ('name', 'uri', 'band', 'layer', 'dtype', 'nodata', 'crs', 'transform', 'center_time', 'format'):
+        assert getattr(BandInfo(record, 'red'), name) == getattr(BandInfo(ds, 'red'), name)
+
+    grouped = Datacube.group_datasets([record], query_group_by())
+    assert grouped.values[0] == (record,)
+
+    # Missing parts of the document
+    record = DatasetResource._make_record(dict(id=ds.id, time=DateTimeTZRange(None, None)), ds.type)
+    assert record.uris == []
+    assert record.measurements == {}
+    assert record.time is None
+    assert record.center_time is None
+    assert record.crs is None
+    assert record.extent is None
+
+
+def test_search_returning_columns(monkeypatch):
+    from psycopg2.extras import NumericRange
+    from datacube.drivers.postgres._api import get_dataset_fields
+
+    # Paths are missing from the later rows, so from a whole batch
+    rows = [(UUID(int=i), 'LANDSAT_8', NumericRange(i, i + 1) if i < 2 else None) for i in range(5)]
+    searched = []
+
+    def search_by_product(query, **kwargs):
+        searched.append(kwargs)
+        # Two products, second has no results
+        return [(None, iter(rows[:3])), (None, iter(rows[3:])), (None, iter([]))]
+
+    definition = deepcopy(_EXAMPLE_METADATA_TYPE.definition)
+    definition['dataset']['search_fields'] = {
+        'platform': {'offset': ['platform', 'code']},
+        'sat_path': {'type': 'integer-range', 'min_offset': [['path', 'begin']], 'max_offset': [['path', 'end']]},
+    }
+    product = DatasetType(MetadataType(definition, dataset_search_fields=get_dataset_fields(definition)),
+                          {'name': 'ls8', 'description': '', 'metadata_type': 'eo', 'metadata': {}})
+
+    class Types(MockTypesResource):
+        def search_robust(self, **query):
+            yield product, query
+
+    datasets = DatasetResource(MockDb(), Types(None))
+    monkeypatch.setattr(datasets, '_do_search_by_product', search_by_product)
+    field_names = ('id', 'platform', 'sat_path')
+
+    df = datasets.search_returning_columns(field_names, fetch_size=2, platform='LANDSAT_8')
+    assert list(df.columns) == list(field_names)
+    assert len(df) == 5
+    assert list(df.id) == [r[0] for r in rows]
+    assert list(df.sat_path) == [r[2] for r in rows]
+    assert searched[0]['fetch_size'] == 2
+    assert searched[0]['select_field_names'] == field_names
+
+    pyarrow = pytest.importorskip('pyarrow')
+    table = datasets.search_returning_columns(field_names, fetch_size=2, as_arrow=True)
+    assert isinstance(table, pyarrow.Table)
+    assert table.column_names == list(field_names)
+    assert table.num_rows == 5
+    assert table.column('id').to_pylist() == [str(r[0]) for r in rows]
+    assert table.column('sat_path').to_pylist() == [{'lower': 0, 'upper': 1}, {'lower': 1, 'upper': 2},
+                                                    None, None, None]
+    assert table.schema.field('sat_path').type == pyarrow.struct([('lower', pyarrow.int64()),
+                                                                  ('upper', pyarrow.int64())])
+
+    monkeypatch.setattr(datasets, '_do_search_by_product', lambda query, **kwargs: [])
+    assert len(datasets.search_returning_columns(field_names)) == 0
+    table = datasets.search_returning_columns(field_names, as_arrow=True)
+    assert table.num_rows == 0
+    assert table.schema.field('platform').type == pyarrow.string()
+
+
+def test_product_query_groups():
+    other_metadata_type = MetadataType({'name': 'telemetry', 'dataset': {}}, dataset_search_fields={})
+
+    def product(id_, name, metadata_type=_EXAMPLE_METADATA_TYPE):
+        return DatasetType(metadata_type, {'name': name, 'description': '', 'metadata_type': metadata_type.name,
+                                           'metadata': {}}, id_=id_)
+
+    ls5, ls7, ls8, telemetry = (product(1, 'ls5'), product(2, 'ls7'), product(3, 'ls8'),
+                                product(4, 'telemetry', other_metadata_type))
+
+    class SearchableTypes(MockTypesResource):
+        def search_robust(self, **query):
+            # ls7 matched the 'gsi' term on its own product metadata
+            yield ls5, {'gsi': 'ASA'}
+            yield ls7, {}
+            yield ls8, {'gsi': 'ASA'}
+            yield telemetry, {'gsi': 'ASA'}
+
+    datasets = DatasetResource(MockDb(), SearchableTypes(None))
+    groups = list(datasets._get_product_query_groups({'gsi': 'ASA'}))
+    assert groups == [
+        ({'gsi': 'ASA', 'dataset_type_id': [1, 3]}, [ls5, ls8]),
+        ({'dataset_type_id': 2}, [ls7]),
+        ({'gsi': 'ASA', 'dataset_type_id': 4}, [telemetry]),
+    ]
+
+
+def test_search_by_product_streams():
+    from datacube.drivers.postgres._api import get_dataset_fields
+
+    definition = deepcopy(_EXAMPLE_METADATA_TYPE.definition)
+    definition['dataset']['search_fields'] = {}
+    metadata_type = MetadataType(definition, dataset_search_fields=get_dataset_fields(definition))
+    ls5, ls7, ls8 = [DatasetType(metadata_type, {'name': name, 'description': '', 'metadata_type': 'eo',
+                                                 'metadata': {}}, id_=id_)
+                     for id_, name in ((1, 'ls5'), (2, 'ls7'), (3, 'ls8'))]
+
+    class Types(MockTypesResource):
+        def search_robust(self, **query):
+            for product in (ls8, ls5, ls7):
+                yield product, {}
+
+    Row = namedtuple('Row', ['id', 'dataset_type_ref'])
+    rows = [Row(UUID(int=i), ref) for i, ref in enumerate((1, 1, 3, 3, 3))]
+    read, searches = [], []
+
+    class Db(MockDb):
+        def search_datasets(self, expressions, source_exprs=None, select_fields=None, limit=None, **kwargs):
+            searches.append(limit)
+            return (read.append(row.id) or row for row in rows)
+
+    datasets = DatasetResource(Db(), Types(None))
+
+    # One query for all products, read one product at a time
+    results = datasets._do_search_by_product({}, by_product=True)
+    product, found = next(results)
+    assert product is ls5 and len(read) == 3
+    assert [row.id for row in found] == [UUID(int=0), UUID(int=1)]
+
+    product, found = next(results)
+    assert product is ls7 and list(found) == []
+    product, found = next(results)
+    assert product is ls8 and [row.id for row in found] == [UUID(int=i) for i in (2, 3, 4)]
+    assert list(results) == []
+    assert searches == [None]
+
+    # The pairs can be collected before any results are read
+    del searches[:]
+    collected = list(datasets._do_search_by_product({}, by_product=True))
+    assert [product for product, _ in collected] == [ls5, ls7, ls8]
+    assert [[row.id for row in found] for _, found in collected] == [
+        [UUID(int=0), UUID(int=1)], [], [UUID(int=i) for i in (2, 3, 4)]
+    ]
+    assert searches == [None]
+
+    # The limit applies to each product
+    del searches[:]
+    assert [product for product, _ in datasets._do_search_by_product({}, limit=2)] == [ls8, ls5, ls7]
+    assert searches == [2, 2, 2]
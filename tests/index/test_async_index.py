@@ -0,0 +1,112 @@
+# coding=utf-8
+import asyncio
+import datetime
+from uuid import UUID
+
+import pytest
+
+from datacube.model import Range
+
+pytest.importorskip('asyncpg')
+
+from datacube.drivers.postgres._async import AsyncPostgresDb, AsyncPostgresDbAPI  # noqa: E402
+from datacube.index.async_index import AsyncIndex  # noqa: E402
+
+_DATASET_ID = UUID('051a003f-5bba-43c7-b5f1-7f1da3ae9cfb')
+
+_EO = {
+    'name': 'eo',
+    'description': '',
+    'dataset': {
+        'id': ['id'],
+        'creation_dt': ['creation_dt'],
+        'label': ['label'],
+        'measurements': ['image', 'bands'],
+        'grid_spatial': ['grid_spatial', 'projection'],
+        'format': ['format', 'name'],
+        'sources': ['lineage', 'source_datasets'],
+        'search_fields': {
+            'platform': {'description': '', 'offset': ['platform', 'code']},
+            'time': {
+                'description': '',
+                'type': 'datetime-range',
+                'min_offset': [['extent', 'from_dt']],
+                'max_offset': [['extent', 'to_dt']],
+            },
+        },
+    },
+}
+
+
+def _product(name, platform):
+    return {'name': name, 'description': '', 'metadata_type': 'eo', 'metadata': {'platform': {'code': platform}}}
+
+
+class MockRecord(dict):
+    """Like an asyncpg record: iterating gives values."""
+
+    def __iter__(self):
+        return iter(self.values())
+
+
+class MockConnection(object):
+    def __init__(self):
+        self.queries = []
+
+    async def fetch(self, sql, *args):
+        self.queries.append((sql, args))
+        if 'from agdc.metadata_type),' in sql:
+            return [MockRecord(metadata_types=1, metadata_type_version=1, products=2, product_version=2)]
+        if 'FROM agdc.metadata_type' in sql:
+            return [MockRecord(id=1, name='eo', definition=_EO)]
+        if 'FROM agdc.dataset_type' in sql:
+            return [MockRecord(id=1, metadata_type_ref=1, definition=_product('ls8_nbar', 'LANDSAT_8')),
+                    MockRecord(id=2, metadata_type_ref=1, definition=_product('ls7_nbar', 'LANDSAT_7'))]
+        if 'count(*)' in sql:
+            return [MockRecord(dataset_type_ref=1, count=3), MockRecord(dataset_type_ref=2, count=4)]
+        return [MockRecord(id=_DATASET_ID, metadata_type_ref=1, dataset_type_ref=1,
+                           metadata={'id': str(_DATASET_ID)}, archived=None, added=None, added_by=None,
+                           uris=['file:///tmp/a.yaml'])]
+
+
+class MockConnect(object):
+    def __init__(self, connection):
+        self._connection = connection
+
+    async def __aenter__(self):
+        return AsyncPostgresDbAPI(self._connection)
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        pass
+
+
+def _run(coroutine):
+    return asyncio.get_event_loop().run_until_complete(coroutine)
+
+
+def test_async_index():
+    connection = MockConnection()
+    db = AsyncPostgresDb.from_config({'db_hostname': '', 'db_database': 'async_test'})
+    db.connect = lambda: MockConnect(connection)
+    index = AsyncIndex(db)
+
+    assert _run(index.products.get_by_name('ls7_nbar')).id == 2
+    assert _run(index.products.get(1)).name == 'ls8_nbar'
+
+    # Both products are counted in one query.
+    queries = len(connection.queries)
+    assert _run(index.datasets.count(platform=['LANDSAT_8', 'LANDSAT_7'],
+                                     time=Range(datetime.datetime(2017, 1, 1), datetime.datetime(2017, 2, 1)))) == 7
+    assert len(connection.queries) == queries + 1
+    sql, args = connection.queries[-1]
+    assert 'dataset_type_ref IN ($5, $6)' in sql
+    # Ranges are given to asyncpg in its own type.
+    assert args[3].lower == datetime.datetime(2017, 1, 1, tzinfo=args[3].lower.tzinfo)
+
+    dataset, = _run(index.datasets.search(product='ls8_nbar', limit=5))
+    assert dataset.id == _DATASET_ID
+    assert dataset.type.name == 'ls8_nbar'
+    assert dataset.uris == ['file:///tmp/a.yaml']
+
+    assert _run(index.datasets.get(str(_DATASET_ID))).id == _DATASET_ID
+    assert _run(index.datasets.bulk_get([])) == []
@@ -0,0 +1,143 @@
+# coding=utf-8
+import pickle
+from contextlib import contextmanager
+
+from datacube.index import _catalogue
+from datacube.index._catalogue import Catalogue, shared_catalogue
+
+_EO = {'name': 'eo', 'description': '', 'dataset': {'search_fields': {}}}
+
+
+def _product(name):
+    return {'name': name, 'description': '', 'metadata_type': 'eo', 'metadata': {}}
+
+
+class MockConnection(object):
+    def __init__(self, db):
+        self._db = db
+
+    def get_catalogue_version(self):
+        self._db.version_checks += 1
+        return self._db.version
+
+    def get_all_metadata_types(self):
+        return [{'id': 1, 'definition': _EO}]
+
+    def get_all_dataset_types(self):
+        self._db.loads += 1
+        return [{'id': id_, 'metadata_type_ref': 1, 'definition': _product(name)}
+                for id_, name in self._db.products]
+
+
+class MockDb(object):
+    def __init__(self, url):
+        self.url = url
+        self.version = (1, 1, 1, 1)
+        self.products = [(1, 'ls5_nbar'), (2, 'ls8_nbar')]
+        self.version_checks = 0
+        self.loads = 0
+
+    @contextmanager
+    def connect(self):
+        yield MockConnection(self)
+
+    @staticmethod
+    def get_dataset_fields(doc):
+        return {}
+
+
+def test_catalogue_caches_until_version_changes(monkeypatch):
+    monkeypatch.setattr(_catalogue, '_CATALOGUES', {})
+    db = MockDb('postgresql://localhost/cache_test')
+
+    catalogue = shared_catalogue(db)
+    assert shared_catalogue(db) is catalogue
+
+    assert [p.name for p in catalogue.products()] == ['ls5_nbar', 'ls8_nbar']
+    assert catalogue.product(2).name == 'ls8_nbar'
+    assert catalogue.product_by_name('ls5_nbar').metadata_type is catalogue.metadata_type_by_name('eo')
+    assert db.loads == 1
+    assert db.version_checks == 1
+
+    # An unchanged version doesn't reload.
+    catalogue.invalidate()
+    catalogue.products()
+    assert db.version_checks == 2
+    assert db.loads == 1
+
+    # A miss checks again, and picks up a product added elsewhere.
+    db.products.append((3, 'ls7_nbar'))
+    db.version = (1, 1, 3, 2)
+    assert catalogue.product_by_name('ls7_nbar').id == 3
+    assert db.loads == 2
+
+    assert catalogue.product_by_name('no_such_product') is None
+
+
+def test_catalogue_pickle_primes_shared(monkeypatch):
+    monkeypatch.setattr(_catalogue, '_CATALOGUES', {})
+    db = MockDb('postgresql://localhost/pickle_test')
+    catalogue = shared_catalogue(db)
+    catalogue.products()
+
+    pickled = pickle.dumps(catalogue)
+
+    # As if in a fresh process
+    monkeypatch.setattr(_catalogue, '_CATALOGUES', {})
+    unpickled = pickle.loads(pickled)
+    assert isinstance(unpickled, Catalogue)
+    assert unpickled.version == catalogue.version
+
+    primed = shared_catalogue(db)
+    assert primed is unpickled
+    assert [p.name for p in primed.products()] == ['ls5_nbar', 'ls8_nbar']
+    # It used the pickled content rather than the database.
+    assert db.loads == 1
+    assert db.version_checks == 1
+
+    # Usable before any index connects, even when due a check or on a miss.
+    monkeypatch.setattr(_catalogue, '_CATALOGUES', {})
+    unpickled = pickle.loads(pickled)
+    unpickled.invalidate()
+    assert [p.name for p in unpickled.products()] == ['ls5_nbar', 'ls8_nbar']
+    assert unpickled.product_by_name('ls7_nbar') is None
+    assert db.version_checks == 1
+
+
+def test_catalogue_updated_by_owner():
+    catalogue = Catalogue('postgresql://localhost/owner_test', db=MockDb('unused'), auto_check=False)
+    assert catalogue.is_due_check()
+    assert catalogue.products() == []
+
+    connection = MockConnection(MockDb('unused'))
+    catalogue.update((1, 1, 1, 1), connection.get_all_metadata_types(), connection.get_all_dataset_types())
+    assert not catalogue.is_due_check()
+    assert catalogue.product_by_name('ls8_nbar').id == 2
+    # A miss doesn't query the database.
+    assert catalogue.product_by_name('ls7_nbar') is None
+
+    # An unchanged version keeps the content.
+    catalogue.update((1, 1, 1, 1))
+    assert catalogue.product(1).name == 'ls5_nbar'
+
+
+def test_resources_pickle_catalogue(monkeypatch):
+    from datacube.index._metadata_types import MetadataTypeResource
+    from datacube.index._products import ProductResource
+
+    monkeypatch.setattr(_catalogue, '_CATALOGUES', {})
+    db = MockDb('postgresql://localhost/resource_test')
+    products = ProductResource(db, MetadataTypeResource(db))
+    products._catalogue.products()
+
+    # The catalogue is sent with the resources, and primes the receiver's.
+    _, metadata_type_resource, catalogue = products.__getstate__()
+    assert catalogue is products._catalogue
+    assert metadata_type_resource.__getstate__()[1] is catalogue
+
+    pickled = pickle.dumps(catalogue)
+    monkeypatch.setattr(_catalogue, '_CATALOGUES', {})
+    pickle.loads(pickled)
+    received = ProductResource(db, MetadataTypeResource(db))
+    assert [p.name for p in received.get_all()] == ['ls5_nbar', 'ls8_nbar']
+    assert db.loads == 1
@@ -15,6 +15,7 @@ from datacube.testutils.io import RasterFileDataSource
 from datacube.storage import BandInfo
 from datacube.drivers.netcdf import create_netcdf_storage_unit, write_dataset_to_netcdf, Variable
 from datacube.storage import reproject_and_fuse
+from datacube.storage._buffers import BufferPool, thread_buffer_pool, THREAD_POOL_MAX_BYTES
 from datacube.storage._rio import RasterDatasetDataSource
 from datacube.storage._read import read_time_slice
 from datacube.utils.geometry import GeoBox
@@ -138,6 +139,92 @@ def test_mixed_result_when_first_source_partially_empty_with_nan_nodata():
     assert (output_data == [[1, 1], [2, 2]]).all()
 
 
+def test_buffer_pool():
+    pool = BufferPool(max_bytes=100)
+
+    a = pool.take((3, 4), 'int16')
+    assert a.shape == (3, 4)
+    assert a.dtype == np.int16
+    assert (pool.n_alloc, pool.n_reuse) == (1, 0)
+
+    pool.give(a)
+    assert pool.free_bytes == a.nbytes
+    assert pool.take((3, 4), 'int16') is a
+    assert (pool.n_alloc, pool.n_reuse) == (1, 1)
+    assert pool.free_bytes == 0
+
+    # different shape or dtype: new allocation
+    assert pool.take((4, 3), 'int16') is not a
+    assert pool.take((3, 4), 'uint16') is not a
+    assert pool.n_alloc == 3
+
+    b = pool.full((2, 2), -1, 'float32')
+    assert (b == -1).all()
+
+    # views are not accepted
+    pool.give(a[1:])
+    pool.give(a.T)
+    assert pool.free_bytes == 0
+
+    # size limit
+    pool.give(np.empty((100,), dtype='uint8'))
+    pool.give(np.empty((1,), dtype='uint8'))
+    assert pool.free_bytes == 100
+    pool.clear()
+    assert pool.free_bytes == 0
+
+    assert thread_buffer_pool() is thread_buffer_pool()
+    assert thread_buffer_pool()._max_bytes == THREAD_POOL_MAX_BYTES
+
+
+def test_reproject_and_fuse_allocations():
+    """ Allocations per loaded tile when fusing multiple sources
+
+    After the first tile all scratch space comes from the buffer pool, only
+    pixels returned by readers are allocated.
+    """
+    import tracemalloc
+
+    crs = epsg4326
+    shape = (256, 256)
+    no_data = -1
+    n_tiles = 10
+
+    src_data = np.full(shape, no_data, dtype='int16')
+    src_data[:128] = 1
+    sources = [FakeDatasetSource(src_data, crs=crs, shape=shape, nodata=no_data),
+               FakeDatasetSource(np.full(shape, 2, dtype='int16'), crs=crs, shape=shape, nodata=no_data)]
+    gbox = mk_gbox(shape, crs=crs)
+    output_data = np.empty(shape, dtype='int16')
+    pool = BufferPool()
+
+    reproject_and_fuse(sources, output_data, gbox, dst_nodata=no_data, buffer_pool=pool)
+    assert (output_data[:128] == 1).all()
+    assert (output_data[128:] == 2).all()
+    assert pool.n_alloc == 2  # pixel buffer and fuse mask
+
+    tracemalloc.start()
+    try:
+        for _ in range(n_tiles):
+            reproject_and_fuse(sources, output_data, gbox, dst_nodata=no_data, buffer_pool=pool)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    # no new scratch allocations per tile
+    assert pool.n_alloc == 2
+    assert pool.n_reuse == 2*n_tiles
+
+    # at most one source read (pixels + valid mask) is alive at a time
+    assert peak < 2*output_data.nbytes
+
+    # Without a pool nothing is kept once done
+    thread_buffer_pool().clear()
+    reproject_and_fuse(sources, output_data, gbox, dst_nodata=no_data)
+    assert (output_data[:128] == 1).all()
+    assert thread_buffer_pool().free_bytes == 0
+
+
 class FakeBandDataSource(object):
     def __init__(self, value, nodata, shape=(2, 2), *args, **kwargs):
         self.value = value
@@ -2,12 +2,15 @@
 """
 
 import numpy as np
+import pytest
 
 from datacube.storage._load import (
     xr_load,
+    _plan_reads,
 )
 
 from datacube.api.core import Datacube
+from datacube.storage import BandInfo
 from datacube.testutils import mk_sample_dataset
 from datacube.testutils.io import rio_slurp
 from datacube.testutils.iodriver import mk_rio_driver, tee_new_load_context
@@ -50,3 +53,177 @@ def test_new_xr_load(data_folder):
 
     np.testing.assert_array_equal(im[0], xx.a.values[0])
     np.testing.assert_array_equal(im[1], xx.b.values[0])
+
+
+def test_xr_load_concurrent(data_folder):
+    from concurrent.futures import ThreadPoolExecutor
+
+    base = "file://" + str(data_folder) + "/metadata.yml"
+    rdr = mk_rio_driver()
+
+    # Same measurement, same timestamp, different source bands: fuse order is observable
+    ds1 = mk_sample_dataset([dict(name='a', band=1, path='test.tif')], base,
+                            id='10000000-0000-0000-0000-000000000001')
+    ds2 = mk_sample_dataset([dict(name='a', band=2, path='test.tif')], base,
+                            id='10000000-0000-0000-0000-000000000002')
+
+    sources = Datacube.group_datasets([ds2, ds1], 'time')
+    im, meta = rio_slurp(str(data_folder) + '/test.tif')
+
+    fused = []
+
+    def fuser(dst, src):
+        fused.append(src.copy())
+        np.copyto(dst, src)
+
+    m = ds1.type.measurements['a'].copy()
+    m['fuser'] = fuser
+
+    xx_seq, _ = xr_load(sources, meta.gbox, [m], rdr)
+    assert len(fused) == 2
+    np.testing.assert_array_equal(fused[0], im[0])
+    np.testing.assert_array_equal(fused[1], im[1])
+
+    fused.clear()
+    xx, _ = xr_load(sources, meta.gbox, [m], rdr, max_in_flight=4)
+    assert len(fused) == 2
+    np.testing.assert_array_equal(fused[0], im[0])
+    np.testing.assert_array_equal(fused[1], im[1])
+    np.testing.assert_array_equal(xx.a.values, xx_seq.a.values)
+
+    fused.clear()
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        xx, _ = xr_load(sources, meta.gbox, [m], rdr, max_in_flight=2, pool=pool)
+    assert len(fused) == 2
+    np.testing.assert_array_equal(fused[0], im[0])
+    np.testing.assert_array_equal(xx.a.values, xx_seq.a.values)
+
+
+def test_load_data_concurrent(data_folder, monkeypatch):
+    import threading
+    import datacube.drivers.rio._reader as rio_reader
+    from datacube.api.core import TerminateCurrentLoad
+
+    base = "file://" + str(data_folder) + "/metadata.yml"
+
+    ds1 = mk_sample_dataset([dict(name='a', band=1, path='test.tif')], base,
+                            id='10000000-0000-0000-0000-000000000001')
+    ds2 = mk_sample_dataset([dict(name='a', band=2, path='test.tif')], base,
+                            id='10000000-0000-0000-0000-000000000002')
+
+    sources = Datacube.group_datasets([ds2, ds1], 'time')
+    _, meta = rio_slurp(str(data_folder) + '/test.tif')
+    measurements = [ds1.type.measurements['a']]
+
+    xx_seq = Datacube.load_data(sources, meta.gbox, measurements, max_in_flight=1)
+
+    # Only gets past the barrier if both sources are being opened at the same time
+    both_open = threading.Barrier(2, timeout=10)
+    rdr_open = rio_reader._rdr_open
+
+    def _rdr_open(*args):
+        both_open.wait()
+        return rdr_open(*args)
+
+    monkeypatch.setattr(rio_reader, '_rdr_open', _rdr_open)
+
+    progress = []
+    xx = Datacube.load_data(sources, meta.gbox, measurements, max_in_flight=2,
+                            progress_cbk=lambda n, total: progress.append((n, total)))
+    assert progress == [(1, 2), (2, 2)]
+    assert 'dc_partial_load' not in xx.attrs
+    np.testing.assert_array_equal(xx.a.values, xx_seq.a.values)
+
+    def stop(n, total):
+        raise TerminateCurrentLoad()
+
+    xx = Datacube.load_data(sources, meta.gbox, measurements, max_in_flight=2, progress_cbk=stop)
+    assert xx.attrs['dc_partial_load'] is True
+
+
+def test_xr_load_skip_broken(data_folder):
+    base = "file://" + str(data_folder) + "/metadata.yml"
+    rdr = mk_rio_driver()
+
+    ds = mk_sample_dataset([dict(name='a', path='no-such-file-4718193.tif', nodata=-3)], base)
+    sources = Datacube.group_datasets([ds], 'time')
+    _, meta = rio_slurp(str(data_folder) + '/test.tif')
+    measurements = [ds.type.measurements['a']]
+
+    with pytest.raises(IOError):
+        xr_load(sources, meta.gbox, measurements, rdr, max_in_flight=2)
+
+    xx, _ = xr_load(sources, meta.gbox, measurements, rdr,
+                    skip_broken_datasets=True, max_in_flight=2)
+    assert (xx.a.values == -3).all()
+
+
+def test_xr_load_multiband_plan(data_folder, monkeypatch):
+    import datacube.drivers.rio._reader as rio_reader
+
+    base = "file://" + str(data_folder) + "/metadata.yml"
+    rdr = mk_rio_driver()
+
+    ds = mk_sample_dataset([dict(name='a', path='test.tif'),
+                            dict(name='b', band=2, path='test.tif'),
+                            dict(name='c', path='sample_tile_151_-29.tif')], base)
+    sources = Datacube.group_datasets([ds], 'time')
+    ms = [ds.type.measurements[n].copy() for n in ('a', 'b', 'c')]
+
+    groups = [(m, (0,), [BandInfo(ds, m.name)]) for m in ms]
+    assert list(_plan_reads(groups)) == [[(0, 0), (1, 0)], [(2, 0)]]
+
+    # different resampling means different read plan
+    ms[1]['resampling_method'] = 'bilinear'
+    groups = [(m, (0,), [BandInfo(ds, m.name)]) for m in ms]
+    assert list(_plan_reads(groups)) == [[(0, 0)], [(1, 0)], [(2, 0)]]
+
+    n_reads = []
+    _read_many = rio_reader._read_many
+
+    def read_many_spy(src, lock, bidxs, *args):
+        n_reads.append(list(bidxs))
+        return _read_many(src, lock, bidxs, *args)
+
+    monkeypatch.setattr(rio_reader, '_read_many', read_many_spy)
+
+    im, meta = rio_slurp(str(data_folder) + '/test.tif')
+    xx, _ = xr_load(sources, meta.gbox, [ds.type.measurements[n] for n in ('a', 'b')], rdr)
+
+    assert n_reads == [[1, 2]]
+    np.testing.assert_array_equal(im[0], xx.a.values[0])
+    np.testing.assert_array_equal(im[1], xx.b.values[0])
+
+
+def test_fuse_lazy_many(data_folder, monkeypatch):
+    import datacube.api.core as core
+    import datacube.drivers.rio._reader as rio_reader
+
+    base = "file://" + str(data_folder) + "/metadata.yml"
+    ds = mk_sample_dataset([dict(name='a', path='test.tif'),
+                            dict(name='b', band=2, path='test.tif')], base)
+    ms = [ds.type.measurements[n] for n in ('a', 'b')]
+
+    n_reads = []
+    _read_many = rio_reader._read_many
+
+    def read_many_spy(src, lock, bidxs, *args):
+        n_reads.append(list(bidxs))
+        return _read_many(src, lock, bidxs, *args)
+
+    monkeypatch.setattr(rio_reader, '_read_many', read_many_spy)
+
+    im, meta = rio_slurp(str(data_folder) + '/test.tif')
+    a, b = core.fuse_lazy_many([ds], meta.gbox, ms, prepend_dims=1)
+
+    assert n_reads == [[1, 2]]
+    assert a.shape == (1,) + im[0].shape
+    np.testing.assert_array_equal(im[0], a[0])
+    np.testing.assert_array_equal(im[1], b[0])
+
+    # Bands handled by an IO driver plugin are loaded one by one
+    monkeypatch.setattr(core, '_single_pass_driver', lambda datasets, measurements: None)
+    a2, b2 = core.fuse_lazy_many([ds], meta.gbox, ms, prepend_dims=1)
+    assert n_reads == [[1, 2]]
+    np.testing.assert_array_equal(a, a2)
+    np.testing.assert_array_equal(b, b2)
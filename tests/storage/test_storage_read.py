@@ -1,3 +1,4 @@
+from types import SimpleNamespace
 from affine import Affine
 import numpy as np
 
@@ -34,6 +35,18 @@ def test_pick_read_scale():
     assert pick_read_scale(2.3) == 2
     assert pick_read_scale(1.99999) == 2
 
+    rdr = SimpleNamespace(overviews=(2, 4, 8))
+    assert pick_read_scale(0.7, rdr) == 1
+    assert pick_read_scale(1.3, rdr) == 1
+    assert pick_read_scale(2.3, rdr) == 2
+    assert pick_read_scale(3.99999, rdr) == 4
+    assert pick_read_scale(7, rdr) == 4
+    assert pick_read_scale(40, rdr) == 8
+
+    # no usable overviews: keep integer scale
+    assert pick_read_scale(7, SimpleNamespace(overviews=())) == 7
+    assert pick_read_scale(3, SimpleNamespace(overviews=(4, 8))) == 3
+
 
 def test_can_paste():
     src = AlbersGS.tile_geobox((17, -40))
@@ -356,3 +369,43 @@ def test_read_with_reproject_v2(tmpdir):
     nvalid = (yy != -999).sum()
     nempty = (yy == -999).sum()
     assert nvalid > nempty
+
+
+def test_read_with_overviews(tmpdir):
+    import rasterio
+    from rasterio.enums import Resampling as RioResampling
+    from datacube.testutils import mk_test_image
+    from datacube.testutils.io import write_gtiff
+    from datacube.testutils.iodriver import open_reader
+    from pathlib import Path
+
+    pp = Path(str(tmpdir))
+
+    xx = mk_test_image(128, 64, nodata=None)
+    mm = write_gtiff(pp/'tst-read-overviews-128x64-int16.tif', xx, nodata=-999)
+
+    assert open_reader(mm.path).overviews == ()
+    with RasterFileDataSource(mm.path, 1).open() as rdr:
+        assert rdr.overviews == ()
+
+    with rasterio.open(str(mm.path), 'r+') as f:
+        f.build_overviews([2, 4], RioResampling.average)
+
+    with RasterFileDataSource(mm.path, 1).open() as rdr:
+        assert rdr.overviews == (2, 4)
+        assert pick_read_scale(8, rdr) == 4
+
+        gbox = gbx.zoom_out(mm.gbox, 8)
+        yy = np.full(gbox.shape, -999, dtype=rdr.dtype)
+        roi = read_time_slice(rdr, yy, gbox, 'bilinear', -999)
+        assert roi_shape(roi) == gbox.shape
+        assert not (yy == -999).any()
+
+    rdr = open_reader(mm.path)
+    assert rdr.overviews == (2, 4)
+    for resampling in ('nearest', 'bilinear'):
+        gbox = gbx.zoom_out(mm.gbox, 8)
+        yy, roi = read_time_slice_v2(rdr, gbox, resampling, -999)
+        assert roi_shape(roi) == gbox.shape
+        assert yy.shape == gbox.shape
+        assert not (yy == -999).any()
@@ -3,7 +3,7 @@ import numpy as np
 import pytest
 from datacube.utils.geometry import gbox as gbx
 from datacube.utils import geometry
-from datacube.utils.geometry import GeoBox
+from datacube.utils.geometry import GeoBox, BoundingBox
 
 epsg3857 = geometry.CRS('EPSG:3857')
 
@@ -145,6 +145,21 @@ def test_gbox_tiles():
 
     assert list(tt.tiles(gbox[:h, :w].extent)) == [(0, 0)]
 
+    polys = [gbox.extent,
+             gbox[:h, :w].extent,
+             gbox[3:9, 4:15].extent,
+             gbx.rotate(gbox[2:9, 4:15], 30).extent,
+             gbx.translate_pix(gbox, 1000, 1000).extent,
+             gbox.extent]
+    assert tt.tiles_many(polys) == [list(tt.tiles(poly)) for poly in polys]
+    assert tt.tiles_many([]) == []
+
+    bboxes = [tuple(poly.boundingbox) for poly in polys]
+    y0, y1, x0, x1 = tt.ranges_from_bboxes(bboxes)
+    for i, bbox in enumerate(bboxes):
+        yy, xx = tt.range_from_bbox(BoundingBox(*bbox))
+        assert (yy, xx) == (range(y0[i], y1[i]), range(x0[i], x1[i]))
+
     (H, W) = (11, 22)
     (h, w) = (10, 20)
     tt = gbx.GeoboxTiles(GeoBox(W, H, A, epsg3857), (h, w))
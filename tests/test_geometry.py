@@ -16,6 +16,8 @@ from datacube.utils.geometry import (
     native_pix_transform,
     scaled_down_geobox,
     compute_reproject_roi,
+    reproject_roi_cache_info,
+    reproject_roi_cache_clear,
     roi_normalise,
     roi_shape,
     split_translation,
@@ -623,6 +625,13 @@ def test_crs():
     assert epsg3577 != epsg4326
     assert epsg3577 != 'EPSG:4326'
 
+    # Equal CRSs hash the same, however they were described
+    for other in (CRS('epsg:3577'), CRS(epsg3577.wkt), CRS(epsg3577._crs.ExportToProj4())):
+        assert other == epsg3577
+        assert hash(other) == hash(epsg3577)
+        assert len({other, epsg3577}) == 1
+    assert len({epsg3577, epsg4326}) == 2
+
     bad_crs = ['cupcakes',
                ('PROJCS["unnamed",'
                 'GEOGCS["WGS 84", DATUM["WGS_1984", SPHEROID["WGS 84",6378137,298.257223563, AUTHORITY["EPSG","7030"]],'
@@ -997,6 +1006,36 @@ def test_compute_reproject_roi():
     assert roi_shape(rr.roi_dst) == src[roi_].shape
 
 
+def test_compute_reproject_roi_cache():
+    src = AlbersGS.tile_geobox((15, -40))
+    roi_ = np.s_[113:-100, 33:-10]
+
+    assert hash(src) == hash(AlbersGS.tile_geobox((15, -40)))
+    assert hash(geometry.CRS('EPSG:3577')) == hash(geometry.CRS('epsg:3577'))
+    assert len({src, AlbersGS.tile_geobox((15, -40)), src[roi_]}) == 2
+
+    reproject_roi_cache_clear()
+    assert reproject_roi_cache_info()[:2] == (0, 0)
+
+    rr = compute_reproject_roi(src, src[roi_])
+    assert reproject_roi_cache_info().misses == 1
+
+    # result is a copy, modifying it doesn't affect the cache
+    roi_src = rr.roi_src
+    rr.roi_src = np.s_[0:0, 0:0]
+
+    rr = compute_reproject_roi(AlbersGS.tile_geobox((15, -40)), src[roi_])
+    assert rr.roi_src == roi_src
+    assert reproject_roi_cache_info().hits == 1
+
+    compute_reproject_roi(src, src[roi_], padding=0, align=0)
+    info = reproject_roi_cache_info()
+    assert (info.hits, info.misses, info.currsize) == (1, 2, 2)
+
+    reproject_roi_cache_clear()
+    assert reproject_roi_cache_info().currsize == 0
+
+
 def test_compute_reproject_roi_issue647():
     """ In some scenarios non-overlapping geoboxes will result in non-empty
     `roi_dst` even though `roi_src` is empty.
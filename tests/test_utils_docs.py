@@ -0,0 +1,150 @@
+"""
+The accelerated document parsers and serialisers must give the same documents as the standard ones.
+"""
+import gzip
+import json
+import math
+from collections import OrderedDict
+from datetime import datetime
+from decimal import Decimal
+from uuid import UUID
+
+import pytest
+import yaml
+
+from datacube.drivers.postgres._connections import _to_json
+from datacube.testutils import write_files
+from datacube.utils import documents, jsonify_document, read_documents
+from datacube.utils.documents import DocumentCache, NoDatesSafeLoader, parse_json
+
+YAML_DOCS = [
+    '''
+id: 3ca5d4e3-d9e3-4c0a-9f5d-1a0e4a6b4b0e
+creation_dt: 2018-01-10 03:22:10.123Z
+extent:
+  from_dt: 2018-01-01
+  center_dt: '2018-01-01T10:00:00'
+  coord: {ll: {lat: -35.5, lon: 148.25}}
+lineage: {source_datasets: {}}
+''',
+    '''
+name: 'ünïcødé – “quoted”'
+numbers: [1, -2, 3.5e10, .inf, -.inf, 0x1f, 1_000, 12345678901234567890]
+flags: [true, false, yes, no, on, null, ~]
+multi: |
+  line one
+  line two
+folded: >
+  folded
+  text
+anchors:
+  base: &base {a: 1, b: [x, y]}
+  merged:
+    <<: *base
+    c: 2
+1: integer key
+2018-01-01: date key
+''',
+    '''
+--- {a: 1}
+--- [1, 2]
+--- just a string
+''',
+]
+
+JSON_DOCS = [
+    b'{"id": "3ca5d4e3-d9e3-4c0a-9f5d-1a0e4a6b4b0e", "values": [1, 2.5, -0.0, 1e300, 12345678901234567890]}',
+    '{"name": "ünïcødé \\u2013 \\"quoted\\"", "nested": {"a": [null, true, false, {}]}}'.encode(
+        'utf8'),
+    b'{"nan": NaN, "inf": Infinity, "ninf": -Infinity}',
+    b'[1, 2, 3]',
+]
+
+
+class PyNoDatesSafeLoader(yaml.SafeLoader):  # pylint: disable=too-many-ancestors
+    """The pure-python version of NoDatesSafeLoader."""
+
+
+PyNoDatesSafeLoader.yaml_implicit_resolvers = NoDatesSafeLoader.yaml_implicit_resolvers
+
+
+def _same(a, b):
+    """Equal, counting NaNs as equal and with the same types throughout."""
+    if isinstance(a, float) and isinstance(b, float) and math.isnan(a):
+        return math.isnan(b)
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, dict):
+        return list(a) == list(b) and all(_same(a[k], b[k]) for k in a)
+    if isinstance(a, list):
+        return len(a) == len(b) and all(_same(x, y) for x, y in zip(a, b))
+    return a == b
+
+
+@pytest.mark.parametrize('text', YAML_DOCS)
+def test_yaml_loader_equivalence(text):
+    expected = list(yaml.load_all(text, Loader=PyNoDatesSafeLoader))
+    loaded = list(documents.load_from_yaml(text.encode('utf8')))
+    assert _same(loaded, expected)
+
+    # Dates are left as strings
+    assert not any(isinstance(v, datetime) for doc in loaded if isinstance(doc, dict) for v in doc.values())
+
+
+@pytest.mark.parametrize('data', JSON_DOCS)
+def test_parse_json_equivalence(data):
+    expected = json.loads(data.decode('utf8'))
+    assert _same(parse_json(data), expected)
+    assert _same(parse_json(data.decode('utf8')), expected)
+
+
+def test_parse_json_without_orjson(monkeypatch):
+    monkeypatch.setattr(documents, 'orjson', None)
+    for data in JSON_DOCS:
+        assert _same(parse_json(data), json.loads(data.decode('utf8')))
+
+
+@pytest.mark.parametrize('doc', [
+    {'a': (1.0, 2.0), 'b': float('inf'), 'c': float('nan'), 'd': datetime(2016, 3, 11), 1: 'int key'},
+    {'id': UUID('3ca5d4e3-d9e3-4c0a-9f5d-1a0e4a6b4b0e'), 'n': Decimal('1.5'), 'big': 2 ** 70},
+    OrderedDict([('z', 1), ('a', {'ü': ['ñ', None, True]})]),
+])
+def test_to_json_equivalence(doc):
+    expected = json.dumps(jsonify_document(doc))
+    assert _same(json.loads(_to_json(doc)), json.loads(expected))
+    assert list(json.loads(_to_json(doc))) == list(json.loads(expected))
+
+
+def test_to_json_unserialisable():
+    with pytest.raises(TypeError):
+        _to_json({'a': object()})
+
+
+def test_document_cache(tmpdir, monkeypatch):
+    files = write_files({
+        'a.yaml': YAML_DOCS[2],
+        'b.json': JSON_DOCS[0].decode('utf8'),
+    })
+    # (write_files only writes text)
+    with gzip.open(str(files / 'c.yaml.gz'), 'wb') as f:
+        f.write(YAML_DOCS[0].encode('utf8'))
+    paths = [files / 'a.yaml', files / 'b.json', files / 'c.yaml.gz']
+
+    cache = DocumentCache(str(tmpdir / 'cache'))
+    expected = list(read_documents(*paths, uri=True))
+    assert list(read_documents(*paths, uri=True, cache=cache)) == expected
+
+    # Now it's all from the cache.
+    def fail(*args, **kwargs):
+        raise AssertionError('Parsed again')
+
+    monkeypatch.setattr(documents, '_PARSERS', {'.yaml': fail, '.json': fail})
+    assert list(read_documents(*paths, uri=True, cache=cache)) == expected
+
+    # Except for changed documents.
+    (files / 'a.yaml').write_text('--- {a: 2}\n')
+    with pytest.raises(documents.InvalidDocException):
+        list(read_documents(files / 'a.yaml', cache=cache))
+
+    monkeypatch.undo()
+    assert list(read_documents(files / 'a.yaml', cache=cache)) == [(files / 'a.yaml', {'a': 2})]
@@ -1,8 +1,15 @@
 import numpy as np
+import pytest
 from affine import Affine
 import rasterio
 from datacube.utils.geometry import warp_affine, rio_reproject, gbox as gbx
-from datacube.utils.geometry._warp import resampling_s2rio, is_resampling_nn
+from datacube.utils.geometry._warp import (
+    resampling_s2rio,
+    is_resampling_nn,
+    can_warp_affine_np,
+    warp_affine_np,
+    warp_affine_rio,
+)
 
 from datacube.testutils.geom import (
     AlbersGS,
@@ -10,8 +17,6 @@ from datacube.testutils.geom import (
 
 
 def test_rio_resampling_conversion():
-    import pytest
-
     R = rasterio.warp.Resampling
     assert resampling_s2rio('nearest') == R.nearest
     assert resampling_s2rio('bilinear') == R.bilinear
@@ -69,6 +74,93 @@ def test_warp():
     assert (dst[:, 20:] == -3).all()
 
 
+def test_can_warp_affine_np():
+    R = rasterio.warp.Resampling
+    src = np.zeros((10, 20), dtype='uint8')
+    dst = np.zeros((5, 7), dtype='float32')
+
+    assert can_warp_affine_np(src, dst, Affine.translation(3, 4), 'nearest') is True
+    assert can_warp_affine_np(src, dst, Affine.scale(2), R.nearest) is True
+    assert can_warp_affine_np(src, dst, Affine.scale(0.5, -0.5), 'Bilinear') is True
+    assert can_warp_affine_np(src, dst, Affine.scale(0.5, -0.5), R.bilinear) is True
+
+    # shrinking with bilinear
+    assert can_warp_affine_np(src, dst, Affine.scale(2), 'bilinear') is False
+    # rotation
+    assert can_warp_affine_np(src, dst, Affine.rotation(30), 'nearest') is False
+    # other modes
+    assert can_warp_affine_np(src, dst, Affine.scale(0.5), 'cubic') is False
+    assert can_warp_affine_np(src, dst, Affine.scale(0.5), R.average) is False
+    # not 2d or not numeric
+    assert can_warp_affine_np(src[None], dst, Affine.scale(0.5), 'nearest') is False
+    assert can_warp_affine_np(src.astype('bool'), dst, Affine.scale(0.5), 'nearest') is False
+
+
+def _random_st_warp_cases(resampling, dtype, n=20, seed=0):
+    """ Random Scale+Translation warps, including flips, partial overlaps and integer shifts.
+    """
+    rng = np.random.RandomState(seed)
+
+    for i in range(n):
+        if resampling == 'bilinear' or i % 3:
+            sx, sy = rng.uniform(0.2, 1, size=2)
+        else:
+            sx, sy = rng.uniform(1, 4, size=2)
+        sx, sy = sx*rng.choice([1, 1, -1]), sy*rng.choice([1, 1, -1])
+        if i % 5 == 0:
+            sx, sy = 1, 1
+
+        src = rng.randint(0, 100, size=tuple(rng.randint(5, 90, size=2))).astype(dtype)
+        dst_shape = tuple(rng.randint(5, 90, size=2))
+
+        tx = rng.uniform(-20, 20) + (src.shape[1] if sx < 0 else 0)
+        ty = rng.uniform(-20, 20) + (src.shape[0] if sy < 0 else 0)
+        if i % 7 == 0:
+            tx, ty = round(tx), round(ty)
+
+        src_nodata, dst_nodata = [(None, None), (3, 3), (3, 50), (3, None)][i % 4]
+        if dst_nodata is not None:
+            # GDAL has its own ideas about valid pixels that look like nodata
+            src[src == dst_nodata] = dst_nodata + 1
+        if src_nodata is not None:
+            src[rng.uniform(size=src.shape) < 0.1] = src_nodata
+
+        yield (src, dst_shape,
+               Affine.translation(tx, ty)*Affine.scale(sx, sy),
+               src_nodata, dst_nodata)
+
+
+@pytest.mark.parametrize('resampling', ['nearest', 'bilinear'])
+@pytest.mark.parametrize('dtype', ['uint8', 'int8', 'int16', 'uint16', 'int32', 'float32', 'float64'])
+def test_warp_affine_np_vs_rio(resampling, dtype):
+    if resampling == 'bilinear' and dtype == 'int8':
+        pytest.skip('rasterio backend reinterprets int8 as uint8, only valid for nearest')
+
+    for src, dst_shape, A, src_nodata, dst_nodata in _random_st_warp_cases(resampling, dtype):
+        assert can_warp_affine_np(src, src, A, resampling)
+
+        expect = warp_affine_rio(src, np.full(dst_shape, 7, dtype=dtype), A, resampling,
+                                 src_nodata=src_nodata, dst_nodata=dst_nodata)
+        dst = np.full(dst_shape, 7, dtype=dtype)
+        assert warp_affine_np(src, dst, A, resampling,
+                              src_nodata=src_nodata, dst_nodata=dst_nodata) is dst
+
+        if dst.dtype.kind == 'f':
+            np.testing.assert_allclose(dst, expect, rtol=1e-6)
+        else:
+            np.testing.assert_array_equal(dst, expect)
+
+
+def test_warp_affine_np_int8():
+    src = np.asarray([[-100, 100],
+                      [-100, 100]], dtype='int8')
+    dst = np.zeros((2, 3), dtype='int8')
+
+    warp_affine(src, dst, Affine.scale(2/3, 1), 'bilinear')
+    assert dst.tolist() == [[-100, 0, 100],
+                            [-100, 0, 100]]
+
+
 def test_rio_reproject():
     src = np.zeros((128, 256),
                    dtype='int16')
@@ -95,3 +95,23 @@ def test_ui_path_doc_stream(httpserver):
     for input_path, (doc, resolved_path) in zip(input_paths, ui_path_doc_stream(input_paths)):
         assert doc == {}
         assert input_path == resolved_path
+
+
+def test_ui_path_doc_stream_jobs():
+    out_dir = write_files({'a.yaml': 'id: a\n',
+                           'b.yaml': '"',
+                           'c.yaml': '---\nid: c1\n---\nid: c2\n'})
+    input_paths = [out_dir / name for name in ('a.yaml', 'b.yaml', 'c.yaml')]
+
+    errors = []
+
+    class Logger(object):
+        def error(self, msg, *args):
+            errors.append(msg % args)
+
+    docs = list(ui_path_doc_stream(input_paths, logger=Logger(), uri=False, raw=True, jobs=2))
+
+    # In the order of the files, skipping the broken one.
+    assert [doc['id'] for _, doc in docs] == ['a', 'c1', 'c2']
+    assert [str(p) for p, _ in docs] == [str(input_paths[0]), str(input_paths[2]), str(input_paths[2])]
+    assert errors == ['Failed reading documents from %s' % input_paths[1]]